@@ -1,8 +1,17 @@
 import re
+import os
+import concurrent.futures
+import json
 import string
 from draughts.convert import fen_to_variant
 from draughts import Board, Move
-from typing import List, Optional, Dict, Union
+from typing import List, Optional, Dict, Union, Iterable, Iterator, Tuple, BinaryIO, TextIO, Any
+
+# A game ends at the first result after the tags. The text after the result belongs to the next game.
+_GAME_ENDING_REGEX = re.compile(r'[\s|\]](1-0|1/2-1/2|0-1|2-0|1-1|0-2|0-0|\*)[\s|\[]')
+
+# The size of the chunks read to find the file's encoding.
+_ENCODING_CHUNK_SIZE = 1 << 20
 
 
 class _PDNGame:
@@ -24,27 +33,13 @@ class _PDNGame:
     def _read(self) -> None:
         """Read a PDN game."""
         lines = self.pdn_text.split('\n')
-        tag_lines = []
-        last_tag_line = -1
-        for index, line in enumerate(lines):
-            if line.startswith('['):
-                tag_lines.append(line)
-                last_tag_line = index
-            elif re.sub(r'\s', '', line):
-                break
-
-        for tag_line in tag_lines:
-            line = tag_line[1:-1]
-            quote_index = line.index('"')
-            name = line[:quote_index - 1]
-            value = line[quote_index + 1:-1]
-            self.tags[name] = value
+        self.tags, last_tag_line = self._read_tags(lines)
 
         rest_of_games = []
         last_move_line = -1
         move_lines = []
         for index, line in enumerate(lines[last_tag_line + 1:]):
-            split_line = re.split(r'[\s|\]](1-0|1/2-1/2|0-1|2-0|1-1|0-2|0-0|\*)[\s|\[]', ' ' + line + ' ', maxsplit=1)
+            split_line = _GAME_ENDING_REGEX.split(' ' + line + ' ', maxsplit=1)
             if len(split_line) == 3:
                 move_lines.append(split_line[0])
                 last_move_line = index
@@ -133,6 +128,27 @@ class _PDNGame:
 
         self._rest_of_games = rest_of_games
 
+    @staticmethod
+    def _read_tags(lines: List[str]) -> Tuple[Dict[str, str], int]:
+        """Get the tags of a game and the index of the last tag line."""
+        tag_lines = []
+        last_tag_line = -1
+        for index, line in enumerate(lines):
+            if line.startswith('['):
+                tag_lines.append(line)
+                last_tag_line = index
+            elif re.sub(r'\s', '', line):
+                break
+
+        tags = {}
+        for tag_line in tag_lines:
+            line = tag_line[1:-1]
+            quote_index = line.index('"')
+            name = line[:quote_index - 1]
+            value = line[quote_index + 1:-1]
+            tags[name] = value
+        return tags, last_tag_line
+
     def get_titles(self) -> List[str]:
         """Get player titles."""
         return [self.tags.get("WhiteTitle", ""), self.tags.get("BlackTitle", "")]
@@ -159,13 +175,9 @@ class PDNReader:
     """Read PDN games."""
     def __init__(self, pdn_text: Optional[str] = None, filename: Optional[str] = None,
                  encodings: Union[List[str], str, None] = None) -> None:
-        if encodings is None:
-            encodings = ['utf8', 'ISO 8859/1']
-        if type(encodings) == str:
-            encodings = [encodings]
         if filename:
             pdn_text = ''
-            for encoding in encodings:
+            for encoding in self._get_encodings(encodings):
                 try:
                     with open(filename, encoding=encoding) as pdn_file:
                         pdn_text = pdn_file.read()
@@ -176,14 +188,323 @@ class PDNReader:
         self.pdn_text = pdn_text
         self.pdn_text = re.sub('\n +', '\n', self.pdn_text)
         self.pdn_text = re.sub('\n\n+', '\n\n', self.pdn_text)
-        self.games = []
-        game = _PDNGame(self.pdn_text)
-        self.games.append(game)
-        more_games = game._get_rest_of_games()
-        while re.sub(r'\s', '', more_games):
-            game = _PDNGame(more_games)
-            self.games.append(game)
-            more_games = game._get_rest_of_games()
+        self.games = list(self._read_games(self.pdn_text.split('\n')))
+
+    @staticmethod
+    def _get_encodings(encodings: Union[List[str], str, None]) -> List[str]:
+        """Get the encodings to try, in order."""
+        if encodings is None:
+            return ['utf8', 'ISO 8859/1']
+        if type(encodings) == str:
+            return [encodings]
+        return list(encodings)
+
+    @staticmethod
+    def _find_encoding(filename: str, encodings: List[str]) -> Optional[str]:
+        """Get the first encoding that can decode the whole file. The file is read in chunks."""
+        for encoding in encodings:
+            try:
+                with open(filename, encoding=encoding) as pdn_file:
+                    while pdn_file.read(_ENCODING_CHUNK_SIZE):
+                        pass
+                return encoding
+            except Exception:
+                pass
+        return None
+
+    @staticmethod
+    def _split_games(lines: Iterable[Tuple[str, int]],
+                     encoding: Optional[str] = None) -> Iterator[Tuple[List[str], int, Optional[int]]]:
+        """
+        Split the lines into games. The lines mustn't end with a new line and the spaces at the start of every line except
+        the first one must be removed. Every line comes with the byte offset in the file where it starts (after the
+        removed spaces). It returns the lines of every game and the byte offsets where the game starts and ends. The end
+        is None for the last game, which ends at the end of the file. The offsets are only found if the encoding is given.
+        """
+        game_lines: List[str] = []
+        reading_tags = True
+        read_a_game = False
+        start = 0
+        for line, offset in lines:
+            # The lines and the offsets where they start. `padded` is True if a space was added to the end of the line.
+            lines_to_read = [(line, offset, False)]
+            while lines_to_read:
+                line, offset, padded = lines_to_read.pop()
+                game_lines.append(line)
+                # The same checks as in _PDNGame._read. The tags end at the first line with text that isn't a tag.
+                if reading_tags and (line.startswith('[') or not re.sub(r'\s', '', line)):
+                    continue
+                reading_tags = False
+                split_line = _GAME_ENDING_REGEX.split(' ' + line + ' ', maxsplit=1)
+                if len(split_line) == 3:
+                    end = start
+                    if encoding is not None:
+                        # The characters before the end of the result and the character after it (without the padding).
+                        end_index = min(len(line) + 1 - len(split_line[2]), len(line) - 1 if padded else len(line))
+                        end = offset + len(line[:end_index].encode(encoding))
+                    yield game_lines, start, end
+                    read_a_game = True
+                    game_lines = []
+                    reading_tags = True
+                    start = end
+                    # The rest of the line is the start of the next game.
+                    lines_to_read.append((split_line[2], end, True))
+        if not read_a_game or re.sub(r'\s', '', ''.join(game_lines)):
+            yield game_lines, start, None
+
+    @classmethod
+    def _read_games(cls, lines: Iterable[str]) -> Iterator[_PDNGame]:
+        """
+        Split the lines into games and read them one at a time. The lines mustn't end with a new line and the spaces at
+        the start of every line except the first one must be removed.
+        """
+        for game_lines, _, _ in cls._split_games((line, 0) for line in lines):
+            yield _PDNGame('\n'.join(game_lines))
+
+    @classmethod
+    def iter_games(cls, filename: str, encodings: Union[List[str], str, None] = None) -> Iterator[_PDNGame]:
+        """
+        Read the games of a file one at a time, so the whole file is never in memory.
+        The first encoding that can decode the whole file is used.
+        """
+        encoding = cls._find_encoding(filename, cls._get_encodings(encodings))
+        if encoding is None:
+            # Like PDNReader, an empty game is returned if the file can't be decoded.
+            yield from cls._read_games([''])
+            return
+
+        def lines() -> Iterator[str]:
+            with open(filename, encoding=encoding) as pdn_file:
+                for index, line in enumerate(pdn_file):
+                    line = line[:-1] if line.endswith('\n') else line
+                    yield line if index == 0 else line.lstrip(' ')
+
+        yield from cls._read_games(lines())
+
+
+class PDNDatabase:
+    """
+    Read the games of a PDN file by their number or their tags without reading the rest of the file.
+    The file is read once to find where every game starts and ends and to get its tags. This index is saved next to the
+    file (in `filename + '.index'`) and it is built again when the file changes.
+    """
+    INDEX_VERSION = 1
+
+    def __init__(self, filename: str, encodings: Union[List[str], str, None] = None,
+                 index_filename: Optional[str] = None) -> None:
+        self.filename = filename
+        self.index_filename = index_filename or filename + '.index'
+        self.encodings = PDNReader._get_encodings(encodings)
+        self.encoding: Optional[str] = None
+        # The byte offset and the length in bytes of every game.
+        self.offsets: List[Tuple[int, int]] = []
+        self.tags: List[Dict[str, str]] = []
+        self._file_state: Tuple[int, int] = (-1, -1)
+        if not self._load_index():
+            self.build_index()
+
+    def __len__(self) -> int:
+        self._update_index()
+        return len(self.offsets)
+
+    def __getitem__(self, index: int) -> _PDNGame:
+        return self.get_game(index)
+
+    def __iter__(self) -> Iterator[_PDNGame]:
+        return self.get_games(range(len(self)))
+
+    def _get_file_state(self) -> Tuple[int, int]:
+        """Get the size and the modification time of the file."""
+        stat = os.stat(self.filename)
+        return stat.st_size, stat.st_mtime_ns
+
+    def _update_index(self) -> None:
+        """Build the index again if the file has changed."""
+        if self._get_file_state() != self._file_state:
+            self.build_index()
+
+    def _load_index(self) -> bool:
+        """Load the saved index. It returns False if there is no index or if it is out of date."""
+        try:
+            with open(self.index_filename, encoding='utf8') as index_file:
+                index = json.load(index_file)
+            if (index['version'] != self.INDEX_VERSION or index['encodings'] != self.encodings
+                    or (index['size'], index['mtime_ns']) != self._get_file_state()):
+                return False
+            self.encoding = index['encoding']
+            self.offsets = [(start, length) for start, length, _ in index['games']]
+            self.tags = [tags for _, _, tags in index['games']]
+            self._file_state = index['size'], index['mtime_ns']
+            return True
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+
+    def _save_index(self) -> None:
+        """Save the index next to the file. If it can't be saved, it is only kept in memory."""
+        index = {'version': self.INDEX_VERSION, 'size': self._file_state[0], 'mtime_ns': self._file_state[1],
+                 'encodings': self.encodings, 'encoding': self.encoding,
+                 'games': [[start, length, tags] for (start, length), tags in zip(self.offsets, self.tags)]}
+        try:
+            with open(self.index_filename, 'w', encoding='utf8') as index_file:
+                json.dump(index, index_file, separators=(',', ':'))
+        except OSError:
+            pass
+
+    def _read_lines(self, encoding: str) -> Iterator[Tuple[str, int]]:
+        """Get the lines of the file like PDNReader.iter_games does and the byte offsets where they start."""
+        offset = 0
+        with open(self.filename, 'rb') as pdn_file:
+            for index, raw_line in enumerate(pdn_file):
+                line = raw_line.decode(encoding)
+                line = line[:-1] if line.endswith('\n') else line
+                line = line[:-1] if line.endswith('\r') else line
+                stripped_line = line if index == 0 else line.lstrip(' ')
+                yield stripped_line, offset + len(line[:len(line) - len(stripped_line)].encode(encoding))
+                offset += len(raw_line)
+
+    def build_index(self) -> None:
+        """Read the file to find where every game starts and ends and to get its tags. The index is saved."""
+        self._file_state = self._get_file_state()
+        for encoding in self.encodings:
+            try:
+                offsets = []
+                tags = []
+                for game_lines, start, end in PDNReader._split_games(self._read_lines(encoding), encoding):
+                    offsets.append((start, (self._file_state[0] if end is None else end) - start))
+                    tags.append(_PDNGame._read_tags(game_lines)[0])
+                self.encoding = encoding
+                self.offsets = offsets
+                self.tags = tags
+                break
+            except (UnicodeDecodeError, LookupError):
+                pass
+        else:
+            # Like PDNReader, there is an empty game if the file can't be decoded.
+            self.encoding = None
+            self.offsets = [(0, 0)]
+            self.tags = [{}]
+        self._save_index()
+
+    def _read_game(self, pdn_file: BinaryIO, index: int) -> _PDNGame:
+        """Read a game from the open file."""
+        start, length = self.offsets[index]
+        return self._read_game_at(pdn_file, self.encoding, start, length)
+
+    @staticmethod
+    def _read_game_at(pdn_file: BinaryIO, encoding: Optional[str], start: int, length: int) -> _PDNGame:
+        """Read the game that starts at byte `start` of the open file."""
+        if encoding is None:
+            return _PDNGame('')
+        pdn_file.seek(start)
+        lines = pdn_file.read(length).decode(encoding).split('\n')
+        lines = [line[:-1] if line.endswith('\r') else line for line in lines]
+        lines = lines[:1] + [line.lstrip(' ') for line in lines[1:]]
+        if start > 0 and lines[0]:
+            # The game starts after the result of the previous game. PDNReader adds a space to the rest of that line.
+            lines[0] += ' '
+        return _PDNGame('\n'.join(lines))
+
+    def get_game(self, index: int) -> _PDNGame:
+        """Read game `index` (starting from 0)."""
+        self._update_index()
+        with open(self.filename, 'rb') as pdn_file:
+            return self._read_game(pdn_file, index)
+
+    def get_games(self, indices: Iterable[int]) -> Iterator[_PDNGame]:
+        """Read the games one at a time."""
+        self._update_index()
+        with open(self.filename, 'rb') as pdn_file:
+            for index in indices:
+                yield self._read_game(pdn_file, index)
+
+    def get_tags(self, index: int) -> Dict[str, str]:
+        """Get the tags of game `index` from the index, without reading the game."""
+        self._update_index()
+        return self.tags[index]
+
+    def find(self, **tags: str) -> List[int]:
+        """
+        Get the numbers of the games that have all the given tag values, e.g. `find(White='Player', Result='1-0')`.
+        Only the index is searched.
+        """
+        self._update_index()
+        return [index for index, game_tags in enumerate(self.tags)
+                if all(game_tags.get(name) == value for name, value in tags.items())]
+
+    def find_games(self, **tags: str) -> Iterator[_PDNGame]:
+        """Read the games that have all the given tag values."""
+        return self.get_games(self.find(**tags))
+
+
+class PDNValidationResult:
+    """The result of replaying a game of a PDN file."""
+    def __init__(self, index: int, tags: Dict[str, str], moves: List[str], game_ending: str, variant: str,
+                 fen: Optional[str] = None, error: Optional[str] = None) -> None:
+        self.index = index
+        self.tags = tags
+        self.moves = moves
+        self.game_ending = game_ending
+        self.variant = variant
+        # The fen after the last move that could be played.
+        self.fen = fen
+        # Why the game couldn't be replayed. It is None if all the moves were played.
+        self.error = error
+
+
+def _validate_game(index: int, game: _PDNGame, variant: Optional[str]) -> PDNValidationResult:
+    """Replay the moves of a game."""
+    variant = variant or game.variant or 'standard'
+    result = PDNValidationResult(index, game.tags, game.moves, game.game_ending, variant)
+    try:
+        board = Board(variant, game.tags.get('FEN', 'startpos'))
+    except Exception as exception:
+        result.error = f'Invalid starting position: {exception!r}'
+        return result
+    for move_number, move in enumerate(game.moves):
+        try:
+            board.push(Move(board, pdn_move=move))
+        except Exception as exception:
+            result.error = f'Move {move_number + 1} ({move}) can\'t be played: {exception!r}'
+            break
+    result.fen = board.fen
+    return result
+
+
+def _validate_games(filename: str, encoding: Optional[str], games: List[Tuple[int, int, int]],
+                    variant: Optional[str]) -> List[PDNValidationResult]:
+    """Read and replay some games of the file. Every game is given as (index, byte offset, length in bytes)."""
+    with open(filename, 'rb') as pdn_file:
+        return [_validate_game(index, PDNDatabase._read_game_at(pdn_file, encoding, start, length), variant)
+                for index, start, length in games]
+
+
+def parse_pdn_parallel(filename: str, workers: Optional[int] = None, variant: Optional[str] = None,
+                       encodings: Union[List[str], str, None] = None, chunk_size: int = 100,
+                       index_filename: Optional[str] = None) -> Iterator[PDNValidationResult]:
+    """
+    Parse every game of a PDN file and replay its moves using many processes. The results are returned in file order.
+    The file is split at the game boundaries with a PDNDatabase, so its index is saved (in `index_filename`) and reused.
+    Every process reads and replays `chunk_size` consecutive games at a time.
+
+    :param workers: The number of processes. It defaults to the number of CPUs. With 1 worker, no process is started.
+    :param variant: The variant of the games. If it isn't given, the variant of every game is found from its tags.
+    """
+    database = PDNDatabase(filename, encodings, index_filename)
+    games = [(index, start, length) for index, (start, length) in enumerate(database.offsets)]
+    chunks = [games[start:start + chunk_size] for start in range(0, len(games), chunk_size)]
+    if workers == 1:
+        for chunk in chunks:
+            yield from _validate_games(filename, database.encoding, chunk, variant)
+        return
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_validate_games, filename, database.encoding, chunk, variant) for chunk in chunks]
+        try:
+            for future in futures:
+                yield from future.result()
+        finally:
+            # Don't replay the rest of the games if the results aren't needed anymore.
+            for future in futures:
+                future.cancel()
 
 
 class PDNWriter:
@@ -199,8 +520,9 @@ class PDNWriter:
                  replay_moves_from_board: bool = True, file_encoding: str = 'utf8', file_mode: str = 'a') -> None:
         """
         :param replay_moves_from_board: The already saved pdn_move in move_stack may be wrong because it is pseudolegal
-        and doesn't account for ambiguous moves. If replay_moves_from_board is enabled, it will replay all the moves to
-        find the correct representation of them.
+        and doesn't account for ambiguous moves. If replay_moves_from_board is enabled, it will replay the moves to
+        find the correct representation of them. The moves that were built for the board in the position they were
+        played in (e.g. `Move(board, board_move=...)`) are already correct, so they aren't replayed.
         """
         assert board or moves is not None
         self.pdn_text = ''
@@ -230,12 +552,15 @@ class PDNWriter:
 
     def _fix_ambiguous_moves(self) -> None:
         """Replay the moves to fix any ambiguous PDN move."""
-        if self.moves and type(self.moves[0]) == str:
+        if not self.replay_moves_from_board or self.moves and type(self.moves[0]) == str:
+            return
+        legal_moves = self.board._legal_move_stack if self.board else [False] * len(self.moves)
+        if all(legal_moves):
             return
         game = Board(self.variant, self.starting_fen)
         correct_moves = []
-        for move in self.moves:
-            correct_move = Move(game, board_move=move.board_move)
+        for move, legal_move in zip(self.moves, legal_moves):
+            correct_move = move if legal_move else Move(game, board_move=move.board_move)
             correct_moves.append(correct_move)
             game.push(correct_move)
         self.moves = correct_moves
@@ -301,3 +626,48 @@ class PDNWriter:
         else:
             fen = 'W:W31,32,33,34,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50:B1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20'
         return fen_to_variant(fen, self.variant)
+
+
+class PDNBatchWriter:
+    """
+    Write many games to a file. The file is kept open and the games are written in batches of `batch_size` games.
+    Use it in a `with` statement or call `close` so that the last games are written.
+    """
+    def __init__(self, filename: str, batch_size: int = 100, file_encoding: str = 'utf8', file_mode: str = 'a') -> None:
+        self.filename = filename
+        self.batch_size = batch_size
+        self.games_written = 0
+        self._games: List[str] = []
+        self._file: TextIO = open(filename, file_mode, encoding=file_encoding)
+
+    def add_game(self, board: Optional[Board] = None, moves: Union[List[str], List[Move], None] = None,
+                 variant: Optional[str] = None, starting_fen: Optional[str] = None,
+                 tags: Optional[Dict[str, Union[str, int]]] = None, game_ending: str = '*',
+                 replay_moves_from_board: bool = True) -> str:
+        """Add a game. It takes the same arguments as PDNWriter and returns the PDN of the game."""
+        # PDNWriter adds the GameType and FEN tags, so the tags are copied in case they are used for many games.
+        pdn_text = PDNWriter('', board, moves, variant, starting_fen, dict(tags) if tags else None, game_ending,
+                             replay_moves_from_board).pdn_text
+        self._games.append(pdn_text)
+        if len(self._games) >= self.batch_size:
+            self.flush()
+        return pdn_text
+
+    def flush(self) -> None:
+        """Write the games that haven't been written yet."""
+        self._file.write(''.join(self._games))
+        self._file.flush()
+        self.games_written += len(self._games)
+        self._games = []
+
+    def close(self) -> None:
+        """Write the rest of the games and close the file."""
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self) -> 'PDNBatchWriter':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
@@ -0,0 +1,258 @@
+"""
+Store games in a compact binary format, which is smaller than PDN and faster to read.
+
+An archive starts with `MAGIC` and the format version. Every game is saved as its length in bytes followed by the
+variant, the starting fen, the result, the tags and the moves. The numbers are saved as varints and the strings as their
+length followed by their UTF-8 bytes. The moves are saved either as their index in the legal moves of the position
+(`'index'`, one byte per move for almost all the moves) or as the squares they pass through (`'squares'`, which doesn't
+need the legal moves to be found to read the game).
+"""
+
+from draughts.core.variant import Board, Move
+from draughts.PDN import PDNReader, PDNWriter, PDNBatchWriter, _PDNGame
+from typing import List, Optional, Dict, Union, Iterator, Any, BinaryIO, Tuple
+import os
+
+MAGIC = b'PDGA'
+VERSION = 1
+MOVE_ENCODINGS = ['index', 'squares']
+
+
+def _encode_varint(number: int) -> bytes:
+    """Encode a non-negative number in 7 bits per byte. The highest bit shows if more bytes follow."""
+    encoded = bytearray()
+    while number >= 0x80:
+        encoded.append(number & 0x7f | 0x80)
+        number >>= 7
+    encoded.append(number)
+    return bytes(encoded)
+
+
+def _decode_varint(data: bytes, position: int) -> Tuple[int, int]:
+    """Decode the varint that starts at `position`. It returns the number and the position after it."""
+    number = 0
+    shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        number |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return number, position
+        shift += 7
+
+
+def _encode_string(text: str) -> bytes:
+    """Encode a string as its length and its UTF-8 bytes."""
+    encoded = text.encode('utf8')
+    return _encode_varint(len(encoded)) + encoded
+
+
+def _decode_string(data: bytes, position: int) -> Tuple[str, int]:
+    """Decode the string that starts at `position`. It returns the string and the position after it."""
+    length, position = _decode_varint(data, position)
+    return data[position:position + length].decode('utf8'), position + length
+
+
+def _read_varint(archive_file: BinaryIO) -> Optional[int]:
+    """Read a varint from the file. It returns None at the end of the file."""
+    number = 0
+    shift = 0
+    while True:
+        byte = archive_file.read(1)
+        if not byte:
+            if shift:
+                raise ValueError('The archive ends in the middle of a game.')
+            return None
+        number |= (byte[0] & 0x7f) << shift
+        if byte[0] < 0x80:
+            return number
+        shift += 7
+
+
+def _read_version(archive_file: BinaryIO, filename: str) -> int:
+    """Check that the file starts with `MAGIC` and get the version of the archive."""
+    header = archive_file.read(len(MAGIC) + 1)
+    if len(header) <= len(MAGIC) or header[:len(MAGIC)] != MAGIC:
+        raise ValueError(f'{filename} is not a game archive.')
+    return header[len(MAGIC)]
+
+
+class ArchiveGame:
+    """A game read from an archive."""
+    def __init__(self, variant: str, starting_fen: str, tags: Dict[str, str], board_moves: List[List[List[int]]],
+                 game_ending: str = '*') -> None:
+        self.variant = variant
+        self.starting_fen = starting_fen
+        self.tags = tags
+        # The moves in board_move format.
+        self.board_moves = board_moves
+        self.game_ending = game_ending
+
+    def board(self) -> Board:
+        """Replay the game and get the board after the last move."""
+        board = Board(self.variant, self.starting_fen)
+        for board_move in self.board_moves:
+            board.push(Move(board, board_move=board_move))
+        return board
+
+    def to_pdn(self) -> str:
+        """Get the game in PDN."""
+        return PDNWriter('', self.board(), tags=dict(self.tags), game_ending=self.game_ending).pdn_text
+
+
+class ArchiveWriter:
+    """
+    Write games to an archive. The games are added to the end of the file if it already exists.
+    Use it in a `with` statement or call `close` so that the file is closed.
+
+    :param move_encoding: How the moves are saved. It can be `'index'` or `'squares'` (see the module's docstring).
+    """
+    def __init__(self, filename: str, move_encoding: str = 'index') -> None:
+        if move_encoding not in MOVE_ENCODINGS:
+            raise ValueError(f'Unknown move encoding {move_encoding}. The available move encodings are: '
+                             f'{", ".join(MOVE_ENCODINGS)}.')
+        self.filename = filename
+        self.move_encoding = move_encoding
+        if os.path.exists(filename) and os.path.getsize(filename) > 0:
+            # Games are only added to an archive of the same version, so other files aren't changed.
+            with open(filename, 'rb') as archive_file:
+                version = _read_version(archive_file, filename)
+            if version != VERSION:
+                raise ValueError(f'Games can only be added to archives of version {VERSION}, but the version of '
+                                 f'{filename} is {version}.')
+        self._file: BinaryIO = open(filename, 'ab')
+        if self._file.tell() == 0:
+            self._file.write(MAGIC + bytes([VERSION]))
+
+    def add_game(self, board: Board, tags: Optional[Dict[str, Union[str, int]]] = None, game_ending: str = '*') -> None:
+        """Add the game played on the board."""
+        tags = tags or {}
+        record = bytearray()
+        record += _encode_string(board.variant)
+        record += _encode_string(board.initial_fen)
+        record += _encode_string(game_ending)
+        record += _encode_varint(len(tags))
+        for name, value in tags.items():
+            record += _encode_string(name) + _encode_string(str(value))
+        record.append(MOVE_ENCODINGS.index(self.move_encoding))
+        record += _encode_varint(len(board.move_stack))
+        if self.move_encoding == 'index':
+            record += self._encode_indexes(board)
+        else:
+            for move in board.move_stack:
+                steps = [move.board_move[0][0]] + [semi_move[1] for semi_move in move.board_move]
+                record += _encode_varint(len(steps)) + b''.join(map(_encode_varint, steps))
+        self._file.write(_encode_varint(len(record)) + record)
+
+    @staticmethod
+    def _encode_indexes(board: Board) -> bytes:
+        """Encode every move as its index in the legal moves. 0 is a null move."""
+        encoded = bytearray()
+        if all(board._legal_move_stack):
+            # The moves were built for the board, so they already have the legal moves of their position.
+            for move in board.move_stack:
+                is_null = move.board_move == [[0, 0]]
+                encoded += _encode_varint(0 if is_null else move.possible_moves.index(move.board_move) + 1)
+            return bytes(encoded)
+        game = Board(board.variant, board.initial_fen)
+        for move in board.move_stack:
+            if move.board_move == [[0, 0]]:
+                encoded += _encode_varint(0)
+                game.push(Move(game, board_move=move.board_move))
+                continue
+            legal_moves, _ = game._legal_moves_board()
+            index = legal_moves.index(move.board_move)
+            encoded += _encode_varint(index + 1)
+            game.push(Move(game, board_move=legal_moves[index]))
+        return bytes(encoded)
+
+    def add_pdn_game(self, game: _PDNGame, variant: Optional[str] = None) -> None:
+        """Add a game read by PDNReader. The moves are replayed, so an error is raised if one of them isn't legal."""
+        board = Board(variant or game.variant or 'standard', game.tags.get('FEN', 'startpos'))
+        for move in game.moves:
+            board.push(Move(board, pdn_move=move))
+        self.add_game(board, game.tags, game.game_ending)
+
+    def close(self) -> None:
+        """Close the file."""
+        self._file.close()
+
+    def __enter__(self) -> 'ArchiveWriter':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+class ArchiveReader:
+    """Read the games of an archive one at a time, so the whole file is never in memory."""
+    def __init__(self, filename: str) -> None:
+        self.filename = filename
+
+    def __iter__(self) -> Iterator[ArchiveGame]:
+        with open(self.filename, 'rb') as archive_file:
+            version = _read_version(archive_file, self.filename)
+            if version > VERSION:
+                raise ValueError(f'The archive version {version} is newer than the supported version {VERSION}.')
+            while True:
+                length = _read_varint(archive_file)
+                if length is None:
+                    return
+                record = archive_file.read(length)
+                if len(record) < length:
+                    raise ValueError('The archive ends in the middle of a game.')
+                yield self._decode_game(record)
+
+    @staticmethod
+    def _decode_game(record: bytes) -> ArchiveGame:
+        """Decode the bytes of a game."""
+        variant, position = _decode_string(record, 0)
+        starting_fen, position = _decode_string(record, position)
+        game_ending, position = _decode_string(record, position)
+        tag_count, position = _decode_varint(record, position)
+        tags = {}
+        for _ in range(tag_count):
+            name, position = _decode_string(record, position)
+            tags[name], position = _decode_string(record, position)
+        move_encoding = MOVE_ENCODINGS[record[position]]
+        move_count, position = _decode_varint(record, position + 1)
+        board_moves = []
+        if move_encoding == 'index':
+            game = Board(variant, starting_fen)
+            for _ in range(move_count):
+                index, position = _decode_varint(record, position)
+                if index == 0:
+                    board_move = [[0, 0]]
+                    game.push(Move(game, board_move=board_move))
+                else:
+                    board_move = game._legal_moves_board()[0][index - 1]
+                    game.push(Move(game, board_move=board_move))
+                board_moves.append(board_move)
+        else:
+            for _ in range(move_count):
+                step_count, position = _decode_varint(record, position)
+                steps = []
+                for _ in range(step_count):
+                    square, position = _decode_varint(record, position)
+                    steps.append(square)
+                board_moves.append([[steps[index], steps[index + 1]] for index in range(step_count - 1)])
+        return ArchiveGame(variant, starting_fen, tags, board_moves, game_ending)
+
+
+def pdn_to_archive(pdn_filename: str, archive_filename: str, move_encoding: str = 'index',
+                   variant: Optional[str] = None) -> int:
+    """Copy the games of a PDN file to an archive. It returns the number of games."""
+    games = 0
+    with ArchiveWriter(archive_filename, move_encoding) as writer:
+        for game in PDNReader.iter_games(pdn_filename):
+            writer.add_pdn_game(game, variant)
+            games += 1
+    return games
+
+
+def archive_to_pdn(archive_filename: str, pdn_filename: str) -> int:
+    """Copy the games of an archive to a PDN file. It returns the number of games."""
+    with PDNBatchWriter(pdn_filename) as writer:
+        for game in ArchiveReader(archive_filename):
+            writer.add_game(game.board(), tags=game.tags, game_ending=game.game_ending)
+    return writer.games_written
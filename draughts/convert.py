@@ -1,7 +1,7 @@
 from math import ceil
 import string
 import re
-from typing import Tuple, Optional, List
+from typing import Tuple, Optional, List, Dict
 
 
 def _get_squares(variant: Optional[str]) -> Tuple[int, int, int, bool]:
@@ -23,6 +23,68 @@ def _get_squares(variant: Optional[str]) -> Tuple[int, int, int, bool]:
     return total_squares, squares_per_row, squares_per_column, every_other_square
 
 
+# The notation of every variant. 0: the rows are reversed, 1: the rows and the columns are reversed,
+# 2: the same as the internal notation, 3: the columns are reversed.
+_VARIANT_TO_NOTATION = {'standard': 2, 'english': 1, 'italian': 2, 'russian': 0, 'brazilian': 0, 'turkish': 0,
+                        'frisian': 2, 'frysk!': 2, 'antidraughts': 2, 'breakthrough': 2}
+
+# The rotated square of every square (including 0, which is used for null moves) for each variant and notation.
+_ROTATION_TABLES: Dict[Tuple[Optional[str], int], List[int]] = {}
+
+# The algebraic square of every numeric square and the numeric square of every algebraic square for each variant.
+_ALGEBRAIC_TABLES: Dict[Optional[str], Tuple[List[str], Dict[str, int]]] = {}
+
+
+def _compute_rotated_square(square: int, notation: int, variant: Optional[str]) -> int:
+    """Rotate the square without using the tables."""
+    total_squares, per_row, _, _ = _get_squares(variant)
+
+    def reverse_column(square: int) -> int:
+        square_in_row = square % per_row
+        if square_in_row == 0:
+            square_in_row += per_row
+        return ((square - 1) // per_row) * per_row + (per_row - (square_in_row - 1))
+
+    def reverse_row_and_column(square: int) -> int:
+        return total_squares + 1 - square
+
+    if notation == 0:
+        return reverse_column(reverse_row_and_column(square))
+    elif notation == 1:
+        return reverse_row_and_column(square)
+    elif notation == 2:
+        return square
+    else:  # notation == 3
+        return reverse_column(square)
+
+
+def _get_notation(variant: Optional[str], notation: Optional[int] = None) -> int:
+    """Get the notation of the variant if the notation isn't given."""
+    if notation is not None:
+        return notation
+    return _VARIANT_TO_NOTATION.get(variant, 2) if variant else 2
+
+
+def _rotation_table(variant: Optional[str], notation: Optional[int] = None) -> List[int]:
+    """Get the rotated square of every square of the variant. Rotating a rotated square gives the original square."""
+    notation = _get_notation(variant, notation)
+    key = (variant, notation)
+    table = _ROTATION_TABLES.get(key)
+    if table is None:
+        table = [_compute_rotated_square(square, notation, variant) for square in range(_get_squares(variant)[0] + 1)]
+        _ROTATION_TABLES[key] = table
+    return table
+
+
+def _rotate_square(square: int, notation: Optional[int] = None, variant: Optional[str] = None) -> int:
+    """Rotate one square."""
+    table = _rotation_table(variant, notation)
+    if 0 <= square < len(table):
+        return table[square]
+    # The square isn't on the board, so it isn't in the table.
+    return _compute_rotated_square(square, _get_notation(variant, notation), variant)
+
+
 def _rotate_move(internal_move: str, notation: Optional[int] = None, variant: Optional[str] = None) -> str:
     """Rotate the move."""
     separators = ['-', 'x', ':']
@@ -33,45 +95,14 @@ def _rotate_move(internal_move: str, notation: Optional[int] = None, variant: Op
         if split_move[0] != internal_move:
             correct_seperator = separator
             break
-    int_move_parts = list(map(int, split_move))
-    variant_to_notation = {'standard': 2, 'english': 1, 'italian': 2, 'russian': 0, 'brazilian': 0, 'turkish': 0,
-                           'frisian': 2, 'frysk!': 2, 'antidraughts': 2, 'breakthrough': 2}
-    if notation is None:
-        notation = variant_to_notation.get(variant, 2)
-
-    def reverse_column(split_int_move: List[int]) -> List[int]:
-        per_row = _get_squares(variant)[1]
-        for index, square in enumerate(split_int_move):
-            square_in_row = square % per_row
-            if square_in_row == 0:
-                square_in_row += per_row
-            split_int_move[index] = ((square - 1) // per_row) * per_row + (per_row - (square_in_row - 1))
-        return split_int_move
-
-    def reverse_row_and_column(split_int_move: List[int]) -> List[int]:
-        squares = _get_squares(variant)[0]
-        split_int_move = list(map(lambda square: squares + 1 - square, split_int_move))
-        return split_int_move
-
-    def reverse_row(split_int_move: List[int]) -> List[int]:
-        return reverse_column(reverse_row_and_column(split_int_move))
-
-    if notation == 0:
-        rotated_move = reverse_row(int_move_parts)
-    elif notation == 1:
-        rotated_move = reverse_row_and_column(int_move_parts)
-    elif notation == 2:
-        rotated_move = int_move_parts
-    else:  # notation == 3
-        rotated_move = reverse_column(int_move_parts)
-
-    rotated_str_move = list(map(str, rotated_move))
-    return correct_seperator.join(rotated_str_move)
+    return correct_seperator.join([str(_rotate_square(int(square), notation, variant)) for square in split_move])
 
 
 def _algebraic_to_number(algebraic_move: str, squares_per_letter: Optional[int] = None, variant: Optional[str] = None,
                          every_other_square: Optional[bool] = None) -> str:
     """Convert an algebraic move to a numeric move."""
+    # The tables can only be used when the board is the variant's board.
+    from_algebraic = _algebraic_tables(variant)[1] if squares_per_letter is None and every_other_square is None else {}
     if every_other_square is None:
         if variant == 'turkish':
             every_other_square = False
@@ -103,7 +134,10 @@ def _algebraic_to_number(algebraic_move: str, squares_per_letter: Optional[int]
 
     numeric_move = []
     for move in split_move:
-        numeric_move.append(_algebraic_to_numeric_square(move, squares_per_letter, every_other_square=every_other_square))
+        square = from_algebraic.get(move)
+        if square is None:
+            square = _algebraic_to_numeric_square(move, squares_per_letter, every_other_square=every_other_square)
+        numeric_move.append(square)
     numeric_str_move = list(map(str, numeric_move))
     return correct_seperator.join(numeric_str_move)
 
@@ -121,6 +155,8 @@ def _algebraic_to_numeric_square(square: str, squares_per_letter: int, every_oth
 def _number_to_algebraic(number_move: str, width: Optional[int] = None, variant: Optional[str] = None,
                          every_other_square: Optional[bool] = None) -> str:
     """Convert a numeric move to an algebraic move."""
+    # The tables can only be used when the board is the variant's board.
+    to_algebraic = _algebraic_tables(variant)[0] if width is None and every_other_square is None else ['']
     if every_other_square is None:
         every_other_square = _get_squares(variant)[3]
     algebraic_notation = number_move[0] in string.ascii_letters
@@ -140,7 +176,10 @@ def _number_to_algebraic(number_move: str, width: Optional[int] = None, variant:
 
     algebraic_move = []
     for move_part in split_move:
-        algebraic_move.append(_numeric_to_algebraic_square(move_part, width, every_other_square=every_other_square))
+        if move_part.isdigit() and 0 < int(move_part) < len(to_algebraic):
+            algebraic_move.append(to_algebraic[int(move_part)])
+        else:
+            algebraic_move.append(_numeric_to_algebraic_square(move_part, width, every_other_square=every_other_square))
     return correct_seperator.join(algebraic_move)
 
 
@@ -158,6 +197,20 @@ def _numeric_to_algebraic_square(square: str, width: int, every_other_square: Op
     return string.ascii_lowercase[column] + str(row + 1)
 
 
+def _algebraic_tables(variant: Optional[str]) -> Tuple[List[str], Dict[str, int]]:
+    """Get the algebraic square of every numeric square and the numeric square of every algebraic square."""
+    tables = _ALGEBRAIC_TABLES.get(variant)
+    if tables is None:
+        total_squares, width, squares_per_letter, every_other_square = _get_squares(variant)
+        to_algebraic = [''] + [_numeric_to_algebraic_square(str(square), width, every_other_square)
+                               for square in range(1, total_squares + 1)]
+        from_algebraic = {square: _algebraic_to_numeric_square(square, squares_per_letter, every_other_square)
+                          for square in to_algebraic[1:]}
+        tables = to_algebraic, from_algebraic
+        _ALGEBRAIC_TABLES[variant] = tables
+    return tables
+
+
 def _change_fen_from_variant(li_fen: str, notation: Optional[int] = None, squares_per_letter: int = 5,
                              every_other_square: bool = True, variant: Optional[str] = None) -> str:
     """Convert an internal fen to the correct fen for the variant."""
@@ -184,16 +237,15 @@ def _change_fen_from_variant(li_fen: str, notation: Optional[int] = None, square
             start = _algebraic_to_numeric_square(start_end[0], squares_per_letter, every_other_square)
             end = _algebraic_to_numeric_square(start_end[1], squares_per_letter, every_other_square)
             for number in range(start, end + 1):
-                white_pieces_remove_hyphen.append(add_for_king + _rotate_move(str(number), notation=notation, variant=variant))
+                white_pieces_remove_hyphen.append(add_for_king + str(_rotate_square(number, notation, variant)))
         else:
             add_for_king = ''
             if white_piece[0] == 'K':
                 add_for_king = 'K'
                 white_piece = white_piece[1:]
             white_pieces_remove_hyphen.append(
-                add_for_king + _rotate_move(
-                    str(_algebraic_to_numeric_square(white_piece, squares_per_letter, every_other_square)),
-                    notation=notation, variant=variant))
+                add_for_king + str(_rotate_square(
+                    _algebraic_to_numeric_square(white_piece, squares_per_letter, every_other_square), notation, variant)))
 
     black_pieces_remove_hyphen = []
     for black_piece in black_pieces:
@@ -206,16 +258,15 @@ def _change_fen_from_variant(li_fen: str, notation: Optional[int] = None, square
             start = _algebraic_to_numeric_square(start_end[0], squares_per_letter, every_other_square)
             end = _algebraic_to_numeric_square(start_end[1], squares_per_letter, every_other_square)
             for number in range(start, end + 1):
-                black_pieces_remove_hyphen.append(add_for_king + _rotate_move(str(number), notation=notation, variant=variant))
+                black_pieces_remove_hyphen.append(add_for_king + str(_rotate_square(number, notation, variant)))
         else:
             add_for_king = ''
             if black_piece[0] == 'K':
                 add_for_king = 'K'
                 black_piece = black_piece[1:]
             black_pieces_remove_hyphen.append(
-                add_for_king + _rotate_move(
-                    str(_algebraic_to_numeric_square(black_piece, squares_per_letter, every_other_square)),
-                    notation=notation, variant=variant))
+                add_for_king + str(_rotate_square(
+                    _algebraic_to_numeric_square(black_piece, squares_per_letter, every_other_square), notation, variant)))
 
     # Because in english black starts.
     white_starts = variant not in ['english']
@@ -277,3 +328,47 @@ def move_to_variant(move: str, variant: Optional[str] = None, to_algebraic: Opti
     if to_algebraic is not False and variant in ['russian', 'brazilian', 'turkish']:
         move = _number_to_algebraic(move, variant=variant)
     return move
+
+
+def square_to_variant(square: int, variant: Optional[str] = None) -> int:
+    """Convert an internal square to the variant's numeric square."""
+    return _rotate_square(square, variant=variant.lower() if variant else variant)
+
+
+def square_from_variant(square: int, variant: Optional[str] = None) -> int:
+    """Convert a numeric square of the variant to an internal square."""
+    # Rotating a square twice gives the original square.
+    return _rotate_square(square, variant=variant.lower() if variant else variant)
+
+
+def square_to_algebraic(square: int, variant: Optional[str] = None) -> str:
+    """Convert a numeric square of the variant to an algebraic square."""
+    variant = variant.lower() if variant else variant
+    to_algebraic = _algebraic_tables(variant)[0]
+    if 0 < square < len(to_algebraic):
+        return to_algebraic[square]
+    _, width, _, every_other_square = _get_squares(variant)
+    return _numeric_to_algebraic_square(str(square), width, every_other_square)
+
+
+def square_from_algebraic(square: str, variant: Optional[str] = None) -> int:
+    """Convert an algebraic square of the variant to a numeric square."""
+    variant = variant.lower() if variant else variant
+    numeric_square = _algebraic_tables(variant)[1].get(square.lower())
+    if numeric_square is not None:
+        return numeric_square
+    return int(_algebraic_to_number(square, variant=variant))
+
+
+def board_move_to_variant(board_move: List[List[int]], variant: Optional[str] = None) -> List[List[int]]:
+    """Convert an internal board move to a board move with the variant's numeric squares."""
+    table = _rotation_table(variant.lower() if variant else variant)
+    if all(0 <= square < len(table) for steps in board_move for square in steps):
+        return [[table[square] for square in steps] for steps in board_move]
+    return [[square_to_variant(square, variant) for square in steps] for steps in board_move]
+
+
+def board_move_from_variant(board_move: List[List[int]], variant: Optional[str] = None) -> List[List[int]]:
+    """Convert a board move with the variant's numeric squares to an internal board move."""
+    # Rotating a square twice gives the original square.
+    return board_move_to_variant(board_move, variant)
@@ -0,0 +1,438 @@
+from __future__ import annotations
+import pickle
+from draughts.core.geometry import get_geometry
+from typing import Optional, List, Tuple, Dict, Any
+
+WHITE = 2
+BLACK = 1
+
+
+# The squares of the set bits of every byte, for every byte of a mask (turkish uses the bits 1 to 64).
+_BYTE_SQUARES = [[tuple(offset + bit for bit in range(8) if byte >> bit & 1) for byte in range(256)]
+                 for offset in range(0, 72, 8)]
+
+
+def _squares(mask: int) -> List[int]:
+    """Get the squares in the mask from the smallest to the largest."""
+    squares: List[int] = []
+    for byte_squares in _BYTE_SQUARES:
+        if not mask:
+            break
+        squares.extend(byte_squares[mask & 255])
+        mask >>= 8
+    return squares
+
+
+def _count(mask: int) -> int:
+    """Count the squares in the mask."""
+    return bin(mask).count('1')
+
+
+class BitPiece:
+    """A snapshot of a piece on a BitBoard. It has the same attributes as Piece that Game uses."""
+    def __init__(self, position: int, player: int, king: bool, became_king: int = -100) -> None:
+        self.position = position
+        self.player = player
+        self.king = king
+        self.became_king = became_king
+        self.captured = False
+
+
+class BitBoardSearcher:
+    """Answer the same queries as BoardSearcher from the masks of a BitBoard."""
+    def __init__(self) -> None:
+        self._key: Optional[Tuple[int, int, int]] = None
+        self.uncaptured_pieces: List[BitPiece] = []
+        self.filled_positions: List[int] = []
+        self.open_positions: List[int] = []
+        self.player_positions: Dict[int, List[int]] = {}
+        self.player_pieces: Dict[int, List[BitPiece]] = {}
+        self.position_pieces: Dict[int, BitPiece] = {}
+
+    def build(self, board: BitBoard) -> BitBoardSearcher:
+        """Build the searcher. It is only rebuilt if the position has changed."""
+        key = (board.white, board.black, board.kings)
+        if key == self._key:
+            return self
+        self._key = key
+        self.position_pieces = {}
+        for player, mask in [(WHITE, board.white), (BLACK, board.black)]:
+            for square in _squares(mask):
+                self.position_pieces[square] = BitPiece(square, player, bool(board.kings >> square & 1),
+                                                        board.became_king.get(square, -100))
+        self.filled_positions = sorted(self.position_pieces)
+        self.uncaptured_pieces = [self.position_pieces[square] for square in self.filled_positions]
+        self.open_positions = _squares(board.empty)
+        self.player_positions = {BLACK: _squares(board.black), WHITE: _squares(board.white)}
+        self.player_pieces = {player: [self.position_pieces[square] for square in positions]
+                              for player, positions in self.player_positions.items()}
+        return self
+
+    def get_pieces_by_player(self, player_number: int) -> List[BitPiece]:
+        """Get all the pieces of one player."""
+        return self.player_pieces[player_number]
+
+    def get_positions_by_player(self, player_number: int) -> List[int]:
+        """Get the positions of one player's pieces."""
+        return self.player_positions[player_number]
+
+    def get_piece_by_position(self, position: int) -> BitPiece:
+        """Get the piece given its position."""
+        return self.position_pieces[position]
+
+
+class BitBoard:
+    """
+    A position stored as one integer mask per player and one mask for the kings (square n is bit n).
+    It follows the same rules and returns the moves in the same order as Board, so Game can use either of them.
+    """
+    def __init__(self, variant: str = 'standard', fen: str = 'startpos') -> None:
+        self.variant = variant
+        geometry = get_geometry(variant)
+        self.geometry = geometry
+        self.width = geometry.width
+        self.height = geometry.height
+        self.position_count = geometry.position_count
+        self.position_layout = geometry.position_layout
+        self.all_squares = ((1 << (self.position_count + 1)) - 1) ^ 1
+
+        self.white = 0
+        self.black = 0
+        self.kings = 0
+        # The move number each king was crowned, with the king's square as the key.
+        self.became_king: Dict[int, int] = {}
+        self.square_requiring_further_capture_moves: Optional[int] = None
+        self.previous_move_was_capture = False
+        self.fen = fen
+        self._searcher = BitBoardSearcher()
+
+        if fen != 'startpos':  # Hub fen
+            self.player_turn = WHITE if fen[0].lower() == 'w' else BLACK
+            for index, letter in enumerate(fen[1:]):
+                # Index + 1 because enumerate returns 0-49 while the board takes 1-50.
+                bit = 1 << (index + 1)
+                if letter.lower() == 'w':
+                    self.white |= bit
+                elif letter.lower() == 'b':
+                    self.black |= bit
+                if letter in 'WB':
+                    self.kings |= bit
+        else:
+            self.player_turn = WHITE
+            rows_per_user_with_pieces = 1 if variant == 'frysk!' else 2 if variant == 'turkish' else (
+                3 if self.width == 4 else 4)
+            starting_piece_count = self.width * rows_per_user_with_pieces
+            for square in range(1, starting_piece_count + 1):
+                self.black |= 1 << square
+                self.white |= 1 << (self.position_count + 1 - square)
+
+        self.pieces_hash = self.compute_pieces_hash()
+        self.pieces_promote_and_stop_capturing = geometry.pieces_promote_and_stop_capturing
+        self.pieces_promote_and_continue_capturing = geometry.pieces_promote_and_continue_capturing
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The geometry is shared by all the boards of a variant, so it isn't copied.
+        state = self.__dict__.copy()
+        del state['geometry']
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.geometry = get_geometry(self.variant)
+
+    @property
+    def empty(self) -> int:
+        """Get the mask of the empty squares."""
+        return self.all_squares & ~(self.white | self.black)
+
+    @property
+    def searcher(self) -> BitBoardSearcher:
+        """Get a searcher with the same interface as BoardSearcher."""
+        return self._searcher.build(self)
+
+    def _player_mask(self, player: int) -> int:
+        """Get the mask of a player's pieces."""
+        return self.white if player == WHITE else self.black
+
+    def _capture_moves_for_square(self, square: int, player: int, king: bool, captures: List[int]
+                                  ) -> List[Tuple[int, int]]:
+        """Get the landing square and the captured square of every capture the piece can make."""
+        geometry = self.geometry
+        own = self.white if player == WHITE else self.black
+        enemy = self.black if player == WHITE else self.white
+        occupied = own | enemy
+        moves = []
+        if king and geometry.kings_can_move_more_than_one_square:
+            # Kings in multi-captures can't go over a piece they have captured in that move sequence in most
+            # variants. They can in turkish, but they can't turn 180 degrees, so the last capture still blocks them.
+            if geometry.kings_can_jump_over_an_already_captured_piece:
+                captures = captures[-1:]
+            blocked = 0
+            for captured in captures:
+                blocked |= 1 << captured
+            for ray in geometry.king_capture_rays[player][square]:
+                enemy_square = 0
+                for ray_square in ray:
+                    bit = 1 << ray_square
+                    if enemy_square:
+                        if occupied & bit or blocked & bit:
+                            break
+                        moves.append((ray_square, enemy_square))
+                    elif occupied & bit:
+                        if own & bit:
+                            break
+                        enemy_square = ray_square
+                    elif blocked & bit:
+                        break
+        else:
+            jumps = geometry.king_jumps[player][square] if king else geometry.man_jumps[player][square]
+            for jumped, landing in jumps:
+                if enemy >> jumped & 1 and not occupied >> landing & 1:
+                    if not king and not geometry.man_can_capture_king and self.kings >> jumped & 1:
+                        continue
+                    moves.append((landing, jumped))
+        return moves
+
+    def _positional_moves_for_square(self, square: int, player: int, king: bool, empty: Optional[int] = None
+                                     ) -> List[int]:
+        """Get the squares the piece can move to without capturing."""
+        geometry = self.geometry
+        if empty is None:
+            empty = self.empty
+        if king and geometry.kings_can_move_more_than_one_square:
+            moves = []
+            for ray in geometry.king_rays[player][square]:
+                for ray_square in ray:
+                    if not empty >> ray_square & 1:
+                        break
+                    moves.append(ray_square)
+            return moves
+        steps = geometry.king_steps[player][square] if king else geometry.man_steps[player][square]
+        return [step for step in steps if empty >> step & 1]
+
+    def _squares_in_play(self) -> List[int]:
+        """
+        Get the squares of the pieces in play. They are: All the pieces of the player playing now except when a piece
+        is in the middle of a multi-capture, where we only return the piece that is in the middle of the multi-capture.
+        """
+        if self.square_requiring_further_capture_moves is not None:
+            return [self.square_requiring_further_capture_moves]
+        return _squares(self._player_mask(self.player_turn))
+
+    def count_movable_player_pieces(self, player_number: int = 1, captures: Optional[List[int]] = None) -> int:
+        """Count the pieces of one player that can be moved."""
+        if captures is None:
+            captures = []
+        count = 0
+        for square in _squares(self._player_mask(player_number)):
+            king = bool(self.kings >> square & 1)
+            if (self._capture_moves_for_square(square, player_number, king, captures) or
+                    self._positional_moves_for_square(square, player_number, king)):
+                count += 1
+        return count
+
+    def get_possible_moves(self, captures: List[int]) -> List[List[int]]:
+        """Get all possible moves."""
+        capture_moves = self.get_possible_capture_moves(captures)
+
+        return capture_moves if capture_moves else self.get_possible_positional_moves()
+
+    def get_possible_capture_moves(self, captures: List[int]) -> List[List[int]]:
+        """Get all possible capture moves (not positional moves)."""
+        moves = []
+        for square in self._squares_in_play():
+            king = bool(self.kings >> square & 1)
+            for landing, _ in self._capture_moves_for_square(square, self.player_turn, king, captures):
+                moves.append([square, landing])
+        return moves
+
+    def get_possible_positional_moves(self) -> List[List[int]]:
+        """Get all possible positional moves (not capture moves)."""
+        moves = []
+        empty = self.empty
+        for square in self._squares_in_play():
+            king = bool(self.kings >> square & 1)
+            for landing in self._positional_moves_for_square(square, self.player_turn, king, empty):
+                moves.append([square, landing])
+        return moves
+
+    def get_moves(self, captures: List[int], move_number: int
+                  ) -> Tuple[List[List[List[int]]], List[List[Optional[int]]]]:
+        """
+        Get the whole move sequences for the player in play and the pieces each sequence captures.
+        The multi-captures are played and undone on this board, so no copies are made.
+        """
+        turn = self.player_turn
+        moves = []
+        captured_pieces: List[List[Optional[int]]] = []
+        for square in self._squares_in_play():
+            king = bool(self.kings >> square & 1)
+            for landing, enemy_position in self._capture_moves_for_square(square, turn, king, captures):
+                move = [square, landing]
+                state = self.save_state()
+                self.perform_capture_move(move, move_number, captures, enemy_position)
+                if self.player_turn == turn:
+                    more_moves, more_captures = self.get_moves(captures + [enemy_position], move_number)
+                    for semi_move, semi_capture in zip(more_moves, more_captures):
+                        moves.append([move] + semi_move)
+                        captured_pieces.append([enemy_position] + semi_capture)
+                else:
+                    moves.append([move])
+                    captured_pieces.append([enemy_position])
+                self.restore_state(state)
+        if not moves:
+            positional_moves = self.get_possible_positional_moves()
+            return [[move] for move in positional_moves], [[None] for _ in positional_moves]
+        return moves, captured_pieces
+
+    def position_is_open(self, position: int) -> bool:
+        """Get if the position is open (a piece is not in the given square)."""
+        return bool(self.empty >> position & 1)
+
+    def is_king(self, position: int) -> bool:
+        """Get if the piece in the given position is a king."""
+        return bool(self.kings >> position & 1)
+
+    def became_king_at(self, position: int) -> int:
+        """Get the move number the piece in the given position became a king."""
+        return self.became_king.get(position, -100)
+
+    def count_pieces(self, player_number: int, kings_only: bool = False) -> int:
+        """Count the pieces (or only the kings) of one player."""
+        mask = self._player_mask(player_number)
+        return _count(mask & self.kings if kings_only else mask)
+
+    def get_pieces(self) -> List[Tuple[int, int, bool]]:
+        """Get the position, the player and if it is a king of every piece, sorted by their position."""
+        white = self.white
+        kings = self.kings
+        return [(square, WHITE if white >> square & 1 else BLACK, bool(kings >> square & 1))
+                for square in _squares(white | self.black)]
+
+    def create_new_board_from_move(self, move: List[int], move_number: int, captures: List[int]
+                                   ) -> Tuple[BitBoard, Optional[int]]:
+        """Create a new board and play the move given."""
+        new_board: BitBoard = pickle.loads(pickle.dumps(self, -1))
+        return new_board.push_move(move, move_number, captures)
+
+    def push_move(self, move: List[int], move_number: int, captures: List[int]) -> Tuple[BitBoard, Optional[int]]:
+        """Play the move given without creating a new board."""
+        enemy_position = None
+        if move[0] in self._squares_in_play():
+            king = bool(self.kings >> move[0] & 1)
+            for landing, jumped in self._capture_moves_for_square(move[0], self.player_turn, king, captures):
+                if landing == move[1]:
+                    enemy_position = jumped
+                    break
+
+        if enemy_position is not None:
+            self.perform_capture_move(move, move_number, captures, enemy_position)
+        else:
+            self.perform_positional_move(move, move_number)
+
+        return self, enemy_position
+
+    def perform_capture_move(self, move: List[int], move_number: int, captures: List[int], enemy_position: int) -> None:
+        """Make a capture move."""
+        self.previous_move_was_capture = True
+        player = self.player_turn
+        originally_was_king = bool(self.kings >> move[0] & 1)
+        self.pieces_hash ^= self._piece_key(enemy_position)
+        enemy_bit = ~(1 << enemy_position)
+        self.white &= enemy_bit
+        self.black &= enemy_bit
+        self.kings &= enemy_bit
+        self.became_king.pop(enemy_position, None)
+        self.move_piece(move[0], move[1], move_number)
+        is_king = bool(self.kings >> move[1] & 1)
+        further_captures = captures + [enemy_position]
+        if not originally_was_king and is_king and self.pieces_promote_and_stop_capturing:
+            further_capture_moves_for_piece = False
+        elif not originally_was_king and not self.pieces_promote_and_continue_capturing:
+            # A man that reaches the last row in the middle of a capture continues capturing as a man.
+            self.set_king(move[1], False)
+            further_capture_moves_for_piece = bool(self._capture_moves_for_square(move[1], player, False,
+                                                                                  further_captures))
+            if not further_capture_moves_for_piece and is_king:
+                self.set_king(move[1], True)
+        else:
+            further_capture_moves_for_piece = bool(self._capture_moves_for_square(move[1], player, is_king,
+                                                                                  further_captures))
+
+        if further_capture_moves_for_piece:
+            self.square_requiring_further_capture_moves = move[1]
+        else:
+            self.square_requiring_further_capture_moves = None
+            self.switch_turn()
+
+    def perform_positional_move(self, move: List[int], move_number: int) -> None:
+        """Make a positional move."""
+        self.previous_move_was_capture = False
+        self.move_piece(move[0], move[1], move_number)
+        self.switch_turn()
+
+    def switch_turn(self) -> None:
+        """Switch the turn."""
+        self.player_turn = BLACK if self.player_turn == WHITE else WHITE
+
+    def move_piece(self, start: int, to: int, move_number: int) -> None:
+        """Move a piece and crown it if it reached the enemy's home row."""
+        start_bit = 1 << start
+        to_bit = 1 << to
+        player = WHITE if self.white & start_bit else BLACK
+        self.pieces_hash ^= self._piece_key(start)
+        if player == WHITE:
+            self.white ^= start_bit | to_bit
+        else:
+            self.black ^= start_bit | to_bit
+        if self.kings & start_bit:
+            self.kings ^= start_bit | to_bit
+        if start in self.became_king:
+            self.became_king[to] = self.became_king.pop(start)
+        if not self.kings & to_bit and self.geometry.promotion_mask[player] & to_bit:
+            self.kings |= to_bit
+            self.became_king[to] = move_number
+        self.pieces_hash ^= self._piece_key(to)
+
+    def set_king(self, square: int, king: bool) -> None:
+        """Crown a piece or turn it back into a man."""
+        if bool(self.kings >> square & 1) != king:
+            self.pieces_hash ^= self._piece_key(square)
+            self.kings ^= 1 << square
+            self.pieces_hash ^= self._piece_key(square)
+
+    def _piece_key(self, square: int) -> int:
+        """Get the Zobrist key of the piece in the given square."""
+        player = WHITE if self.white >> square & 1 else BLACK
+        return self.geometry.piece_keys[(player, bool(self.kings >> square & 1))][square]
+
+    def hash(self) -> int:
+        """Get the Zobrist hash of the position."""
+        return self.pieces_hash ^ (self.geometry.black_to_move_key if self.player_turn == BLACK else 0)
+
+    def compute_pieces_hash(self) -> int:
+        """Compute the hash of the pieces from scratch."""
+        pieces_hash = 0
+        for square in _squares(self.white | self.black):
+            pieces_hash ^= self._piece_key(square)
+        return pieces_hash
+
+    def save_state(self) -> Tuple[Any, ...]:
+        """Save the position, so that it can be restored with restore_state."""
+        return (self.white, self.black, self.kings, self.became_king.copy(), self.player_turn,
+                self.square_requiring_further_capture_moves, self.previous_move_was_capture, self.pieces_hash)
+
+    def restore_state(self, state: Tuple[Any, ...]) -> None:
+        """Restore the position saved by save_state."""
+        (self.white, self.black, self.kings, became_king, self.player_turn, self.square_requiring_further_capture_moves,
+         self.previous_move_was_capture, self.pieces_hash) = state
+        self.became_king = became_king.copy()
+        # The kings' move numbers aren't part of the searcher's key.
+        self._searcher._key = None
+
+    def forget_changes_before(self, state: Tuple[Any, ...]) -> None:
+        """The states of a BitBoard are complete positions, so there are no older changes to drop."""
+
+    def is_valid_row_and_column(self, row: int, column: int) -> bool:
+        """Get if the given row and column is inside the board."""
+        return 0 <= row < self.height and 0 <= column < self.width
@@ -2,6 +2,7 @@ from __future__ import annotations
 from draughts.core.board_searcher import BoardSearcher
 from draughts.core.board_initializer import BoardInitializer
 from draughts.core.piece import Piece
+from draughts.core.geometry import get_geometry
 from functools import reduce
 import pickle
 from typing import Optional, List, Tuple, Any, Dict
@@ -38,12 +39,17 @@ class Board:
             self.rows_per_user_with_pieces = 4
 
         self.position_count = self.width * self.height
+        self.geometry = get_geometry(variant)
         self.position_layout: Dict[int, Dict[int, int]] = {}
         self.piece_requiring_further_capture_moves: Optional[Piece] = None
         self.previous_move_was_capture = False
         self.variant = variant
         self.fen = fen
         self.searcher = BoardSearcher()
+        # The changes made to the pieces since the first call to save_state. undo_log_start is the number of older
+        # changes that were dropped by forget_changes_before.
+        self.undo_log: Optional[List[Tuple[Any, ...]]] = None
+        self.undo_log_start = 0
         BoardInitializer(self, self.fen).initialize()
 
         self.pieces_promote_and_stop_capturing = self.variant in ['english', 'italian']
@@ -64,17 +70,67 @@ class Board:
 
     def get_possible_capture_moves(self, captures: List[int]) -> List[List[int]]:
         """Get all possible capture moves (not positional moves)."""
-        return reduce((lambda moves, piece: moves + piece.get_possible_capture_moves(captures)),
-                      self.searcher.get_pieces_in_play(), [])
+        moves = []
+        for piece in self.searcher.get_pieces_in_play():
+            moves.extend(piece.get_possible_capture_moves(captures))
+        return moves
 
     def get_possible_positional_moves(self) -> List[List[int]]:
         """Get all possible positional moves (not capture moves)."""
-        return reduce((lambda moves, piece: moves + piece.get_possible_positional_moves()),
-                      self.searcher.get_pieces_in_play(), [])
+        moves = []
+        for piece in self.searcher.get_pieces_in_play():
+            moves.extend(piece.get_possible_positional_moves())
+        return moves
+
+    def get_moves(self, captures: List[int], move_number: int
+                  ) -> Tuple[List[List[List[int]]], List[List[Optional[int]]]]:
+        """
+        Get the whole move sequences for the player in play and the pieces each sequence captures.
+        The multi-captures are played and undone on this board, so no copies are made.
+        """
+        turn = self.player_turn
+        moves = []
+        captured_pieces: List[List[Optional[int]]] = []
+        capture_moves = self.get_possible_capture_moves(captures)
+        if not capture_moves:
+            positional_moves = self.get_possible_positional_moves()
+            return [[move] for move in positional_moves], [[None] for _ in positional_moves]
+        for move in capture_moves:
+            # Undoing the previous capture resets the piece, so its capture moves are found again.
+            self.searcher.get_piece_by_position(move[0]).get_possible_capture_moves(captures)
+            state = self.save_state()
+            enemy_position = self.perform_capture_move(move, move_number, captures)
+            if self.player_turn == turn and enemy_position is not None:
+                more_moves, more_captures = self.get_moves(captures + [enemy_position], move_number)
+                for semi_move, semi_capture in zip(more_moves, more_captures):
+                    moves.append([move] + semi_move)
+                    captured_pieces.append([enemy_position] + semi_capture)
+            else:
+                moves.append([move])
+                captured_pieces.append([enemy_position])
+            self.restore_state(state)
+        return moves, captured_pieces
 
     def position_is_open(self, position: int) -> bool:
         """Get if the position is open (a piece is not in the given square)."""
-        return position in self.searcher.open_positions
+        return position not in self.searcher.position_pieces
+
+    def is_king(self, position: int) -> bool:
+        """Get if the piece in the given position is a king."""
+        return self.searcher.position_pieces[position].king
+
+    def became_king_at(self, position: int) -> int:
+        """Get the move number the piece in the given position became a king."""
+        return self.searcher.position_pieces[position].became_king
+
+    def count_pieces(self, player_number: int, kings_only: bool = False) -> int:
+        """Count the pieces (or only the kings) of one player."""
+        pieces = self.searcher.get_pieces_by_player(player_number)
+        return sum(1 for piece in pieces if piece.king) if kings_only else len(pieces)
+
+    def get_pieces(self) -> List[Tuple[int, int, bool]]:
+        """Get the position, the player and if it is a king of every piece, sorted by their position."""
+        return [(piece.position, piece.player, piece.king) for piece in self.searcher.uncaptured_pieces]
 
     def create_new_board_from_move(self, move: List[int], move_number: int, captures: List[int]
                                    ) -> Tuple[Board, Optional[int]]:
@@ -108,17 +164,24 @@ class Board:
         originally_was_king = piece.king
         enemy_piece = piece.capture_move_enemies[move[1]]
         enemy_position = enemy_piece.position
+        if self.undo_log is not None:
+            self.undo_log.append(('capture', enemy_piece, enemy_position))
+        self.pieces_hash ^= self.geometry.piece_keys[(enemy_piece.player, enemy_piece.king)][enemy_position]
         enemy_piece.capture()
+        self.searcher.remove_piece(enemy_piece, enemy_position)
+        self.reset_pieces_around([enemy_position])
         self.move_piece(piece, move[1], move_number)
         if not originally_was_king and piece.king and self.pieces_promote_and_stop_capturing:
             further_capture_moves_for_piece = []
         elif not originally_was_king and not self.pieces_promote_and_continue_capturing:
             was_king = piece.king
-            piece.king = False
+            self.set_king(piece, False)
             further_capture_moves_for_piece = [capture_move for capture_move in self.get_possible_capture_moves(
                 captures + [enemy_position]) if move[1] == capture_move[0]]
             if not further_capture_moves_for_piece and was_king:
-                piece.king = True
+                self.set_king(piece, True)
+                # The moves were found while the piece was still a man.
+                piece.reset_for_new_board()
         else:
             further_capture_moves_for_piece = [capture_move for capture_move in self.get_possible_capture_moves(
                 captures + [enemy_position]) if move[1] == capture_move[0]]
@@ -143,8 +206,87 @@ class Board:
 
     def move_piece(self, piece: Piece, to: int, move_number: int) -> None:
         """Move a piece."""
+        start = piece.position
+        if self.undo_log is not None:
+            self.undo_log.append(('move', piece, start, piece.king, piece.became_king))
+        self.pieces_hash ^= self.geometry.piece_keys[(piece.player, piece.king)][start]
         piece.move(to, move_number)
-        self.pieces = sorted(self.pieces, key=lambda piece: piece.position if not piece.captured else 0)
+        self.pieces_hash ^= self.geometry.piece_keys[(piece.player, piece.king)][to]
+        self.searcher.move_piece(piece, start)
+        self.reset_pieces_around([start, to])
+
+    def set_king(self, piece: Piece, king: bool) -> None:
+        """Crown a piece or turn it back into a man."""
+        if piece.king != king:
+            self.pieces_hash ^= (self.geometry.piece_keys[(piece.player, piece.king)][piece.position] ^
+                                 self.geometry.piece_keys[(piece.player, king)][piece.position])
+            piece.king = king
+
+    def hash(self) -> int:
+        """Get the Zobrist hash of the position."""
+        return self.pieces_hash ^ (self.geometry.black_to_move_key if self.player_turn == BLACK else 0)
+
+    def compute_pieces_hash(self) -> int:
+        """Compute the hash of the pieces from scratch."""
+        pieces_hash = 0
+        for piece in self.searcher.uncaptured_pieces:
+            pieces_hash ^= self.geometry.piece_keys[(piece.player, piece.king)][piece.position]
+        return pieces_hash
+
+    def save_state(self) -> Tuple[Any, ...]:
+        """
+        Start recording the changes to the board, so that they can be undone with restore_state.
+        The states can be nested, e.g. a search can save and restore the board in the middle of a game.
+        """
+        if self.undo_log is None:
+            self.undo_log = []
+        return (self.player_turn, self.piece_requiring_further_capture_moves, self.previous_move_was_capture,
+                self.pieces_hash, self.undo_log_start + len(self.undo_log))
+
+    def restore_state(self, state: Tuple[Any, ...]) -> None:
+        """Undo all the changes made to the board since save_state returned the given state."""
+        player_turn, piece_requiring_further_capture_moves, previous_move_was_capture, pieces_hash, log_length = state
+        undo_log = self.undo_log
+        assert undo_log is not None and log_length >= self.undo_log_start
+        while self.undo_log_start + len(undo_log) > log_length:
+            change = undo_log.pop()
+            if change[0] == 'move':
+                _, piece, start, was_king, became_king = change
+                to = piece.position
+                piece.position = start
+                piece.king = was_king
+                piece.became_king = became_king
+                self.searcher.move_piece(piece, to)
+                self.reset_pieces_around([start, to])
+            else:
+                _, piece, position = change
+                piece.captured = False
+                piece.position = position
+                self.searcher.add_piece(piece)
+                self.reset_pieces_around([position])
+        self.player_turn = player_turn
+        self.piece_requiring_further_capture_moves = piece_requiring_further_capture_moves
+        self.previous_move_was_capture = previous_move_was_capture
+        self.pieces_hash = pieces_hash
+
+    def forget_changes_before(self, state: Tuple[Any, ...]) -> None:
+        """Drop the changes recorded before save_state returned the given state. Older states can't be restored."""
+        log_length = state[-1]
+        if self.undo_log is not None and log_length > self.undo_log_start:
+            del self.undo_log[:log_length - self.undo_log_start]
+            self.undo_log_start = log_length
+
+    def reset_pieces_around(self, positions: List[int]) -> None:
+        """Reset the possible moves of the pieces whose moves may have changed because the given squares changed."""
+        for position in positions:
+            for player in (WHITE, BLACK):
+                for dependent_position in self.geometry.dependent_squares[player][position]:
+                    piece = self.searcher.position_pieces.get(dependent_position)
+                    if piece is not None and piece.player == player:
+                        piece.reset_for_new_board()
+            piece = self.searcher.position_pieces.get(position)
+            if piece is not None:
+                piece.reset_for_new_board()
 
     def is_valid_row_and_column(self, row: int, column: int) -> bool:
         """Get if the given row and column is inside the board."""
@@ -156,6 +298,16 @@ class Board:
 
         return True
 
+    def __getstate__(self) -> Dict[str, Any]:
+        # The geometry is shared by all the boards of a variant, so it isn't copied.
+        state = self.__dict__.copy()
+        del state['geometry']
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.geometry = get_geometry(self.variant)
+
     def __setattr__(self, name: str, value: Any) -> None:
         super(Board, self).__setattr__(name, value)
 
@@ -163,3 +315,4 @@ class Board:
             [piece.reset_for_new_board() for piece in self.pieces]
 
             self.searcher.build(self)
+            self.pieces_hash = self.compute_pieces_hash()
@@ -1,6 +1,6 @@
 from __future__ import annotations
-from functools import reduce
-from typing import List, Dict, Any
+from bisect import insort
+from typing import List, Dict, Any, Optional
 from draughts.core.piece import Piece
 
 WHITE = 2
@@ -12,49 +12,84 @@ class BoardSearcher:
     def build(self, board: Any) -> None:
         """Build the searcher."""
         self.board = board
-        self.uncaptured_pieces = list(filter(lambda piece: not piece.captured, board.pieces))
-        self.open_positions: List[int] = []
+        self.position_pieces: Dict[int, Piece] = {}
+        # The lists of positions are kept sorted. Use position_pieces to check if a square has a piece.
         self.filled_positions: List[int] = []
+        self.open_positions: List[int] = []
         self.player_positions: Dict[int, List[int]] = {}
-        self.player_pieces: Dict[int, List[Piece]] = {}
-        self.position_pieces: Dict[int, Piece] = {}
+        # The sorted lists of pieces are only built when they are needed, and they are rebuilt after a change.
+        self._uncaptured_pieces: Optional[List[Piece]] = None
+        self._player_pieces: Optional[Dict[int, List[Piece]]] = None
 
+        self.build_position_pieces()
         self.build_filled_positions()
         self.build_open_positions()
         self.build_player_positions()
-        self.build_player_pieces()
-        self.build_position_pieces()
+
+    def build_position_pieces(self) -> None:
+        """Make a dict where the key is the square and the value is the piece in this square."""
+        self.position_pieces = {piece.position: piece for piece in self.board.pieces if not piece.captured}
 
     def build_filled_positions(self) -> None:
         """Find the filled positions (squares which have a piece)."""
-        self.filled_positions = reduce((lambda open_positions, piece: open_positions + [piece.position]),
-                                       self.uncaptured_pieces, [])
+        self.filled_positions = sorted(self.position_pieces)
 
     def build_open_positions(self) -> None:
         """Find the open positions (empty squares)."""
-        self.open_positions = list(set(range(1, self.board.position_count + 1)).difference(self.filled_positions))
+        self.open_positions = [position for position in range(1, self.board.position_count + 1)
+                               if position not in self.position_pieces]
 
     def build_player_positions(self) -> None:
         """Find the positions where each player has a piece."""
-        self.player_positions = {
-            1: reduce((lambda positions, piece: positions + ([piece.position] if piece.player == BLACK else [])),
-                      self.uncaptured_pieces, []),
-            2: reduce((lambda positions, piece: positions + ([piece.position] if piece.player == WHITE else [])),
-                      self.uncaptured_pieces, [])
-        }
-
-    def build_player_pieces(self) -> None:
-        """Find all the pieces of both players."""
-        self.player_pieces = {
-            BLACK: reduce((lambda pieces, piece: pieces + ([piece] if piece.player == BLACK else [])),
-                          self.uncaptured_pieces, []),
-            WHITE: reduce((lambda pieces, piece: pieces + ([piece] if piece.player == WHITE else [])),
-                          self.uncaptured_pieces, [])
-        }
+        self.player_positions = {BLACK: [], WHITE: []}
+        for position in self.filled_positions:
+            self.player_positions[self.position_pieces[position].player].append(position)
 
-    def build_position_pieces(self) -> None:
-        """Make a dict where the key is the square and the value is the piece in this square."""
-        self.position_pieces = {piece.position: piece for piece in self.uncaptured_pieces}
+    @property
+    def uncaptured_pieces(self) -> List[Piece]:
+        """Get the pieces that haven't been captured, sorted by their position."""
+        if self._uncaptured_pieces is None:
+            self._uncaptured_pieces = [self.position_pieces[position] for position in self.filled_positions]
+        return self._uncaptured_pieces
+
+    @property
+    def player_pieces(self) -> Dict[int, List[Piece]]:
+        """Get all the pieces of both players, sorted by their position."""
+        if self._player_pieces is None:
+            self._player_pieces = {player: [self.position_pieces[position] for position in positions]
+                                   for player, positions in self.player_positions.items()}
+        return self._player_pieces
+
+    def move_piece(self, piece: Piece, start: int) -> None:
+        """Update the searcher after a piece moved from start to its new position."""
+        del self.position_pieces[start]
+        self.position_pieces[piece.position] = piece
+        self.filled_positions.remove(start)
+        insort(self.filled_positions, piece.position)
+        insort(self.open_positions, start)
+        self.open_positions.remove(piece.position)
+        self.player_positions[piece.player].remove(start)
+        insort(self.player_positions[piece.player], piece.position)
+        self._uncaptured_pieces = None
+        self._player_pieces = None
+
+    def add_piece(self, piece: Piece) -> None:
+        """Update the searcher after a piece was put back on the board."""
+        self.position_pieces[piece.position] = piece
+        insort(self.filled_positions, piece.position)
+        self.open_positions.remove(piece.position)
+        insort(self.player_positions[piece.player], piece.position)
+        self._uncaptured_pieces = None
+        self._player_pieces = None
+
+    def remove_piece(self, piece: Piece, position: int) -> None:
+        """Update the searcher after the piece in the given position was captured."""
+        del self.position_pieces[position]
+        self.filled_positions.remove(position)
+        insort(self.open_positions, position)
+        self.player_positions[piece.player].remove(position)
+        self._uncaptured_pieces = None
+        self._player_pieces = None
 
     def get_pieces_by_player(self, player_number: int) -> List[Piece]:
         """Get all the pieces of one player."""
@@ -1,5 +1,6 @@
 from __future__ import annotations
 from draughts.core.board import Board
+from draughts.core.bitboard import BitBoard
 from draughts.core.move import StandardMove
 import pickle
 from math import ceil
@@ -20,17 +21,51 @@ def _convert_variant_names(variant: str) -> str:
     return variant
 
 
+# The number of moves that can be undone with the undo data kept by Game. Older moves are undone by replaying the
+# game, so a long game doesn't keep the undo data of every move.
+UNDO_HISTORY_LENGTH = 1000
+
+# The classes that can store the position. 'pieces' keeps a Piece object for every piece and 'bitboard' keeps
+# one integer mask per player (it is faster, but the pieces can't be accessed through board.pieces).
+BACKENDS = {'pieces': Board, 'bitboard': BitBoard}
+
+
+class MoveUndo:
+    """The data needed to undo a move with Game.unmake."""
+
+    def __init__(self, game: Game) -> None:
+        self.board = game.board
+        self.board_state = game.board.save_state()
+        self.moves_length = len(game.moves)
+        self.move_stack_length = len(game.move_stack)
+        self.hashes_length = len(game.hashes)
+        # _repetitions is replaced by a new dict when a move that can't be reversed is played, so we keep the old dict.
+        self.repetitions = game._repetitions
+        self.history_length = len(game.last_non_reversible_fen_history)
+        self.not_added_move = game._not_added_move.copy()
+        self.not_added_capture = game._not_added_capture.copy()
+        # reversible_moves is replaced by a new list when a non-reversible move is played, so we keep the old list.
+        self.reversible_moves = game.reversible_moves
+        self.reversible_moves_length = len(game.reversible_moves)
+        self.last_non_reversible_fen = game.last_non_reversible_fen
+        self.moves_since_last_capture = game.moves_since_last_capture
+        self.consecutive_noncapture_king_moves = game.consecutive_noncapture_king_moves
+
+
 class Game:
 
-    def __init__(self, variant: str = 'standard', fen: str = 'startpos') -> None:
+    def __init__(self, variant: str = 'standard', fen: str = 'startpos', backend: str = 'pieces') -> None:
         self.variant = _convert_variant_names(variant)
+        if backend not in BACKENDS:
+            raise ValueError(f'Unknown backend {backend}. The available backends are: {", ".join(BACKENDS)}.')
+        self.backend = backend
         if fen == 'startpos' or ':' in fen:  # Li fen
             self.initial_fen = self.startpos_to_fen(fen)
             self.initial_hub_fen = self.li_fen_to_hub_fen(self.initial_fen)
-            self.board = Board(self.variant, self.initial_hub_fen)
+            self.board = self.new_board(self.initial_hub_fen)
         else:  # Hub fen
             self.initial_hub_fen = fen
-            self.board = Board(self.variant, self.initial_hub_fen)
+            self.board = self.new_board(self.initial_hub_fen)
             self.initial_fen = self.get_li_fen()
         self.initial_dxp_fen = self.get_dxp_fen()
         self.last_non_reversible_fen = fen_to_variant(self.initial_fen, self.variant)
@@ -52,8 +87,13 @@ class Game:
         # (so it only contains non-capture king moves).
         self.reversible_moves: List[StandardMove] = []
 
-        # fens stores the Hub fen of each position to detect threefold repetition.
-        self.fens = [self.initial_hub_fen]
+        # hashes stores the Zobrist hash of each position to detect threefold repetition.
+        self.hashes = [self.board.hash()]
+        # The index in hashes of the first position after the last move that can't be reversed (e.g. a capture),
+        # for each position. Positions before it can't occur again.
+        self._window_starts = [0]
+        # How many times each position after the last move that can't be reversed has occurred.
+        self._repetitions = {self.hashes[0]: 1}
         self.moves_since_last_capture = 0
         self.consecutive_noncapture_king_moves = 0
 
@@ -62,6 +102,17 @@ class Game:
         self.moves_since_last_capture_history = [self.moves_since_last_capture]
         self.consecutive_noncapture_king_moves_history = [self.consecutive_noncapture_king_moves]
 
+        # The undo data of the last moves in move_stack and of the move that is being played (in case of a
+        # multi-capture).
+        self._undo_stack: List[MoveUndo] = []
+        # The Hub fen of each position. It is only built when fens is used, and then it is kept up to date.
+        self._fens: Optional[List[str]] = None
+        self._move_undo: Optional[MoveUndo] = None
+
+    def new_board(self, fen: str) -> Union[Board, BitBoard]:
+        """Create a board of the game's backend from a Hub fen."""
+        return BACKENDS[self.backend](self.variant, fen)
+
     def copy(self) -> Game:
         """Copy the board (transfers all data)."""
         # At least 6 times faster than deepcopy.
@@ -71,21 +122,72 @@ class Game:
     def copy_fast(self) -> Game:
         """Copy the board (doesn't transfer all the data but is faster)."""
         # More than 10x faster than .copy() but it doesn't transfer all the data.
-        game = Game(self.variant, self.get_fen())
+        game = Game(self.variant, self.get_fen(), self.backend)
         game._not_added_move = self._not_added_move.copy()
         game._not_added_capture = self._not_added_capture.copy()
         return game
 
+    def make(self, move: List[List[int]]) -> MoveUndo:
+        """
+        Make a move and return the data needed to undo it with unmake. Plays the whole move sequence in case of a capture.
+        If a multi-capture was started with move(), unmake will also undo the captures played before.
+        """
+        self.push(move)
+        assert self._move_undo is not None
+        return self._move_undo
+
+    def unmake(self, undo: MoveUndo) -> None:
+        """Undo a move played with make without recreating the board."""
+        self.board = undo.board
+        self.board.restore_state(undo.board_state)
+        del self.moves[undo.moves_length:]
+        del self.move_stack[undo.move_stack_length:]
+        del self.capture_stack[undo.move_stack_length:]
+        for index in range(undo.hashes_length, len(self.hashes)):
+            if self._window_starts[index] == index:
+                # The positions after this one weren't counted in undo.repetitions.
+                break
+            position_hash = self.hashes[index]
+            undo.repetitions[position_hash] -= 1
+            if not undo.repetitions[position_hash]:
+                del undo.repetitions[position_hash]
+        self._repetitions = undo.repetitions
+        del self.hashes[undo.hashes_length:]
+        del self._window_starts[undo.hashes_length:]
+        del self.last_non_reversible_fen_history[undo.history_length:]
+        del self.moves_since_last_capture_history[undo.history_length:]
+        del self.consecutive_noncapture_king_moves_history[undo.history_length:]
+        while self._undo_stack and self._undo_stack[-1].move_stack_length >= undo.move_stack_length:
+            self._undo_stack.pop()
+        self._not_added_move = undo.not_added_move.copy()
+        self._not_added_capture = undo.not_added_capture.copy()
+        self.reversible_moves = undo.reversible_moves
+        del self.reversible_moves[undo.reversible_moves_length:]
+        self.last_non_reversible_fen = undo.last_non_reversible_fen
+        self.moves_since_last_capture = undo.moves_since_last_capture
+        self.consecutive_noncapture_king_moves = undo.consecutive_noncapture_king_moves
+        self._move_undo = None
+        if self._fens is not None:
+            del self._fens[len(self.move_stack) + 1:]
+
     def pop(self) -> None:
         """Undo the last move."""
         # Removes the whole capture sequence in case of a multi-capture.
-        if self.moves:
+        if self.moves and self._not_added_move and self._move_undo and self._move_undo.board is self.board:
+            self.unmake(self._move_undo)
+        elif (self.moves and self.move_stack and self._undo_stack and
+              self._undo_stack[-1].move_stack_length == len(self.move_stack) - 1 and
+              self._undo_stack[-1].board is self.board):
+            self.unmake(self._undo_stack[-1])
+        elif self.moves:
+            # There is no undo data (e.g. the board was changed directly), so we replay the game without the last move.
+            self._undo_stack = []
             if self._not_added_move:
+                del self.moves[-len(self._not_added_move):]
                 self._not_added_move = []
                 self._not_added_capture = []
             else:
-                # The fen and other data is only added after the whole capture sequence is complete.
-                self.fens.pop()
+                # The data is only added after the whole capture sequence is complete.
                 self.move_stack.pop()
                 last_captures = self.capture_stack.pop()
                 if self.reversible_moves:
@@ -97,7 +199,44 @@ class Game:
                 self.moves_since_last_capture_history.pop()
                 self.consecutive_noncapture_king_moves_history.pop()
 
-            self.board = Board(self.variant, self.fens[-1])
+            game = self.replay(self.moves)
+            self.board = game.board
+            self.hashes = game.hashes
+            self._window_starts = game._window_starts
+            self._repetitions = game._repetitions
+            if self._fens is not None:
+                del self._fens[len(self.move_stack) + 1:]
+
+    def replay(self, moves: List[List[int]]) -> Game:
+        """Create a new game from the starting position and play the given moves (each move is one jump)."""
+        game = Game(self.variant, self.initial_hub_fen, self.backend)
+        for move in moves:
+            game.move(move)
+        return game
+
+    @property
+    def fens(self) -> List[str]:
+        """
+        Get the Hub fen of each position in the game. The game is replayed to find them the first time, and then they
+        are added as the moves are played.
+        """
+        if self._fens is None:
+            game = Game(self.variant, self.initial_hub_fen, self.backend)
+            fens = [game.get_fen()]
+            for move in self.moves[:len(self.moves) - len(self._not_added_move)]:
+                game.move(move)
+                if not game._not_added_move:
+                    fens.append(game.get_fen())
+            self._fens = fens
+        return self._fens
+
+    @fens.setter
+    def fens(self, fens: List[str]) -> None:
+        self._fens = fens
+
+    def hash(self) -> int:
+        """Get the Zobrist hash of the position."""
+        return self.board.hash()
 
     def move(self, move: List[int], include_pdn: bool = False) -> Tuple[Game, Optional[int]]:
         """Make a move. Plays only one jump in case of a multi-capture and not the whole sequence."""
@@ -108,12 +247,14 @@ class Game:
         turn = self.whose_turn()
         was_king = False
         old_board = self.copy_fast() if include_pdn else None
+        if not self._not_added_move:
+            self._move_undo = MoveUndo(self)
 
         if is_null_move:
             self.board.switch_turn()
             enemy_position = None
         else:
-            was_king = self.board.searcher.get_piece_by_position(move[0]).king
+            was_king = self.board.is_king(move[0])
             self.board, enemy_position = self.board.push_move(move, len(self.move_stack) + 1, self._not_added_capture)
         self.moves.append(move)
 
@@ -148,7 +289,26 @@ class Game:
             self.last_non_reversible_fen_history.append(self.last_non_reversible_fen)
             self.moves_since_last_capture_history.append(self.moves_since_last_capture)
             self.consecutive_noncapture_king_moves_history.append(self.consecutive_noncapture_king_moves)
-            self.fens.append(self.get_fen())
+            position_hash = self.hash()
+            start, end = move_to_add_board[0][0], move_to_add_board[-1][1]
+            man_moved_forward = not was_king and not is_null_move and (
+                (start - 1) // self.board.width != (end - 1) // self.board.width)
+            if captures or man_moved_forward:
+                # The position before the move can't occur again.
+                self._window_starts.append(len(self.hashes))
+                self._repetitions = {position_hash: 1}
+            else:
+                self._window_starts.append(self._window_starts[-1])
+                self._repetitions[position_hash] = self._repetitions.get(position_hash, 0) + 1
+            self.hashes.append(position_hash)
+            if self._fens is not None:
+                self._fens.append(self.get_fen())
+            if self._move_undo is not None:
+                self._undo_stack.append(self._move_undo)
+                if len(self._undo_stack) > UNDO_HISTORY_LENGTH:
+                    del self._undo_stack[0]
+                    if self._undo_stack[0].board is self.board:
+                        self.board.forget_changes_before(self._undo_stack[0].board_state)
 
         return self, enemy_position
 
@@ -169,10 +329,9 @@ class Game:
         turn = self.whose_turn()
         opponent_color = WHITE if player == BLACK else BLACK
         if self.variant == 'breakthrough':
-            for piece in self.board.searcher.player_pieces[player]:
-                if piece.king:
-                    # Player wins if they have a king.
-                    return True
+            if self.board.count_pieces(player, kings_only=True):
+                # Player wins if they have a king.
+                return True
         elif self.variant == 'antidraughts':
             # Player wins if they have no available move.
             # Can only check if it is the player's turn.
@@ -187,33 +346,25 @@ class Game:
 
     def is_threefold(self) -> bool:
         """Get if the current position has occurred at least three times."""
-        return bool(self.fens and self.fens.count(self.fens[-1]) >= 3)
+        return self._repetitions.get(self.hashes[-1], 0) >= 3
 
     def is_draw(self) -> bool:
         """Get if the game is a draw."""
         # long_diagonal contains all the squares in the long diagonal of an 8x8 board.
         long_diagonal = [4, 8, 11, 15, 18, 22, 25, 29]
-        white_pieces = 0
-        black_pieces = 0
-        white_kings = 0
-        black_kings = 0
+        white_pieces = self.board.count_pieces(WHITE)
+        black_pieces = self.board.count_pieces(BLACK)
+        white_kings = self.board.count_pieces(WHITE, kings_only=True)
+        black_kings = self.board.count_pieces(BLACK, kings_only=True)
         white_piece_in_long_diagonal = False
         black_piece_in_long_diagonal = False
-        for piece in self.board.searcher.uncaptured_pieces:
-            loc = piece.position
-            if piece is not None:
-                if piece.player == WHITE:
-                    if loc in long_diagonal:
+        if self.variant in ['russian', 'brazilian']:
+            for loc, player, _ in self.board.get_pieces():
+                if loc in long_diagonal:
+                    if player == WHITE:
                         white_piece_in_long_diagonal = True
-                    white_pieces += 1
-                    if piece.king:
-                        white_kings += 1
-                else:
-                    if loc in long_diagonal:
+                    else:
                         black_piece_in_long_diagonal = True
-                    black_pieces += 1
-                    if piece.king:
-                        black_kings += 1
         if self.variant == 'standard':
             # 25 consecutive non-capture king moves.
             if self.consecutive_noncapture_king_moves >= 50:
@@ -329,21 +480,18 @@ class Game:
     def get_fen(self) -> str:
         """Get the Hub fen of the position."""
         playing = 'W' if self.board.player_turn == WHITE else 'B'
-        fen = ''
+        letters = ['e'] * (self.board.position_count + 1)
 
-        for loc in range(1, self.board.position_count + 1):
-            letter = 'e'
-            if loc in self.board.searcher.filled_positions:
-                piece = self.board.searcher.get_piece_by_position(loc)
-                if piece.player == WHITE:
-                    letter = 'w'
-                else:
-                    letter = 'b'
-                if piece.king:
-                    letter = letter.capitalize()
-            fen += letter
+        for loc, player, king in self.board.get_pieces():
+            if player == WHITE:
+                letter = 'w'
+            else:
+                letter = 'b'
+            if king:
+                letter = letter.capitalize()
+            letters[loc] = letter
 
-        final_fen = playing + fen
+        final_fen = playing + ''.join(letters[1:])
         return final_fen
 
     def get_li_fen(self) -> str:
@@ -352,11 +500,11 @@ class Game:
         white_pieces = []
         black_pieces = []
 
-        for piece in self.board.searcher.uncaptured_pieces:
-            letter = str(piece.position)
-            if piece.king:
+        for loc, player, king in self.board.get_pieces():
+            letter = str(loc)
+            if king:
                 letter = 'K' + letter
-            if piece.player == WHITE:
+            if player == WHITE:
                 white_pieces.append(letter)
             else:
                 black_pieces.append(letter)
@@ -366,21 +514,18 @@ class Game:
 
     def get_dxp_fen(self) -> str:
         """Get the DXP fen of the position."""
-        fen = ''
+        letters = ['e'] * (self.board.position_count + 1)
 
-        for loc in range(1, self.board.position_count + 1):
-            letter = 'e'
-            if loc in self.board.searcher.filled_positions:
-                piece = self.board.searcher.get_piece_by_position(loc)
-                if piece.player == WHITE:
-                    letter = 'w'
-                else:
-                    letter = 'z'
-                if piece.king:
-                    letter = letter.capitalize()
-            fen += letter
+        for loc, player, king in self.board.get_pieces():
+            if player == WHITE:
+                letter = 'w'
+            else:
+                letter = 'z'
+            if king:
+                letter = letter.capitalize()
+            letters[loc] = letter
 
-        return fen
+        return ''.join(letters[1:])
 
     def get_moves(self) -> Tuple[List[List[List[int]]], List[List[Optional[int]]]]:
         """
@@ -388,23 +533,8 @@ class Game:
         but it doesn't check the rules of each variant for which multi-capture to choose, so the moves are pseudo-legal.
         Use legal_moves for legal moves.
         """
-        turn = self.whose_turn()
-        moves = []
-        captured_pieces = []
-        # get_possible_moves returns only the first jump in a multi-capture sequence,
-        # so we use it again after the first jump to check if there are any further moves.
-        for move in self.get_possible_moves():
-            game_2 = self.copy_fast()
-            _, captures = game_2.move(move)
-            if game_2.whose_turn() == turn:
-                more_moves, more_captures = game_2.get_moves()
-                for semi_move, semi_capture in zip(more_moves, more_captures):
-                    moves.append([move] + semi_move)
-                    captured_pieces.append([captures] + semi_capture)
-            else:
-                moves.append([move])
-                captured_pieces.append([captures])
-        return moves, captured_pieces
+        # The board plays each multi-capture and undoes it in place instead of replaying it on copies of the game.
+        return self.board.get_moves(self._not_added_capture, len(self.move_stack) + 1)
 
     def legal_moves(self) -> Tuple[List[List[List[int]]], List[List[Optional[int]]]]:
         """Get the legal moves for the current position."""
@@ -427,8 +557,7 @@ class Game:
                 for position in capture:
                     if position is None:
                         continue
-                    piece = self.board.searcher.get_piece_by_position(position)
-                    value += king_value if piece.king else man_value
+                    value += king_value if self.board.is_king(position) else man_value
                 values.append(value)
             max_value = max(values)
             moves_pseudo_legal = []
@@ -440,14 +569,12 @@ class Game:
 
             # If a man and a king can play a capture sequence of equal value,
             # it is forced play the capture sequence with the king.
-            move_with_king = bool(list(filter(lambda move: self.board.searcher.get_piece_by_position(move[0][0]).king,
-                                              moves_pseudo_legal)))
+            move_with_king = bool(list(filter(lambda move: self.board.is_king(move[0][0]), moves_pseudo_legal)))
             if move_with_king:
                 moves_pseudo_legal_2 = []
                 captures_pseudo_legal_2 = []
                 for move, capture in zip(moves_pseudo_legal, captures_pseudo_legal):
-                    if (self.board.searcher.get_piece_by_position(move[0][0]).king and capture[0] is not None or
-                            capture[0] is None):
+                    if self.board.is_king(move[0][0]) and capture[0] is not None or capture[0] is None:
                         moves_pseudo_legal_2.append(move)
                         captures_pseudo_legal_2.append(capture)
             else:
@@ -455,10 +582,8 @@ class Game:
                 captures_pseudo_legal_2 = captures_pseudo_legal
 
             # The same king can't make more than 3 non-capturing moves in a row, if the player has men left.
-            has_man = False
-            for piece in self.board.searcher.uncaptured_pieces:
-                if piece and not piece.king and piece.player == self.whose_turn():
-                    has_man = True
+            has_man = (self.board.count_pieces(self.whose_turn()) >
+                       self.board.count_pieces(self.whose_turn(), kings_only=True))
 
             if has_man and len(self.move_stack) >= 6:
                 last_3_move_stack_moves = [self.move_stack[-6], self.move_stack[-4], self.move_stack[-2]]
@@ -468,13 +593,12 @@ class Game:
                 was_a_capture = bool(list(
                     filter(bool, [self.capture_stack[-6], self.capture_stack[-4], self.capture_stack[-2]])))
                 loc = int(last_3_moves[-1][-2:])
-                if loc in self.board.searcher.open_positions:
+                if self.board.position_is_open(loc):
                     is_king = False
                     is_king_for_at_least_3_moves = True
                 else:
-                    piece = self.board.searcher.get_piece_by_position(loc)
-                    is_king = piece.king
-                    is_king_for_at_least_3_moves = len(self.move_stack) - piece.became_king >= 6
+                    is_king = self.board.is_king(loc)
+                    is_king_for_at_least_3_moves = len(self.move_stack) - self.board.became_king_at(loc) >= 6
                 if is_king and last_3_moves_same_piece and not was_a_capture and is_king_for_at_least_3_moves:
                     piece_not_allowed = int(last_3_moves[2][-2:])
                     moves_legal = []
@@ -502,14 +626,12 @@ class Game:
 
             # If a man and a king can play a capture the same number of pieces,
             # it is forced play the capture sequence with the king.
-            move_with_king = bool(list(filter(lambda move: self.board.searcher.get_piece_by_position(
-                move[0][0]).king, moves_pseudo_legal)))
+            move_with_king = bool(list(filter(lambda move: self.board.is_king(move[0][0]), moves_pseudo_legal)))
             if move_with_king:
                 moves_pseudo_legal_2 = []
                 captures_pseudo_legal_2 = []
                 for move, capture in zip(moves_pseudo_legal, captures_pseudo_legal):
-                    if self.board.searcher.get_piece_by_position(
-                            move[0][0]).king and capture[0] is not None or capture[0] is None:
+                    if self.board.is_king(move[0][0]) and capture[0] is not None or capture[0] is None:
                         moves_pseudo_legal_2.append(move)
                         captures_pseudo_legal_2.append(capture)
             else:
@@ -521,7 +643,7 @@ class Game:
             for move, capture in zip(moves_pseudo_legal_2, captures_pseudo_legal_2):
                 kings = 0
                 for piece_loc in capture:
-                    if piece_loc is not None and self.board.searcher.get_piece_by_position(piece_loc).king:
+                    if piece_loc is not None and self.board.is_king(piece_loc):
                         kings += 1
                 max_kings = max(max_kings, kings)
             moves_pseudo_legal_3 = []
@@ -529,7 +651,7 @@ class Game:
             for move, capture in zip(moves_pseudo_legal_2, captures_pseudo_legal_2):
                 kings = 0
                 for piece_loc in capture:
-                    if piece_loc is not None and self.board.searcher.get_piece_by_position(piece_loc).king:
+                    if piece_loc is not None and self.board.is_king(piece_loc):
                         kings += 1
                 if kings == max_kings:
                     moves_pseudo_legal_3.append(move)
@@ -541,7 +663,7 @@ class Game:
             for move, capture in zip(moves_pseudo_legal_3, captures_pseudo_legal_3):
                 if capture[0] is not None:
                     for index, piece_loc in enumerate(capture):
-                        if self.board.searcher.get_piece_by_position(piece_loc).king:
+                        if self.board.is_king(piece_loc):
                             king_in_capture_sequence = True
                             earliest_king = min(earliest_king, index)
                             break
@@ -552,7 +674,7 @@ class Game:
                     for index, piece_loc in enumerate(capture):
                         if index > earliest_king:
                             break
-                        elif self.board.searcher.get_piece_by_position(piece_loc).king:
+                        elif self.board.is_king(piece_loc):
                             if index == earliest_king:
                                 moves_pseudo_legal_4.append(move)
                                 captures_pseudo_legal_4.append(capture)
@@ -718,6 +840,7 @@ class Game:
         rows = self.board.height
 
         board = [[" " for col in range(columns)] for _ in range(rows)]
+        pieces = {loc: (player, king) for loc, player, king in self.board.get_pieces()}
 
         for loc in range(1, self.board.position_count + 1):
             row_number = ceil(loc / squares_per_row) - 1  # From get_row_from_position
@@ -734,10 +857,10 @@ class Game:
                 column = (column + 1) * 2 - (1 if bottom_left_square_isnt_playable else 2)
 
             piece_symbol = " "
-            if loc in self.board.searcher.filled_positions:
-                piece = self.board.searcher.get_piece_by_position(loc)
-                piece_symbol = "w" if piece.player == WHITE else "b"
-                piece_symbol = piece_symbol.upper() if piece.king else piece_symbol
+            if loc in pieces:
+                player, king = pieces[loc]
+                piece_symbol = "w" if player == WHITE else "b"
+                piece_symbol = piece_symbol.upper() if king else piece_symbol
             board[row_number][column] = piece_symbol
 
         str_board = ""
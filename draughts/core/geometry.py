@@ -0,0 +1,200 @@
+from __future__ import annotations
+import random
+from typing import Optional, List, Tuple, Dict, FrozenSet
+
+WHITE = 2
+BLACK = 1
+
+
+class Geometry:
+    """
+    The squares of a variant's board and the rules that depend on the variant.
+    It contains the adjacent squares, the squares a piece jumps to when capturing, the rays of the kings and the
+    promotion squares for every square, so that they aren't calculated again during move generation.
+    """
+    def __init__(self, variant: str) -> None:
+        self.variant = variant
+        if variant in ['brazilian', 'russian', 'english', 'italian']:
+            self.width = 4
+            self.height = 8
+        elif variant == 'turkish':
+            self.width = 8
+            self.height = 8
+        else:
+            self.width = 5
+            self.height = 10
+        self.position_count = self.width * self.height
+
+        self.diagonal_moves = variant not in ['turkish']
+        self.orthogonal_moves = variant in ['turkish']
+        self.orthogonal_captures = variant in ['frisian', 'frysk!', 'turkish']
+        # In most draughts variants only the dark squares are playable.
+        self.half_of_the_squares_are_playable = variant not in ['turkish']
+        # The bottom left square isn't a playing square in italian draughts.
+        self.bottom_left_square_isnt_playable = variant in ['italian']
+        # Men can't capture kings in italian draughts.
+        self.man_can_capture_king = variant not in ['italian']
+        self.squares_per_row = self.width
+        self.kings_can_move_more_than_one_square = variant not in ['english', 'italian']
+        self.men_can_capture_backwards = variant not in ['english', 'italian', 'turkish']
+        self.kings_can_jump_over_an_already_captured_piece = variant in ['turkish']
+        self.kings_can_turn_180_degrees_in_multicapture = False  # No variant supports it for now.
+        self.pieces_promote_and_stop_capturing = variant in ['english', 'italian']
+        self.pieces_promote_and_continue_capturing = variant in ['russian']
+
+        self.position_layout: Dict[int, Dict[int, int]] = {}
+        for row in range(self.height):
+            self.position_layout[row] = {}
+            for column in range(self.width):
+                self.position_layout[row][column] = row * self.width + column + 1
+        # The row and the column of each square (index 0 isn't a square).
+        self.rows = tuple([-1] + [(square - 1) // self.width for square in range(1, self.position_count + 1)])
+        self.columns = tuple([-1] + [(square - 1) % self.width for square in range(1, self.position_count + 1)])
+
+        # The squares a player's men can move to (positional moves) and jump over and land on (capture moves).
+        self.man_steps: Dict[int, List[Tuple[int, ...]]] = {}
+        self.man_jumps: Dict[int, List[Tuple[Tuple[int, int], ...]]] = {}
+        # Kings that can only move one square.
+        self.king_steps: Dict[int, List[Tuple[int, ...]]] = {}
+        self.king_jumps: Dict[int, List[Tuple[Tuple[int, int], ...]]] = {}
+        # Kings that can move more than one square.
+        self.king_rays: Dict[int, List[Tuple[Tuple[int, ...], ...]]] = {}
+        self.king_capture_rays: Dict[int, List[Tuple[Tuple[int, ...], ...]]] = {}
+        # The squares whose pieces' moves can change when a square is filled or emptied.
+        self.dependent_squares: Dict[int, List[Tuple[int, ...]]] = {}
+        self.promotion_squares: Dict[int, FrozenSet[int]] = {}
+        self.promotion_mask: Dict[int, int] = {}
+
+        for player in [BLACK, WHITE]:
+            self._build_player_tables(player)
+        # White men promote on the row of square 1 and black men on the row of the last square.
+        self.promotion_squares[WHITE] = frozenset(self.position_layout[0].values())
+        self.promotion_squares[BLACK] = frozenset(self.position_layout[self.height - 1].values())
+        for player, squares in self.promotion_squares.items():
+            self.promotion_mask[player] = sum(1 << square for square in squares)
+
+        # The Zobrist keys used to hash the positions. The random generator is seeded with the variant name,
+        # so the keys (and the hashes) are the same every time.
+        rng = random.Random(f'zobrist-{variant}')
+        self.piece_keys: Dict[Tuple[int, bool], Tuple[int, ...]] = {}
+        for player in [BLACK, WHITE]:
+            for king in [False, True]:
+                self.piece_keys[(player, king)] = tuple(rng.getrandbits(64) for _ in range(self.position_count + 1))
+        self.black_to_move_key = rng.getrandbits(64)
+
+    def _file(self, row: int, column: int) -> int:
+        """Get the column of the square on the full (8x8 or 10x10) board."""
+        if not self.half_of_the_squares_are_playable:
+            return column
+        offset = int(row % 2 == int(self.bottom_left_square_isnt_playable))
+        return column * 2 + offset
+
+    def _square(self, row: int, file: int) -> Optional[int]:
+        """Get the square given the row and the column on the full board."""
+        if row < 0 or row >= self.height:
+            return None
+        if not self.half_of_the_squares_are_playable:
+            return self.position_layout[row][file] if 0 <= file < self.width else None
+        offset = int(row % 2 == int(self.bottom_left_square_isnt_playable))
+        if (file - offset) % 2 != 0:
+            return None
+        column = (file - offset) // 2
+        return self.position_layout[row].get(column)
+
+    def _ray(self, square: int, direction: Tuple[int, int]) -> Tuple[int, ...]:
+        """Get all the squares in one direction, from the nearest to the furthest."""
+        row = (square - 1) // self.width
+        file = self._file(row, (square - 1) % self.width)
+        ray = []
+        while True:
+            row += direction[0]
+            file += direction[1]
+            next_square = self._square(row, file)
+            if next_square is None:
+                break
+            ray.append(next_square)
+        return tuple(ray)
+
+    def _build_player_tables(self, player: int) -> None:
+        """Build the tables of one player. The directions are in the same order as in Piece."""
+        forward = 1 if player == BLACK else -1
+        orthogonal_step = 2 if self.half_of_the_squares_are_playable else 1
+
+        diagonal_forward = [(forward, -1), (forward, 1)]
+        diagonal_backward = [(-forward, -1), (-forward, 1)]
+        # Straight ahead and one side (forward) or straight behind and the other side (backward).
+        orthogonal_forward = [(forward * orthogonal_step, 0), (0, forward * orthogonal_step)]
+        orthogonal_backward = [(-forward * orthogonal_step, 0), (0, -forward * orthogonal_step)]
+
+        if self.orthogonal_moves:
+            man_step_directions = orthogonal_forward + [(0, -forward * orthogonal_step)]
+            man_jump_directions = list(man_step_directions)
+        else:
+            man_step_directions = diagonal_forward
+            man_jump_directions = diagonal_forward + (orthogonal_forward if self.orthogonal_captures else [])
+            if self.men_can_capture_backwards:
+                man_jump_directions += diagonal_backward + (orthogonal_backward if self.orthogonal_captures else [])
+
+        if self.orthogonal_moves:
+            king_directions = orthogonal_forward + orthogonal_backward
+            king_capture_directions = king_directions
+        else:
+            king_directions = diagonal_forward + diagonal_backward
+            if self.orthogonal_captures:
+                king_capture_directions = diagonal_forward + orthogonal_forward + diagonal_backward + orthogonal_backward
+            else:
+                king_capture_directions = king_directions
+
+        man_steps: List[Tuple[int, ...]] = [()]
+        man_jumps: List[Tuple[Tuple[int, int], ...]] = [()]
+        king_steps: List[Tuple[int, ...]] = [()]
+        king_jumps: List[Tuple[Tuple[int, int], ...]] = [()]
+        king_rays: List[Tuple[Tuple[int, ...], ...]] = [()]
+        king_capture_rays: List[Tuple[Tuple[int, ...], ...]] = [()]
+        for square in range(1, self.position_count + 1):
+            man_steps.append(self._steps(square, man_step_directions))
+            man_jumps.append(self._jumps(square, man_jump_directions))
+            king_steps.append(self._steps(square, king_directions))
+            king_jumps.append(self._jumps(square, king_capture_directions))
+            king_rays.append(tuple(filter(bool, [self._ray(square, direction) for direction in king_directions])))
+            king_capture_rays.append(tuple(filter(bool, [self._ray(square, direction)
+                                                         for direction in king_capture_directions])))
+        self.man_steps[player] = man_steps
+        self.man_jumps[player] = man_jumps
+        self.king_steps[player] = king_steps
+        self.king_jumps[player] = king_jumps
+        self.king_rays[player] = king_rays
+        self.king_capture_rays[player] = king_capture_rays
+
+        dependent_squares: List[List[int]] = [[] for _ in range(self.position_count + 1)]
+        for square in range(1, self.position_count + 1):
+            squares_seen = set(man_steps[square]) | set(king_steps[square])
+            for jumps in [man_jumps[square], king_jumps[square]]:
+                for jumped, landing in jumps:
+                    squares_seen.update([jumped, landing])
+            if self.kings_can_move_more_than_one_square:
+                for ray in king_rays[square] + king_capture_rays[square]:
+                    squares_seen.update(ray)
+            for square_seen in squares_seen:
+                dependent_squares[square_seen].append(square)
+        self.dependent_squares[player] = [tuple(squares) for squares in dependent_squares]
+
+    def _steps(self, square: int, directions: List[Tuple[int, int]]) -> Tuple[int, ...]:
+        """Get the adjacent squares in the given directions."""
+        return tuple(ray[0] for ray in [self._ray(square, direction) for direction in directions] if ray)
+
+    def _jumps(self, square: int, directions: List[Tuple[int, int]]) -> Tuple[Tuple[int, int], ...]:
+        """Get the square that is jumped over and the landing square in the given directions."""
+        return tuple((ray[0], ray[1]) for ray in [self._ray(square, direction) for direction in directions]
+                     if len(ray) >= 2)
+
+
+_GEOMETRIES: Dict[str, Geometry] = {}
+
+
+def get_geometry(variant: str) -> Geometry:
+    """Get the geometry of a variant. It is only built the first time it is needed."""
+    geometry = _GEOMETRIES.get(variant)
+    if geometry is None:
+        geometry = _GEOMETRIES[variant] = Geometry(variant)
+    return geometry
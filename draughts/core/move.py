@@ -4,6 +4,10 @@ import warnings
 
 warnings.simplefilter("default")
 
+# The attributes that are set by _from_board.
+CONVERTED_MOVE_TYPES = {'hub_move', 'hub_position_move', 'pdn_move', 'pdn_position_move', 'steps_move', 'li_api_move',
+                        'li_one_move', 'ambiguous'}
+
 
 class StandardMove:
     """Convert between different move types. Uses internal move representation (white always starts)."""
@@ -42,8 +46,12 @@ class StandardMove:
                 self.captures = self.possible_captures[self.possible_moves.index(self.board_move)]
                 self.captures = [] if self.captures[0] is None else self.captures
                 self.has_captures = bool(self.captures)
-                self._from_board(hub_move, hub_position_move, pdn_move, pdn_position_move, steps_move, li_api_move,
-                                 li_one_move)
+                # The other move types are only found when one of them is used (see __getattr__).
+                self._move_types_to_convert = (hub_move, hub_position_move, pdn_move, pdn_position_move, steps_move,
+                                               li_api_move, li_one_move)
+                if not pdn_position_move:
+                    # _from_board also finds if the PDN move is ambiguous.
+                    del self.ambiguous
             else:
                 self._no_board(board_move, hub_move, hub_position_move, pdn_move, pdn_position_move, steps_move,
                                li_api_move, li_one_move)
@@ -57,6 +65,14 @@ class StandardMove:
             self.li_api_move = ['0000']
             self.li_one_move = '0000'
 
+    def __getattr__(self, name: str) -> Any:
+        """Convert the move to the other move types the first time one of them is used."""
+        # __getattr__ is only called when the attribute doesn't exist.
+        if name in CONVERTED_MOVE_TYPES and '_move_types_to_convert' in self.__dict__:
+            self._from_board(*self.__dict__.pop('_move_types_to_convert'))
+            return getattr(self, name)
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
     def _make_len_2(self, move: Union[str, int]) -> str:
         """
         Add a 0 in the front of the square if it is only 1 digit.
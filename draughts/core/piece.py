@@ -1,5 +1,5 @@
 from __future__ import annotations
-from math import ceil
+from draughts.core.geometry import get_geometry
 from typing import List, Any, Dict, Optional
 
 WHITE = 2
@@ -17,28 +17,69 @@ class Piece:
         self.became_king = -100
         self.capture_move_enemies: Dict[int, Piece] = {}
         self.variant = variant
+        # The geometry of the board and the rules of the variant are shared by all the pieces.
+        self.geometry = get_geometry(variant)
         self.reset_for_new_board()
 
-        self.diagonal_moves = self.variant not in ['turkish']
-        self.orthogonal_moves = self.variant in ['turkish']
-        self.orthogonal_captures = self.variant in ['frisian', 'frysk!', 'turkish']
-        # In most draughts variants only the dark squares are playable.
-        self.half_of_the_squares_are_playable = self.variant not in ['turkish']
-        # The bottom left square isn't a playing square in italian draughts.
-        self.bottom_left_square_isnt_playable = self.variant in ['italian']
-        # Men can't capture kings in italian draughts.
-        self.man_can_capture_king = self.variant not in ['italian']
-        # There are three possible values for squares_per_row (4, 5, 8), which is why two lines are needed.
-        self.squares_per_row = 4 if self.variant in ['russian', 'brazilian', 'english', 'italian'] else 5
-        self.squares_per_row = 8 if self.variant in ['turkish'] else self.squares_per_row
-        self.kings_can_move_more_than_one_square = self.variant not in ['english', 'italian']
-        self.men_can_capture_backwards = self.variant not in ['english', 'italian', 'turkish']
-        self.kings_can_jump_over_an_already_captured_piece = self.variant in ['turkish']
-        self.kings_can_turn_180_degrees_in_multicapture = False  # No variant supports it for now.
+    def __getstate__(self) -> Dict[str, Any]:
+        # The geometry is shared by all the pieces of a variant, so it isn't copied.
+        state = self.__dict__.copy()
+        del state['geometry']
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.geometry = get_geometry(self.variant)
+
+    @property
+    def diagonal_moves(self) -> bool:
+        return self.geometry.diagonal_moves
+
+    @property
+    def orthogonal_moves(self) -> bool:
+        return self.geometry.orthogonal_moves
+
+    @property
+    def orthogonal_captures(self) -> bool:
+        return self.geometry.orthogonal_captures
+
+    @property
+    def half_of_the_squares_are_playable(self) -> bool:
+        return self.geometry.half_of_the_squares_are_playable
+
+    @property
+    def bottom_left_square_isnt_playable(self) -> bool:
+        return self.geometry.bottom_left_square_isnt_playable
+
+    @property
+    def man_can_capture_king(self) -> bool:
+        return self.geometry.man_can_capture_king
+
+    @property
+    def squares_per_row(self) -> int:
+        return self.geometry.squares_per_row
+
+    @property
+    def kings_can_move_more_than_one_square(self) -> bool:
+        return self.geometry.kings_can_move_more_than_one_square
+
+    @property
+    def men_can_capture_backwards(self) -> bool:
+        return self.geometry.men_can_capture_backwards
+
+    @property
+    def kings_can_jump_over_an_already_captured_piece(self) -> bool:
+        return self.geometry.kings_can_jump_over_an_already_captured_piece
+
+    @property
+    def kings_can_turn_180_degrees_in_multicapture(self) -> bool:
+        return self.geometry.kings_can_turn_180_degrees_in_multicapture
 
     def reset_for_new_board(self) -> None:
         """Reset possible moves to None."""
         self.possible_capture_moves: Optional[List[List[int]]] = None
+        # The pieces captured earlier in the multi-capture when possible_capture_moves was built.
+        self.possible_capture_moves_captures: Optional[List[int]] = None
         self.possible_positional_moves: Optional[List[List[int]]] = None
 
     def get_square(self, row: int, column: int) -> Optional[int]:
@@ -65,30 +106,57 @@ class Piece:
 
     def get_possible_capture_moves(self, captures: List[int]) -> List[List[int]]:
         """Get all possible capture moves (not positional moves) for this piece."""
-        if self.possible_capture_moves is None:
+        if self.possible_capture_moves is None or self.possible_capture_moves_captures != captures:
+            self.capture_move_enemies = {}
             self.possible_capture_moves = self.build_possible_capture_moves(captures)
+            self.possible_capture_moves_captures = list(captures)
 
         return self.possible_capture_moves
 
     def build_possible_capture_moves(self, captures: List[int]) -> List[List[int]]:
         """Build all possible capture moves (not positional moves) for this piece."""
-        adjacent_enemy_positions = list(
-            filter((lambda position: position in self.board.searcher.get_positions_by_player(
-                self.other_player)), self.get_adjacent_positions(capture=True)))
+        geometry = self.geometry
+        position_pieces = self.board.searcher.position_pieces
         capture_move_positions = []
 
-        for enemy_position in adjacent_enemy_positions:
-            enemy_piece = self.board.searcher.get_piece_by_position(enemy_position)
-
-            if not self.man_can_capture_king and not self.king and enemy_piece.king:
-                continue
+        if self.king and geometry.kings_can_move_more_than_one_square:
+            # Kings in multi-captures can't go over a piece they have captured in that move sequence in most
+            # variants. In turkish they can, but we use the last capture to prevent the piece from
+            # turning 180 degrees, which is not allowed.
+            if geometry.kings_can_turn_180_degrees_in_multicapture:
+                captures = []
+            elif geometry.kings_can_jump_over_an_already_captured_piece:
+                captures = captures[-1:]
+
+            for ray in geometry.king_capture_rays[self.player][self.position]:
+                enemy_piece = None
+                for position in ray:
+                    piece = position_pieces.get(position)
+                    if enemy_piece is not None:
+                        # The king can land on any empty square after the enemy piece until it meets another piece.
+                        if piece is not None or position in captures:
+                            break
+                        capture_move_positions.append(position)
+                        self.capture_move_enemies[position] = enemy_piece
+                    elif piece is not None:
+                        # It stops if it meets a piece of the same color.
+                        if piece.player == self.player:
+                            break
+                        enemy_piece = piece
+                    elif position in captures:
+                        break
+        else:
+            jumps = geometry.king_jumps if self.king else geometry.man_jumps
+            for enemy_position, position_behind_enemy in jumps[self.player][self.position]:
+                enemy_piece = position_pieces.get(enemy_position)
+                if enemy_piece is None or enemy_piece.player == self.player or position_behind_enemy in position_pieces:
+                    continue
 
-            positions_behind_enemy = self.get_position_behind_enemy(enemy_piece, captures)
-            for position_behind_enemy in positions_behind_enemy:
+                if not geometry.man_can_capture_king and not self.king and enemy_piece.king:
+                    continue
 
-                if (position_behind_enemy is not None) and self.board.position_is_open(position_behind_enemy):
-                    capture_move_positions.append(position_behind_enemy)
-                    self.capture_move_enemies[position_behind_enemy] = enemy_piece
+                capture_move_positions.append(position_behind_enemy)
+                self.capture_move_enemies[position_behind_enemy] = enemy_piece
 
         return self.create_moves_from_new_positions(capture_move_positions)
 
@@ -213,7 +281,7 @@ class Piece:
         for index, position in enumerate(positions_to_check):
             enemy_piece_found = False
             for semi_position in positions_to_check[:index + 1]:
-                if semi_position in self.board.searcher.filled_positions:
+                if semi_position in self.board.searcher.position_pieces:
                     piece = self.board.searcher.get_piece_by_position(semi_position)
                     # It stops if it meets a piece of the same color or another opponent piece
                     if piece.player == self.player or enemy_piece_found:
@@ -290,7 +358,7 @@ class Piece:
             for index, position in enumerate(positions_to_check):
                 enemy_piece_found = False
                 for semi_position in positions_to_check[:index + 1]:
-                    if semi_position in self.board.searcher.filled_positions:
+                    if semi_position in self.board.searcher.position_pieces:
                         piece = self.board.searcher.get_piece_by_position(semi_position)
                         # It stops if it meets a piece of the same color or another opponent piece.
                         if piece.player == self.player or enemy_piece_found:
@@ -346,7 +414,19 @@ class Piece:
 
     def build_possible_positional_moves(self) -> List[List[int]]:
         """Build all possible positional moves (not capture moves) for this piece."""
-        new_positions = list(filter((lambda position: self.board.position_is_open(position)), self.get_adjacent_positions()))
+        geometry = self.geometry
+        position_pieces = self.board.searcher.position_pieces
+
+        if self.king and geometry.kings_can_move_more_than_one_square:
+            new_positions = []
+            for ray in geometry.king_rays[self.player][self.position]:
+                for position in ray:
+                    if position in position_pieces:
+                        break
+                    new_positions.append(position)
+        else:
+            steps = geometry.king_steps if self.king else geometry.man_steps
+            new_positions = [position for position in steps[self.player][self.position] if position not in position_pieces]
 
         return self.create_moves_from_new_positions(new_positions)
 
@@ -363,8 +443,7 @@ class Piece:
 
     def get_column(self) -> int:
         """Get the piece's column."""
-        width: int = self.board.width
-        return (self.position - 1) % width
+        return self.geometry.columns[self.position]
 
     def get_row(self) -> int:
         """Get the piece's row."""
@@ -372,11 +451,11 @@ class Piece:
 
     def is_on_enemy_home_row(self) -> bool:
         """Get if the piece is on the enemy's home row (used for promotions)."""
-        return self.get_row() == self.get_row_from_position(1 if self.other_player == BLACK else self.board.position_count)
+        return self.position in self.geometry.promotion_squares[self.player]
 
     def get_row_from_position(self, position: int) -> int:
         """Get the piece's row, given its square."""
-        return ceil(position / self.board.width) - 1
+        return self.geometry.rows[position]
 
     def get_directional_diagonal_one_square_adjacent_positions(self, forward: bool) -> List[int]:
         """
@@ -457,7 +536,7 @@ class Piece:
 
         for index, position in enumerate(positions_diagonal_1):
             for semi_position in positions_diagonal_1[:index + 1]:
-                if semi_position in self.board.searcher.filled_positions and not capture:
+                if semi_position in self.board.searcher.position_pieces and not capture:
                     # If we encounter a piece, and we are searching for a positional move not a capture move, we break the loop
                     break
             else:
@@ -467,7 +546,7 @@ class Piece:
 
         for index, position in enumerate(positions_diagonal_2):
             for semi_position in positions_diagonal_2[:index + 1]:
-                if semi_position in self.board.searcher.filled_positions and not capture:
+                if semi_position in self.board.searcher.position_pieces and not capture:
                     # If we encounter a piece, and we are searching for a positional move not a capture move, we break the loop
                     break
             else:
@@ -490,12 +569,19 @@ class Piece:
             next_row = current_row + multiplier * (row_in_front if self.player == BLACK else -row_in_front) * (
                 1 if forward else -1)
             if next_row in self.board.position_layout:
-                positions.append(self.board.position_layout[next_row][current_column])
+                position = self.board.position_layout[next_row][current_column]
+                if position in self.board.searcher.position_pieces and not captures:
+                    # If we encounter a piece, and we are searching for a positional move not a capture move, we break the loop
+                    break
+                positions.append(position)
 
         for multiplier in range(1, self.board.width):
             next_column = current_column + multiplier * (1 if self.player == BLACK else -1) * (1 if forward else -1)
             if next_column in self.board.position_layout[current_row]:
-                positions.append(self.board.position_layout[current_row][next_column])
+                position = self.board.position_layout[current_row][next_column]
+                if position in self.board.searcher.position_pieces and not captures:
+                    break
+                positions.append(position)
 
         return positions
 
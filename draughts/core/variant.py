@@ -1,7 +1,7 @@
 from __future__ import annotations
 from draughts.core.game import Game, _convert_variant_names
-from draughts.convert import (fen_from_variant, fen_to_variant, move_from_variant, move_to_variant,
-                              _number_to_algebraic, _algebraic_to_number)
+from draughts.convert import (fen_from_variant, fen_to_variant, board_move_from_variant, board_move_to_variant,
+                              square_to_variant, _number_to_algebraic, _algebraic_to_number)
 from draughts.core.move import StandardMove
 import pickle
 from typing import Optional, Any, List, Tuple
@@ -23,8 +23,11 @@ class Move(StandardMove):
         self.captures = None
         self.to_algebraic_variant = None
         self.has_captures = has_captures
+        # The position of the board the move was built for (see Board._position_key).
+        self._position: Optional[Tuple[str, int, int]] = None
         if (possible_moves is None or possible_captures is None) and board:
             self.possible_moves, self.possible_captures = board._legal_moves_board()
+            self._position = board._position_key()
         else:
             self.possible_moves = possible_moves
             self.possible_captures = possible_captures
@@ -50,8 +53,12 @@ class Move(StandardMove):
                 self.captures = self.possible_captures[self.possible_moves.index(self.board_move)]
                 self.captures = [] if self.captures[0] is None else self.captures
                 self.has_captures = bool(self.captures)
-                self._from_board(hub_move, hub_position_move, pdn_move, pdn_position_move, steps_move, li_api_move,
-                                 li_one_move)
+                # The other move types are only found when one of them is used (see __getattr__).
+                self._move_types_to_convert = (hub_move, hub_position_move, pdn_move, pdn_position_move, steps_move,
+                                               li_api_move, li_one_move)
+                if not pdn_position_move:
+                    # _from_board also finds if the PDN move is ambiguous.
+                    del self.ambiguous
             else:
                 self._no_board(board_move, hub_move, hub_position_move, pdn_move, pdn_position_move, steps_move,
                                li_api_move, li_one_move)
@@ -282,9 +289,10 @@ class Move(StandardMove):
 
 class Board:
     """A draughts game which considers the variant."""
-    def __init__(self, variant: str = "standard", fen: str = "startpos"):
+    def __init__(self, variant: str = "standard", fen: str = "startpos", backend: str = "pieces"):
         self.variant = _convert_variant_names(variant)
-        self._game = Game(variant, fen_from_variant(fen, variant) if fen != "startpos" else fen)
+        self.backend = backend
+        self._game = Game(variant, fen_from_variant(fen, variant) if fen != "startpos" else fen, backend)
         self.initial_fen = fen_to_variant(self._game.initial_fen, self.variant)
         self.move_stack: List[Move] = []
         self.fens = [self.initial_fen]
@@ -292,6 +300,16 @@ class Board:
         self._last_non_reversible_fen = self.initial_fen
         self._last_non_reversible_fens: List[str] = [self._last_non_reversible_fen]
         self._reversible_moves: List[Move] = []
+        # For every move in move_stack, if it was built for this board in the position it was played in. The PDN move of
+        # these moves is already correct, so PDNWriter doesn't have to replay them.
+        self._legal_move_stack: List[bool] = []
+
+        # The legal moves (in board_move format) of the position they were found in. All the moves built for the same
+        # position share them, so they are only found once. The counters show how often the cache was used.
+        self._legal_moves_cache: Optional[Tuple[Tuple[str, int, int], List[List[List[int]]],
+                                                List[List[Optional[int]]]]] = None
+        self.legal_moves_cache_hits = 0
+        self.legal_moves_cache_misses = 0
 
     def copy(self) -> Board:
         """Copy the board (transfers all data)."""
@@ -301,9 +319,11 @@ class Board:
 
     def pop(self) -> Board:
         """Undo the last move."""
+        self._legal_moves_cache = None
         self._game.pop()
         self.fens.pop()
         self.move_stack.pop()
+        self._legal_move_stack.pop()
         self._last_non_reversible_fens.pop()
         self._last_non_reversible_fen = self._last_non_reversible_fens[-1]
         if self._reversible_moves:
@@ -312,11 +332,11 @@ class Board:
 
     def push(self, move: Move) -> Board:
         """Make a move."""
+        position = getattr(move, '_position', None)
+        self._legal_move_stack.append(position is not None and position == self._position_key())
+        self._legal_moves_cache = None
         self.move_stack.append(move)
-        board_move = move.board_move.copy()
-        for index, steps in enumerate(board_move):
-            board_move[index] = list(map(lambda square: int(move_from_variant(str(square), variant=self.variant)), steps))
-        self._game.push(board_move)
+        self._game.push(board_move_from_variant(move.board_move, self.variant))
         self.fens.append(fen_to_variant(self._game.get_li_fen(), self.variant))
         if self._game.reversible_moves:
             self._reversible_moves.append(move)
@@ -350,21 +370,39 @@ class Board:
         return self.fens[-1]
 
     def _legal_moves_board(self) -> Tuple[List[List[List[int]]], List[List[Optional[int]]]]:
-        """Get the legal moves for the current position in board_move format."""
-        legal_moves, legal_captures = self._game.legal_moves()
-        for move_index, move_capture in enumerate(zip(legal_moves, legal_captures)):
-            for index, steps in enumerate(move_capture[0]):
-                legal_moves[move_index][index] = list(map(lambda square: int(move_to_variant(
-                    str(square), variant=self.variant, to_algebraic=False)), steps))
-            legal_captures[move_index] = list(map(lambda square: None if square is None else int(move_to_variant(
-                str(square), variant=self.variant, to_algebraic=False)), move_capture[1]))
+        """
+        Get the legal moves for the current position in board_move format.
+        The lists are shared by all the calls for the same position, so they mustn't be changed.
+        """
+        key = self._position_key()
+        if self._legal_moves_cache is not None and self._legal_moves_cache[0] == key:
+            self.legal_moves_cache_hits += 1
+            return self._legal_moves_cache[1], self._legal_moves_cache[2]
+        self.legal_moves_cache_misses += 1
+        internal_moves, internal_captures = self._game.legal_moves()
+        legal_moves = [board_move_to_variant(board_move, self.variant) for board_move in internal_moves]
+        legal_captures: List[List[Optional[int]]] = [
+            [None if square is None else square_to_variant(square, self.variant) for square in captures]
+            for captures in internal_captures]
+        self._legal_moves_cache = key, legal_moves, legal_captures
         return legal_moves, legal_captures
 
+    def _position_key(self) -> Tuple[str, int, int]:
+        """Get a key that identifies the current position."""
+        # The number of moves is part of the key because some rules (e.g. in frisian) depend on the previous moves.
+        return self.variant, self._game.hash(), len(self._game.moves)
+
     def legal_moves(self) -> List[Move]:
         """Get the legal moves for the current position."""
         legal_board_moves, legal_captures = self._legal_moves_board()
-        legal_moves: List[Move] = list(map(lambda board_move: Move(
-            board_move=board_move, possible_moves=legal_board_moves, possible_captures=legal_captures), legal_board_moves))
+        # The moves are built without the board, so their PDN moves use numbers. In the variants that use algebraic
+        # notation, they aren't marked as built for this position, so PDNWriter replays them to get the right notation.
+        position = None if self.variant in ['russian', 'brazilian', 'turkish'] else self._position_key()
+        legal_moves: List[Move] = []
+        for board_move in legal_board_moves:
+            move = Move(board_move=board_move, possible_moves=legal_board_moves, possible_captures=legal_captures)
+            move._position = position
+            legal_moves.append(move)
         return legal_moves
 
     @property
@@ -373,6 +411,10 @@ class Board:
         game_turn = self._game.whose_turn()
         return 3 - game_turn if self.variant == "english" else game_turn
 
+    def hash(self) -> int:
+        """Get the Zobrist hash of the current position."""
+        return self._game.hash()
+
     def __repr__(self) -> str:
         """Get a visual representation of the board."""
         game_repr = self._game.__repr__()
@@ -1,6 +1,7 @@
 from draughts.engines.dxp import DXPEngine
-from draughts.engines.hub import HubEngine
+from draughts.engines.hub import HubEngine, AsyncHubEngine
 from draughts.engines.checkerboard import CheckerBoardEngine
+from draughts.engines.pool import EnginePool
 from typing import Optional, Union, Dict, Any
 from draughts.core.variant import Move
 
@@ -28,4 +29,4 @@ class PlayResult:
         self.resigned = resigned
 
 
-__all__ = ['HubEngine', 'DXPEngine', 'CheckerBoardEngine', 'Limit', 'PlayResult']
+__all__ = ['HubEngine', 'AsyncHubEngine', 'DXPEngine', 'CheckerBoardEngine', 'EnginePool', 'Limit', 'PlayResult']
@@ -59,6 +59,18 @@ class CheckerBoardEngine:
         else:
             self.engine.kill_process()
 
+    def is_alive(self) -> bool:
+        """Get if the engine still answers commands."""
+        try:
+            self.engine.enginecommand('name')
+        except Exception:
+            return False
+        return True
+
+    def new_game(self) -> None:
+        """Prepare for a new game."""
+        self._sent_variant = False
+
     def play(self, board: draughts.Board, time_limit: Any) -> Any:
         """Engine search."""
         time = time_limit.time
@@ -7,7 +7,7 @@ import signal
 import threading
 import time
 import logging
-from typing import Optional, Dict, Union, List, Any, Tuple
+from typing import Optional, Dict, Union, List, Any, Tuple, Callable
 
 logger = logging.getLogger("pydraughts")
 
@@ -25,6 +25,7 @@ class DXPEngine:
         self.command = command
         self.engine_opened = True  # Whether the engine is already open or pydraughts should open it
         self.wait_to_open_time = 10
+        self.timeout: Optional[float] = None  # The seconds to wait for a message from the engine
         self.ENGINE = ENGINE
         self.info: Dict[str, Any] = {}
         self.id: Dict[str, str] = {}
@@ -62,6 +63,8 @@ class DXPEngine:
             self.port = str(value)
         elif name == 'wait-to-open-time':
             self.wait_to_open_time = int(value)
+        elif name == 'timeout':
+            self.timeout = float(value)
         elif name == 'max-moves':
             self.max_moves = int(value)
         elif name == 'initial-time':
@@ -102,25 +105,57 @@ class DXPEngine:
     def kill_process(self) -> None:
         """Kill the engine process."""
         if not self.engine_opened:
+            # Give the engine up to 10 seconds after quit to close the connection.
             wait_time = self.quit_time / 1e9 + 10 - time.perf_counter_ns() / 1e9
             logger.debug(f'wait time before killing: {wait_time}')
             if wait_time > 0:
-                time.sleep(wait_time)
+                self.sender.socket.end_of_stream.wait(wait_time)
             self.exit = True
-            try:
-                # Windows
-                logger.debug("Killing Windows.")
-                self.p.send_signal(signal.CTRL_BREAK_EVENT)
-            except AttributeError:
-                # Unix
-                logger.debug("Killing UNIX.")
-                os.killpg(self.p.pid, signal.SIGTERM)
-                time.sleep(7)
-                os.killpg(self.p.pid, signal.SIGKILL)
+            if self.p.poll() is None:
+                try:
+                    # Windows
+                    logger.debug("Killing Windows.")
+                    self.p.send_signal(signal.CTRL_BREAK_EVENT)
+                except AttributeError:
+                    # Unix
+                    logger.debug("Killing UNIX.")
+                    os.killpg(self.p.pid, signal.SIGTERM)
+                    try:
+                        self.p.wait(7)
+                    except subprocess.TimeoutExpired:
+                        pass
+                    try:
+                        os.killpg(self.p.pid, signal.SIGKILL)
+                    except ProcessLookupError:
+                        pass
 
             self.p.communicate()
             self.engine_receive_thread.join()
 
+    def is_alive(self) -> bool:
+        """
+        Get if the engine can play another game. The process of an engine that pydraughts opened must still be running.
+        An engine that pydraughts didn't open is assumed to be running until it is killed.
+        """
+        if self.exit:
+            return False
+        return self.engine_opened or self.p.poll() is None
+
+    def new_game(self) -> None:
+        """
+        Prepare for a new game. It is played on a new connection to the engine, so the connection of the previous game
+        is closed if it is still open.
+        """
+        self.end_game()
+        self.sender = dxp_communication.Sender()
+        self.receiver = self.sender.receiver
+        self.game_started = False
+
+    def end_game(self) -> None:
+        """End the game and close its connection, if it is still open."""
+        if self.sender.socket.sock is not None:
+            self.quit()
+
     def _connect(self) -> None:
         """Connect to the engine."""
         if not self.engine_opened:
@@ -159,34 +194,36 @@ class DXPEngine:
                 else:
                     raise err
 
+    def _wait_for(self, predicate: Callable[[], bool], message: str) -> None:
+        """Wait until the receiver gets the message from the engine."""
+        if not self.receiver.wait_for(predicate, self.timeout):
+            raise TimeoutError(f"The engine didn't send {message} in {self.timeout} seconds.")
+
     def _recv_accept(self) -> bool:
         """Get if the game was accepted."""
-        while True:
-            if self.receiver.accepted is not None:
-                return self.receiver.accepted
+        self._wait_for(lambda: self.receiver.accepted is not None, "GAMEACC")
+        return bool(self.receiver.accepted)
 
     def _recv_move(self) -> Optional[draughts.Move]:
-        """Receive the engine move."""
-        while True:
-            if not self.receiver.listening:
-                break
-            if self.receiver.last_move_changed:
-                logger.debug(f'new last move: {self.receiver.last_move.board_move}')
-                return self.receiver.last_move
+        """Receive the engine move. It returns None if the engine ended the game or closed the connection."""
+        self._wait_for(lambda: (self.receiver.last_move_changed or self.receiver.gameend_received
+                                or not self.receiver.listening), "MOVE")
+        if self.receiver.last_move_changed:
+            logger.debug(f'new last move: {self.receiver.last_move.board_move}')
+            return self.receiver.last_move
         return None
 
     def _recv_backreq(self) -> bool:
         """Get if the backreq was accepted."""
-        while True:
-            if self.receiver.backreq_accepted is not None:
-                return self.receiver.backreq_accepted
+        self._wait_for(lambda: self.receiver.backreq_accepted is not None, "BACKACC")
+        return bool(self.receiver.backreq_accepted)
 
     def takeback(self, move: int, color: int) -> Tuple[bool, draughts.Board, Any]:
         """
         Attempt to take back moves.
         Warning: If it is the engine's turn to play in the new position, it will attempt to move.
         """
-        self.receiver.backreq_accepted = None
+        self.receiver.update(backreq_accepted=None)
         ply = (move - 1) * 2 + (0 if color == draughts.WHITE else 1)
         remove_count = 0
         best_move = None
@@ -200,11 +237,12 @@ class DXPEngine:
                 self.sender.current.pos.pop()
                 moves = list(map(lambda old_move: old_move.steps_move, self.sender.current.pos.move_stack))
                 logger.debug(f"Move stack after removing {remove_count} moves: {moves}")
-            self.receiver.takeback_in_progress = False
+            self.receiver.update(takeback_in_progress=False)
             new_board = self.sender.current.pos.copy()
             if self.sender.current.engine_color == self.sender.current.get_color():  # It is the engine's turn to play.
                 best_move = self._recv_move()
         else:
+            self.receiver.update(takeback_in_progress=False)
             new_board = self.sender.current.pos.copy()
         return backreq, new_board, draughts.engine.PlayResult(best_move, None, {})
 
@@ -1,11 +1,14 @@
 # This file is an adaptation of DXC100_draughts_client (https://github.com/akalverboer/DXC100_draughts_client) by akalverboer.
 
 from __future__ import annotations
+import asyncio
+import collections
 import socket
 import logging
+import threading
 import draughts
 import time
-from typing import Dict, Optional, List, Union
+from typing import Deque, Dict, Optional, List, Union
 
 logger = logging.getLogger("pydraughts")
 
@@ -29,11 +32,86 @@ class GameStatus:
         """Get the color of the playing side."""
         return DXP_WHITE if self.pos.turn == draughts.WHITE else DXP_BLACK
 
+    def find_move(self, dxp_data: Dict[str, Union[str, List[str]]]) -> Optional[draughts.Move]:
+        """Find the legal move of a parsed MOVE message. It returns None if the move is illegal."""
+        captures = ''.join(sorted(str(int(capture)).zfill(2) for capture in dxp_data['captures']))
+        hub_position_move = f"{str(int(dxp_data['from'])).zfill(2)}{str(int(dxp_data['to'])).zfill(2)}{captures}"
+        correct_move = None
+        for move in self.pos.legal_moves():
+            if move.hub_position_move == hub_position_move:
+                correct_move = move
+        return correct_move
+
+
+class ConnectionStats:
+    """
+    Counters of a DXP connection. The latency is the time from sending a message to receiving the next message, which
+    is how long the other side took to answer.
+    """
+    def __init__(self) -> None:
+        self.messages_sent = 0
+        self.messages_received = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.answers = 0
+        self.total_latency = 0.
+        self.max_latency = 0.
+        self.last_latency = 0.
+        self._sent_time: Optional[float] = None
+
+    def sent(self, size: int) -> None:
+        """Count a message that was sent."""
+        self.messages_sent += 1
+        self.bytes_sent += size
+        if self._sent_time is None:
+            self._sent_time = time.perf_counter()
+
+    def received(self, size: int) -> None:
+        """Count a message that was received."""
+        self.messages_received += 1
+        self.bytes_received += size
+        if self._sent_time is not None:
+            self.last_latency = time.perf_counter() - self._sent_time
+            self.total_latency += self.last_latency
+            self.max_latency = max(self.max_latency, self.last_latency)
+            self.answers += 1
+            self._sent_time = None
+
+    @property
+    def mean_latency(self) -> float:
+        """The mean time the other side took to answer a message."""
+        return self.total_latency / self.answers if self.answers else 0.
+
+
+class FrameBuffer:
+    """
+    Split the byte stream of a DXP connection into messages, which end with a null character. The bytes after the last
+    null character are kept until the rest of the message arrives.
+    """
+    def __init__(self, max_length: int = 1024) -> None:
+        self.max_length = max_length
+        self.buffer = b""
+
+    def feed(self, data: bytes) -> List[str]:
+        """Add the bytes that were received and get the messages that are complete."""
+        self.buffer += data
+        *frames, self.buffer = self.buffer.split(b"\0")
+        if len(self.buffer) > self.max_length:
+            # A message this long is broken. It is returned so the buffer doesn't grow forever.
+            frames.append(self.buffer)
+            self.buffer = b""
+        return [frame.decode("utf-8", errors="replace").strip() for frame in frames]
+
 
 class MySocket:
     def __init__(self) -> None:
         self.sock: Optional[socket.socket] = None
         self.closed = False
+        self.frames = FrameBuffer()
+        self.messages: Deque[str] = collections.deque()
+        self.stats = ConnectionStats()
+        # Set when the connection was closed by the other side.
+        self.end_of_stream = threading.Event()
 
     def open(self) -> MySocket:
         """Open the socket."""
@@ -60,49 +138,95 @@ class MySocket:
 
     def send(self, msg: str) -> None:
         """Send a message to the engine."""
+        data = bytes(msg, 'utf-8') + b"\0"
         try:
             logger.debug(f"socket send: {msg}")
-            self.sock.send(bytes(msg, 'utf-8') + b"\0")
+            self.sock.sendall(data)
         except Exception:
             raise Exception("send exception: no connection")
+        self.stats.sent(len(data))
         return None
 
     def receive(self) -> str:
         """Receive a message from the engine."""
-        msg = ""
-        while True:
-            # Collect message chunks until null character found
+        while not self.messages:
             try:
-                chunk = self.sock.recv(1024)
+                chunk = self.sock.recv(4096)
             except Exception:
+                self.end_of_stream.set()
                 raise Exception("receive exception: no connection")
-
-            if chunk == "":
+            if not chunk:
+                self.end_of_stream.set()
                 raise Exception("receive exception: socket connection broken")
-            msg += chunk.decode()
-            if msg.find("\0") > -1:
-                break
-            if len(msg) > 128:
-                break  # too long, no null char
+            self.messages.extend(self.frames.feed(chunk))
 
+        msg = self.messages.popleft()
         logger.debug(f"socket receive: {msg}")
-        msg = msg.replace("\0", "")  # remove all null chars
-
-        # Use strip to remove all whitespace at the start and end.
-        # Including spaces, tabs, newlines and carriage returns.
-        msg = msg.strip()
+        self.stats.received(len(msg) + 1)
         return msg
 
-    def close(self) -> None:
+    def close(self, linger: float = 7) -> None:
+        """
+        Close the connection. The engine gets the messages that were sent before, and it has up to `linger` seconds to
+        close the connection too.
+        """
         if self.sock and not self.closed:
             self.closed = True
-            self.sock.shutdown(socket.SHUT_RDWR)
-            time.sleep(7)
+            try:
+                self.sock.shutdown(socket.SHUT_WR)
+            except OSError:
+                pass
+            self.end_of_stream.wait(linger)
+            try:
+                self.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
             self.sock.close()
             self.sock = None
 
     def __del__(self) -> None:
-        self.close()
+        self.close(0)
+
+
+class AsyncDXPSocket:
+    """A DXP connection for asyncio, so one thread can handle many connections."""
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.stats = ConnectionStats()
+
+    @classmethod
+    async def connect(cls, host: str, port: int) -> AsyncDXPSocket:
+        """Connect to an engine."""
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def send(self, msg: str) -> None:
+        """Send a message."""
+        data = bytes(msg, 'utf-8') + b"\0"
+        logger.debug(f"socket send: {msg}")
+        self.writer.write(data)
+        await self.writer.drain()
+        self.stats.sent(len(data))
+
+    async def receive(self) -> str:
+        """Receive a message. It raises ConnectionError if the connection was closed."""
+        try:
+            data = await self.reader.readuntil(b"\0")
+        except asyncio.IncompleteReadError:
+            raise ConnectionError("receive exception: socket connection broken")
+        self.stats.received(len(data))
+        msg = data[:-1].decode("utf-8", errors="replace").strip()
+        logger.debug(f"socket receive: {msg}")
+        return msg
+
+    async def close(self) -> None:
+        """Close the connection."""
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
 
 
 class DamExchange:
@@ -183,6 +307,18 @@ class DamExchange:
             msg = msg + item
         return msg
 
+    def msg_gameacc(self, name: str, acc_code: str) -> str:
+        """Generate a GAMEACC message."""
+        # Generate GAMEACC message. Example: AKingsRow                        0
+        gameacc = []
+        gameacc.append("A")  # header
+        gameacc.append(name.ljust(32)[:32])  # fName: fixed length padding spaces
+        gameacc.append(str(acc_code)[0])  # accCode: 0 > accepted  1 > not my color  2 > not the time  3 > not the board
+        msg = ""
+        for item in gameacc:
+            msg = msg + item
+        return msg
+
     def msg_move(self, steps: List[int], captures: List[int], time_spent: int) -> str:
         """Generate a MOVE message."""
         # Generate MOVE message. Example: M001205250422122320
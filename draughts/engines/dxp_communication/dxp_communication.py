@@ -5,7 +5,7 @@ import threading
 import logging
 from draughts.engines.dxp_communication.dxp_classes import DamExchange, MySocket, GameStatus, DXP_WHITE, DXP_BLACK
 from draughts import Move, WHITE
-from typing import Optional
+from typing import Any, Callable, Optional
 
 logger = logging.getLogger("pydraughts")
 
@@ -21,19 +21,34 @@ class Receiver:
         self.receive_thread_started = False
         self.backreq_accepted: Optional[bool] = None
         self.takeback_in_progress = False
+        self.gameend_received = False
+        # Notified every time the state above changes, so the engine waits for messages without polling.
+        self.condition = threading.Condition()
         self.receive_thread = threading.Thread(target=self.receive)
 
     def start(self) -> None:
         self.receive_thread_started = True
+        self.update(listening=True)
         self.receive_thread.start()
 
+    def update(self, **state: Any) -> None:
+        """Change the state of the receiver and wake up the threads that wait for it."""
+        with self.condition:
+            for name, value in state.items():
+                setattr(self, name, value)
+            self.condition.notify_all()
+
+    def wait_for(self, predicate: Callable[[], bool], timeout: Optional[float] = None) -> bool:
+        """Wait until the predicate is true. It returns False if the timeout expired first."""
+        with self.condition:
+            return self.condition.wait_for(predicate, timeout)
+
     def close(self) -> None:
         if self.receive_thread_started:
             self.receive_thread.join()
 
     def receive(self) -> None:
         logger.debug("DXP Client starts listening")
-        self.listening = True
         while True:
             try:
                 message = self.sender.socket.receive()  # wait for message
@@ -54,13 +69,12 @@ class Receiver:
                     self.sender.current.engine_color = self.sender.current.engine_color  # as requested
                     self.sender.current.engineName = dxp_data["engineName"]
                     logger.debug(f"\nGame request accepted by {dxp_data['engineName']}")
-                    self.accepted = True
-                    self.gameend_sent = False
                     self.sender.current.started = True
+                    self.update(accepted=True, gameend_sent=False)
                 else:
                     logger.debug(f"\nGame request NOT accepted by {dxp_data['engineName']} Reason: {dxp_data['accCode']}")
-                    self.accepted = False
                     self.sender.current.started = False
+                    self.update(accepted=False)
 
             elif dxp_data["type"] == "E":
                 logger.debug(f"rcv GAMEEND: {message}")
@@ -73,27 +87,20 @@ class Receiver:
                     logger.debug(f"snd GAMEEND: {msg}")
                     self.gameend_sent = True
                     self.sender.current.started = False
+                self.update(gameend_received=True)
 
             elif dxp_data["type"] == "M":
                 logger.debug(f"rcv MOVE: {message}")
-                steps = [dxp_data['from'], dxp_data['to']]
-                nsteps = list(map(int, steps))
-                ntakes_int = list(map(int, dxp_data['captures']))
-                ntakes = list(map(lambda pos: str(pos).zfill(2), sorted(ntakes_int)))
-                logger.debug(f"FEN: {self.sender.current.pos.fen}, Steps: {nsteps}, Takes: {ntakes}")
-                correct_move = None
-                while True:
-                    if not self.takeback_in_progress:
-                        break
-                for move in self.sender.current.pos.legal_moves():
-                    if move.hub_position_move == f"{str(nsteps[0]).zfill(2)}{str(nsteps[-1]).zfill(2)}{''.join(ntakes)}":
-                        correct_move = move
+                logger.debug(f"FEN: {self.sender.current.pos.fen}, Steps: {[dxp_data['from'], dxp_data['to']]}, "
+                             f"Takes: {dxp_data['captures']}")
+                # Wait until the moves that are taken back are removed.
+                self.wait_for(lambda: not self.takeback_in_progress)
+                correct_move = self.sender.current.find_move(dxp_data)
 
                 if correct_move is not None:
                     self.sender.current.pos.push(correct_move)
-                    self.last_move = correct_move
                     logger.debug(f"Move received: {correct_move.steps_move}")
-                    self.last_move_changed = True
+                    self.update(last_move=correct_move, last_move_changed=True)
                 else:
                     move_history = list(map(lambda old_move: old_move.steps_move, self.sender.current.pos.move_stack))
                     logger.debug(f"Error: received move is illegal [{message}]\nMove history: {move_history}")
@@ -113,19 +120,19 @@ class Receiver:
                 acc_code = dxp_data['accCode']
                 if acc_code == "0":
                     # Actions to go back in history as specified in my request
-                    self.backreq_accepted = True
+                    self.update(backreq_accepted=True)
                 elif acc_code == "1":
                     logger.debug("Engine doesn't support going back.")
-                    self.backreq_accepted = False
+                    self.update(backreq_accepted=False)
                 else:
                     logger.debug("Engine wants to continue the game.")
-                    self.backreq_accepted = False
+                    self.update(backreq_accepted=False)
 
             else:
                 logger.debug(f"rcv UNKNOWN: {message}")
                 logger.debug(f"\nrcv Unknown message: {message}")
 
-        self.listening = False
+        self.update(listening=False)
 
 
 class Sender:
@@ -143,7 +150,7 @@ class Sender:
     def send_move(self, move: Move) -> None:
         logger.debug(f"FEN: {self.current.pos.fen}, Steps: {move.steps_move}, Captures: {move.captures}")
         time_spent = 0
-        self.receiver.last_move_changed = False
+        self.receiver.update(last_move_changed=False)
         self.current.pos.push(move)
         msg = self.dxp.msg_move(move.steps_move, move.captures, time_spent)
         try:
@@ -209,8 +216,7 @@ class Sender:
     def backreq(self, move: int, color: int) -> None:
         logger.debug(f"Request to return to {move}th move with {'WHITE' if color == WHITE else 'BLACK'} to move.")
         msg = self.dxp.msg_backreq(move, DXP_WHITE if color == WHITE else DXP_BLACK)
-        self.receiver.last_move_changed = False
-        self.receiver.takeback_in_progress = True
+        self.receiver.update(last_move_changed=False, takeback_in_progress=True)
         try:
             self.socket.send(msg)
             logger.debug(f"snd BACKREQ: {msg}")
@@ -0,0 +1,191 @@
+import asyncio
+import concurrent.futures
+import logging
+import time
+import draughts
+import draughts.engine
+from draughts.engines.dxp_communication.dxp_classes import (AsyncDXPSocket, DamExchange, GameStatus, DXP_WHITE,
+                                                            DXP_BLACK)
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger("pydraughts")
+
+Search = Callable[[draughts.Board, 'draughts.engine.Limit'], Union[draughts.Move, 'draughts.engine.PlayResult', None]]
+
+# The reasons of a GAMEEND message.
+UNKNOWN = "0"
+I_LOSE = "1"
+DRAW = "2"
+I_WIN = "3"
+
+
+def dxp_position_to_fen(position: str, color_to_move: str) -> str:
+    """Get the fen of the position of a GAMEREQ message (e.g. `position='zzz...eee...www'` and `color_to_move='W'`)."""
+    white_pieces = []
+    black_pieces = []
+    for square, letter in enumerate(position, 1):
+        if letter in 'wW':
+            white_pieces.append(('K' if letter == 'W' else '') + str(square))
+        elif letter in 'zZ':
+            black_pieces.append(('K' if letter == 'Z' else '') + str(square))
+    turn = 'W' if color_to_move == 'W' else 'B'
+    return f"{turn}:W{','.join(white_pieces)}:B{','.join(black_pieces)}"
+
+
+class DXPServer:
+    """
+    Let DXP clients (e.g. GUIs) play against a search function. Every connection is a separate game, and many
+    connections are served at once with asyncio.
+    `search(board, limit)` gets a copy of the board and the time that is left, and it returns the move (or a PlayResult,
+    or None to resign). It runs in `executor` (the default executor of the event loop if it is None), so the server can
+    handle the other connections while it searches.
+    """
+    def __init__(self, search: Search, name: str = "pydraughts", variant: str = "standard", host: str = "127.0.0.1",
+                 port: int = 27531, executor: Optional[concurrent.futures.Executor] = None) -> None:
+        self.search = search
+        self.name = name
+        self.variant = variant
+        self.host = host
+        self.port = port
+        self.executor = executor
+        self.dxp = DamExchange()
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.connections = 0
+        self.games_played = 0
+
+    async def start(self) -> None:
+        """Start listening. If `port` is 0, `port` is set to the port that was chosen."""
+        self.server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        logger.debug(f"DXP server listening on {self.host}:{self.port}")
+
+    async def serve_forever(self) -> None:
+        """Start the server and handle connections until it is closed."""
+        if self.server is None:
+            await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self) -> None:
+        """Stop accepting connections."""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+
+    def run(self) -> None:
+        """Run the server in a new event loop until it is interrupted."""
+        asyncio.run(self.serve_forever())
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Play the games that are requested on a connection."""
+        connection = AsyncDXPSocket(reader, writer)
+        self.connections += 1
+        game: Optional[GameStatus] = None
+        time_left = 0.
+        try:
+            while True:
+                try:
+                    message = (await connection.receive())[0:127]  # DXP max length
+                except ConnectionError:
+                    break
+                dxp_data = self.dxp.parse(message)
+
+                if dxp_data["type"] == "R":
+                    logger.debug(f"rcv GAMEREQ: {message}")
+                    game, time_left = self._new_game(dxp_data)
+                    await connection.send(self.dxp.msg_gameacc(self.name, "0"))
+                    time_left = await self._play_if_my_turn(connection, game, time_left)
+
+                elif dxp_data["type"] == "M":
+                    logger.debug(f"rcv MOVE: {message}")
+                    if game is None or not game.started:
+                        continue
+                    move = game.find_move(dxp_data)
+                    if move is None:
+                        logger.debug(f"Error: received move is illegal [{message}]")
+                        await self._end_game(connection, game, UNKNOWN)
+                        continue
+                    game.pos.push(move)
+                    time_left = await self._play_if_my_turn(connection, game, time_left)
+
+                elif dxp_data["type"] == "B":
+                    logger.debug(f"rcv BACKREQ: {message}")
+                    if game is None or not game.started:
+                        await connection.send(self.dxp.msg_backacc("1"))
+                        continue
+                    ply = (int(str(dxp_data["moveId"])) - 1) * 2 + (0 if dxp_data["mColor"] == "W" else 1)
+                    if not 0 <= ply <= len(game.pos.move_stack):
+                        await connection.send(self.dxp.msg_backacc("1"))
+                        continue
+                    while len(game.pos.move_stack) > ply:
+                        game.pos.pop()
+                    await connection.send(self.dxp.msg_backacc("0"))
+                    time_left = await self._play_if_my_turn(connection, game, time_left)
+
+                elif dxp_data["type"] == "E":
+                    logger.debug(f"rcv GAMEEND: {message}")
+                    if game is not None and game.started:
+                        # Confirm the end of the game.
+                        game.result = dxp_data["reason"]
+                        await self._end_game(connection, game, UNKNOWN)
+
+                elif dxp_data["type"] == "C":
+                    logger.debug(f"rcv CHAT: {message}")
+
+                else:
+                    logger.debug(f"rcv UNKNOWN: {message}")
+        finally:
+            self.connections -= 1
+            await connection.close()
+
+    def _new_game(self, dxp_data: Dict[str, Union[str, List[str]]]) -> Tuple[GameStatus, float]:
+        """Set up the game of a GAMEREQ message. It returns the game and the seconds the server has to play."""
+        fen = "startpos"
+        if dxp_data["posInd"] != "A":
+            fen = dxp_position_to_fen(str(dxp_data["pos"]), str(dxp_data["mColor"]))
+        engine_color = DXP_WHITE if dxp_data["fColor"] == "W" else DXP_BLACK
+        game = GameStatus(fen=fen, engine_color=engine_color, started=True, variant=self.variant)
+        game.engineName = str(dxp_data["name"])
+        return game, int(str(dxp_data["gameTime"])) * 60.
+
+    async def _play_if_my_turn(self, connection: AsyncDXPSocket, game: GameStatus, time_left: float) -> float:
+        """Search and send a move if it is the server's turn. It returns the seconds that are left."""
+        if await self._end_game_if_over(connection, game) or game.get_color() != game.engine_color:
+            return time_left
+
+        start = time.perf_counter()
+        limit = draughts.engine.Limit(time=max(time_left, 0))
+        result = await asyncio.get_running_loop().run_in_executor(self.executor, self.search, game.pos.copy(), limit)
+        time_spent = time.perf_counter() - start
+        if isinstance(result, draughts.engine.PlayResult):
+            result = result.move
+        move = None
+        if result is not None:
+            move = next((legal_move for legal_move in game.pos.legal_moves()
+                         if legal_move.board_move == result.board_move), None)
+        if move is None:
+            logger.debug(f"The search didn't return a legal move: {result}")
+            await self._end_game(connection, game, I_LOSE)
+            return time_left
+
+        game.pos.push(move)
+        await connection.send(self.dxp.msg_move(move.steps_move, move.captures, int(time_spent)))
+        await self._end_game_if_over(connection, game)
+        return time_left - time_spent
+
+    async def _end_game_if_over(self, connection: AsyncDXPSocket, game: GameStatus) -> bool:
+        """Send GAMEEND if the game is over."""
+        if not game.pos.is_over():
+            return False
+        winner = game.pos.winner()
+        reason = DRAW
+        if winner == draughts.WHITE or winner == draughts.BLACK:
+            reason = I_WIN if (winner == draughts.WHITE) == (game.engine_color == DXP_WHITE) else I_LOSE
+        await self._end_game(connection, game, reason)
+        return True
+
+    async def _end_game(self, connection: AsyncDXPSocket, game: GameStatus, reason: str) -> None:
+        """Send GAMEEND and wait for the next GAMEREQ."""
+        game.started = False
+        self.games_played += 1
+        await connection.send(self.dxp.msg_gameend(reason))
@@ -1,6 +1,7 @@
 # This file is an adaptation of fishnet (https://github.com/lichess-org/fishnet/tree/ebd2a5e16d37135509cbfbff9998e0b798866ef5).
 
 import subprocess
+import asyncio
 import os
 import signal
 import logging
@@ -9,11 +10,91 @@ import draughts
 import draughts.engine
 import re
 import math
-from typing import Union, Optional, List, Tuple, Any, Dict, Set
+from typing import Union, Optional, List, Tuple, Any, Dict, Set, AsyncIterator
 
 logger = logging.getLogger("pydraughts")
 
 
+def _split_args(arg: str) -> List[List[str]]:
+    """Split the arguments of a Hub command into [key, value] pairs. The spaces inside quotes aren't split."""
+    args = re.split(r' +(?![^"]*"(?:(?:[^"]*"){2})*[^"]*$)', arg)
+    return list(map(lambda item: item.split("="), args))
+
+
+def _parse_hub_line(command: str, arg: str, engine_info: Dict[str, str], options: Set[str], variants: Set[str]) -> None:
+    """Add the information of a line the engine sent in response to hub."""
+    if command == "id":
+        for key, value in _split_args(arg):
+            engine_info[key] = value
+    elif command == "param":
+        is_variant = False
+        for key, value in _split_args(arg):
+            if key == "name":
+                options.add(value)
+                if value == "variant":
+                    is_variant = True
+            if key == "values" and is_variant:
+                if value.startswith('"') and value.endswith('"'):
+                    value = value[1:-1]
+                for variant in value.split():
+                    variants.add(variant)
+    else:
+        logger.warning("Unexpected engine response to hub: %s %s", command, arg)
+
+
+def _parse_info(arg: str, info: Dict[str, Any]) -> None:
+    """Add the values of an info line to `info`."""
+    value: Any
+    for key, value in _split_args(arg):
+        if key in ["depth", "nodes"]:
+            value = int(value)
+        elif key in ["mean-depth", "time", "nps"]:
+            value = float(value)
+        elif key == "score":
+            score = int(float(value) * 100)
+            mate = None
+            if score > 9000:
+                mate = 10000 - score
+            elif score < -9000:
+                mate = -10000 - score
+            if mate:
+                value = {"win": math.ceil(mate / 2)}
+            else:
+                value = {"cp": score}
+        info[key] = value
+
+
+def _parse_done(arg: str) -> Tuple[str, Optional[str]]:
+    """Get the best move and the ponder move from a done line."""
+    split_args = list(map(lambda item: item.split("="), arg.split()))
+    bestmove = split_args[0][1]
+    pondermove = split_args[1][1] if len(split_args) == 2 else None
+    return bestmove, pondermove
+
+
+def _level_command(my_time: Union[int, float, None] = None, inc: Union[int, float, None] = None,
+                   moves_left: Optional[int] = None, movetime: Union[int, float, None] = None,
+                   depth: Optional[int] = None, nodes: Optional[int] = None) -> Optional[str]:
+    """Get the level command for the search limits."""
+    if my_time is not None and inc and moves_left:
+        my_time -= inc  # Hub engines first add the increment
+        return f'level moves={moves_left} time={my_time} inc={inc}'
+    elif my_time is not None and inc:
+        my_time -= inc  # Hub engines first add the increment
+        return f'level time={my_time} inc={inc}'
+    elif my_time is not None and moves_left:
+        return f'level moves={moves_left} time={my_time}'
+    elif my_time is not None:
+        return f'level time={my_time}'
+    elif movetime is not None:
+        return f'level move-time={movetime}'
+    elif depth is not None:
+        return f'level depth={depth}'
+    elif nodes is not None:
+        return f'level nodes={nodes}'
+    return None
+
+
 class HubEngine:
     def __init__(self, command: Union[List[str], str], cwd: Optional[str] = None, ENGINE: int = 5) -> None:
         self.ENGINE = ENGINE
@@ -117,27 +198,7 @@ class HubEngine:
 
             if command == "wait":
                 return engine_info, options, variants
-            elif command == "id":
-                args = re.split(r' +(?![^"]*"(?:(?:[^"]*"){2})*[^"]*$)', arg)
-                split_args = list(map(lambda item: item.split("="), args))
-                for key, value in split_args:
-                    engine_info[key] = value
-            elif command == "param":
-                args = re.split(r' +(?![^"]*"(?:(?:[^"]*"){2})*[^"]*$)', arg)
-                split_args = list(map(lambda item: item.split("="), args))
-                is_variant = False
-                for key, value in split_args:
-                    if key == "name":
-                        options.add(value)
-                        if value == "variant":
-                            is_variant = True
-                    if key == "values" and is_variant:
-                        if value.startswith('"') and value.endswith('"'):
-                            value = value[1:-1]
-                        for variant in value.split():
-                            variants.add(variant)
-            else:
-                logger.warning("Unexpected engine response to hub: %s %s", command, arg)
+            _parse_hub_line(command, arg, engine_info, options, variants)
             self.options = options
             self.variants = variants
             self.id = engine_info
@@ -164,6 +225,20 @@ class HubEngine:
             else:
                 logger.warning("Unexpected engine response to ping: %s %s", command, arg)
 
+    def is_alive(self) -> bool:
+        """Get if the engine process is running and answers ping."""
+        if self.p.poll() is not None:
+            return False
+        try:
+            self.ping()
+        except (EOFError, OSError):
+            return False
+        return True
+
+    def new_game(self) -> None:
+        """Tell the engine that a new game starts."""
+        self.send("new-game")
+
     def setoption(self, name: str, value: Union[str, bool, None]) -> None:
         """Set an engine option."""
         if value is True:
@@ -191,22 +266,9 @@ class HubEngine:
         else:
             self.send(f'pos pos={fen}')
 
-        if my_time is not None and inc and moves_left:
-            my_time -= inc  # Hub engines first add the increment
-            self.send(f'level moves={moves_left} time={my_time} inc={inc}')
-        elif my_time is not None and inc:
-            my_time -= inc  # Hub engines first add the increment
-            self.send(f'level time={my_time} inc={inc}')
-        elif my_time is not None and moves_left:
-            self.send(f'level moves={moves_left} time={my_time}')
-        elif my_time is not None:
-            self.send(f'level time={my_time}')
-        elif movetime is not None:
-            self.send(f'level move-time={movetime}')
-        elif depth is not None:
-            self.send(f'level depth={depth}')
-        elif nodes is not None:
-            self.send(f'level nodes={nodes}')
+        level_command = _level_command(my_time, inc, moves_left, movetime, depth, nodes)
+        if level_command:
+            self.send(level_command)
 
         if ponder:
             self.send('go ponder')
@@ -217,34 +279,9 @@ class HubEngine:
         while True:
             command, arg = self.recv_hub()
             if command == "done":
-                args = arg.split()
-                pondermove = None
-                split_args = list(map(lambda item: item.split("="), args))
-                bestmove = split_args[0][1]
-                if len(split_args) == 2:
-                    pondermove = split_args[1][1]
-                return bestmove, pondermove
+                return _parse_done(arg)
             elif command == "info":
-                args = re.split(r' +(?![^"]*"(?:(?:[^"]*"){2})*[^"]*$)', arg)
-                split_args = list(map(lambda item: item.split("="), args))
-                value: Any
-                for key, value in split_args:
-                    if key in ["depth", "nodes"]:
-                        value = int(value)
-                    elif key in ["mean-depth", "time", "nps"]:
-                        value = float(value)
-                    elif key == "score":
-                        score = int(float(value) * 100)
-                        mate = None
-                        if score > 9000:
-                            mate = 10000 - score
-                        elif score < -9000:
-                            mate = -10000 - score
-                        if mate:
-                            value = {"win": math.ceil(mate / 2)}
-                        else:
-                            value = {"cp": score}
-                    self.info[key] = value
+                _parse_info(arg, self.info)
             else:
                 logger.warning("Unexpected engine response to go: %s %s", command, arg)
 
@@ -279,3 +316,262 @@ class HubEngine:
             ponder_move = draughts.Move(ponder_board, hub_move=pondermove)
 
         return draughts.engine.PlayResult(best_move, ponder_move, self.info)
+
+
+class AsyncHubEngine:
+    """
+    A Hub engine driven by asyncio, so one event loop can run many engines. Create it with
+    `await AsyncHubEngine.open(command)`, which also sends the hub command.
+    """
+    def __init__(self, process: asyncio.subprocess.Process, ENGINE: int = 5) -> None:
+        self.ENGINE = ENGINE
+        self.p = process
+        self.info: Dict[str, Any] = {}
+        self.id: Dict[str, str] = {}
+        self.options: Set[str] = set()
+        self.variants: Set[str] = set()
+        # The best move and the ponder move of the last search.
+        self.result: Optional[Tuple[str, Optional[str]]] = None
+        # Set while the engine is pondering, so ponder-hit waits for go ponder without busy-waiting.
+        self._pondering = asyncio.Event()
+        # Whether go was sent and the engine hasn't sent done yet.
+        self._searching = False
+        # The seconds to wait for done after a cancelled search is stopped.
+        self.stop_timeout = 10.0
+
+    @classmethod
+    async def open(cls, command: Union[List[str], str], cwd: Optional[str] = None, ENGINE: int = 5
+                   ) -> 'AsyncHubEngine':
+        """Start the engine process and send the hub command."""
+        cwd = cwd or os.getcwd()
+        cwd = os.path.realpath(os.path.expanduser(cwd))
+        if type(command) == str:
+            command = [command]
+        command = list(filter(bool, command))
+        command[0] = os.path.realpath(os.path.expanduser(command[0]))
+
+        kwargs: Dict[str, Any] = {}
+        # Prevent signal propagation from parent process
+        if hasattr(subprocess, "CREATE_NEW_PROCESS_GROUP"):
+            # Windows
+            kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP
+        else:
+            # Unix
+            kwargs["start_new_session"] = True
+        process = await asyncio.create_subprocess_exec(*command, cwd=cwd, stdin=asyncio.subprocess.PIPE,
+                                                       stdout=asyncio.subprocess.PIPE,
+                                                       stderr=asyncio.subprocess.STDOUT, **kwargs)
+        engine = cls(process, ENGINE)
+        await engine.hub()
+        return engine
+
+    async def kill_process(self) -> None:
+        """Kill the engine process."""
+        try:
+            # Windows
+            self.p.send_signal(signal.CTRL_BREAK_EVENT)
+        except AttributeError:
+            # Unix
+            os.killpg(self.p.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+        await self.p.communicate()
+
+    async def send(self, line: str) -> None:
+        """Send a command to the engine."""
+        if line == "ponder-hit":
+            await self._pondering.wait()
+        logger.debug(f"{self.ENGINE} %s << %s {self.p.pid} {line}")
+
+        assert self.p.stdin is not None
+        self.p.stdin.write((line + "\n").encode())
+        await self.p.stdin.drain()
+        if line == "go ponder":
+            self._pondering.set()
+        else:
+            self._pondering.clear()
+
+    async def recv(self) -> str:
+        """Receive a line from the engine."""
+        assert self.p.stdout is not None
+        while True:
+            line = (await self.p.stdout.readline()).decode()
+            if line == "":
+                raise EOFError()
+
+            line = line.rstrip()
+
+            logger.debug(f"{self.ENGINE} %s >> %s {self.p.pid} {line}")
+
+            if line:
+                return line
+
+    async def recv_hub(self) -> List[str]:
+        """Receive a line from the engine and split at the first space."""
+        command_and_args = (await self.recv()).split(None, 1)
+        if len(command_and_args) == 1:
+            return [command_and_args[0], ""]
+        elif len(command_and_args) == 2:
+            return command_and_args
+        return []
+
+    async def hub(self) -> Tuple[Dict[str, str], Set[str], Set[str]]:
+        """Send the hub command to an engine."""
+        await self.send("hub")
+
+        engine_info: Dict[str, str] = {}
+        options: Set[str] = set()
+        variants: Set[str] = set()
+
+        while True:
+            command, arg = await self.recv_hub()
+
+            if command == "wait":
+                return engine_info, options, variants
+            _parse_hub_line(command, arg, engine_info, options, variants)
+            self.options = options
+            self.variants = variants
+            self.id = engine_info
+
+    async def init(self) -> None:
+        """Initialize the engine."""
+        await self.send("init")
+        while True:
+            command, arg = await self.recv_hub()
+            if command == "ready":
+                break
+            elif command == "init":
+                pass
+            else:
+                logger.warning("Unexpected engine response to init: %s %s", command, arg)
+
+    async def ping(self) -> None:
+        """Send the engine ping. They should reply with pong."""
+        await self.send("ping")
+        while True:
+            command, arg = await self.recv_hub()
+            if command == "pong":
+                break
+            else:
+                logger.warning("Unexpected engine response to ping: %s %s", command, arg)
+
+    async def new_game(self) -> None:
+        """Tell the engine that a new game starts."""
+        await self.send("new-game")
+
+    async def setoption(self, name: str, value: Union[str, bool, None]) -> None:
+        """Set an engine option."""
+        if value is True:
+            value = "true"
+        elif value is False:
+            value = "false"
+        elif value is None:
+            value = "none"
+
+        if name == 'variant' and self.variants or name != 'variant':
+            await self.send("set-param name=%s value=%s" % (name, value))
+
+    async def configure(self, options: Dict[str, Union[str, bool, None]]) -> None:
+        """Configure many options at once."""
+        for name, value in options.items():
+            await self.setoption(name, value)
+
+    async def analysis(self, fen: str, moves: Optional[str] = None, my_time: Union[int, float, None] = None,
+                       inc: Union[int, float, None] = None, moves_left: Optional[int] = None,
+                       movetime: Union[int, float, None] = None, depth: Optional[int] = None,
+                       nodes: Optional[int] = None, ponder: Optional[bool] = False) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Send the engine a go command and yield the information of every info line. When the search ends, the best move
+        and the ponder move are saved in `result`. Call `stop` to end the search early.
+        """
+        self._searching = False
+        if moves:
+            await self.send(f'pos pos={fen} moves="{moves}"')
+        else:
+            await self.send(f'pos pos={fen}')
+
+        level_command = _level_command(my_time, inc, moves_left, movetime, depth, nodes)
+        if level_command:
+            await self.send(level_command)
+
+        self.info = {}
+        self.result = None
+        # send writes go before it waits, so the engine answers it even if the task is cancelled while sending.
+        self._searching = True
+        if ponder:
+            await self.send('go ponder')
+        else:
+            await self.send('go think')
+
+        while True:
+            command, arg = await self.recv_hub()
+            if command == "done":
+                self._searching = False
+                self.result = _parse_done(arg)
+                return
+            elif command == "info":
+                info: Dict[str, Any] = {}
+                _parse_info(arg, info)
+                self.info.update(info)
+                yield info
+            else:
+                logger.warning("Unexpected engine response to go: %s %s", command, arg)
+
+    async def go(self, fen: str, moves: Optional[str] = None, my_time: Union[int, float, None] = None,
+                 inc: Union[int, float, None] = None, moves_left: Optional[int] = None,
+                 movetime: Union[int, float, None] = None, depth: Optional[int] = None, nodes: Optional[int] = None,
+                 ponder: Optional[bool] = False) -> Tuple[str, Optional[str]]:
+        """
+        Send the engine a go command and wait for the best move. If the task is cancelled, the search is stopped and the
+        engine's answer is read, so the engine can be used again.
+        """
+        search = self.analysis(fen, moves, my_time, inc, moves_left, movetime, depth, nodes, ponder)
+        try:
+            async for _ in search:
+                pass
+        except asyncio.CancelledError:
+            # The engine only answers stop with done if go was sent.
+            if self._searching:
+                await self.stop()
+                try:
+                    await asyncio.wait_for(self._recv_done(), self.stop_timeout)
+                except asyncio.TimeoutError:
+                    logger.warning(f"The engine didn't send done in {self.stop_timeout} seconds after stop.")
+            raise
+        assert self.result is not None
+        return self.result
+
+    async def _recv_done(self) -> None:
+        """Read the lines of the engine until done."""
+        while (await self.recv_hub())[0] != "done":
+            pass
+        self._searching = False
+
+    async def stop(self) -> None:
+        """Stop the engine from searching."""
+        await self.send("stop")
+
+    async def ponderhit(self) -> None:
+        """Send ponder-hit to the engine."""
+        await self.send("ponder-hit")
+
+    async def quit(self) -> None:
+        """Quit the engine."""
+        await self.send("quit")
+
+    async def play(self, board: draughts.Board, time_limit: Any, ponder: bool) -> Any:
+        """Engine search."""
+        hub_moves = list(map(lambda move: move.hub_move, board.move_stack))
+        bestmove, pondermove = await self.go(board._game.initial_hub_fen, moves=' '.join(hub_moves),
+                                             my_time=time_limit.time, inc=time_limit.inc, depth=time_limit.depth,
+                                             nodes=time_limit.nodes, movetime=time_limit.movetime, ponder=ponder)
+
+        ponder_move = None
+        ponder_board = board.copy()
+        best_move = draughts.Move(ponder_board, hub_move=bestmove)
+        if pondermove:
+            ponder_board.push(best_move)
+            ponder_move = draughts.Move(ponder_board, hub_move=pondermove)
+
+        return draughts.engine.PlayResult(best_move, ponder_move, self.info)
@@ -0,0 +1,260 @@
+import logging
+import sys
+import threading
+import time
+import draughts
+import draughts.engine
+from draughts.engines.hub import _split_args
+from typing import Any, Callable, Dict, List, Optional, TextIO, Union
+
+logger = logging.getLogger("pydraughts")
+
+Search = Callable[[draughts.Board, 'draughts.engine.Limit', threading.Event, Callable[[Dict[str, Any]], None]],
+                  Union[draughts.Move, 'draughts.engine.PlayResult', None]]
+
+# The names of the variants in the Hub protocol and in pydraughts.
+HUB_VARIANTS = {'normal': 'standard', 'bt': 'breakthrough', 'frisian': 'frisian', 'losing': 'antidraughts'}
+
+
+class HubServer:
+    """
+    The engine side of the Hub protocol, so a search function can be used by Hub GUIs (and by HubEngine).
+    `search(board, limit, stop, info)` gets a copy of the board and the Limit of the level command. It must return soon
+    after the `stop` event is set, and it can send info lines by calling `info` with a dict (e.g. {'depth': 5, 'score':
+    25, 'nodes': 1000}, where the score is in centipieces). It returns the move, a PlayResult (to give a ponder move) or
+    None if there are no legal moves.
+    The search runs in its own thread, so stop and ponder-hit are handled while it searches. The server also sets
+    `stop` when the time for the move is used.
+    """
+    def __init__(self, search: Search, name: str = "pydraughts", version: str = draughts.__version__,
+                 params: Optional[Dict[str, Any]] = None, variants: Optional[List[str]] = None,
+                 input: TextIO = sys.stdin, output: TextIO = sys.stdout) -> None:
+        """
+        :param params: The parameters of the engine and their default values. Their types come from the default values.
+        `params` has their current values.
+        :param variants: The Hub names of the variants the search supports (normal, bt, frisian and losing).
+        """
+        self.search = search
+        self.name = name
+        self.version = version
+        self.params = dict(params or {})
+        self.variants = variants or ['normal']
+        self.variant = self.variants[0]
+        self.input = input
+        self.output = output
+        self.board = draughts.Board(HUB_VARIANTS[self.variant])
+        self.level: Dict[str, str] = {}
+        self.stop_event = threading.Event()
+        self.search_thread: Optional[threading.Thread] = None
+        self.pondering = False
+        # Notified when pondering ends or the search is stopped, so the search can send its move.
+        self._ponder_condition = threading.Condition()
+        self._output_lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+
+    def send(self, line: str) -> None:
+        """Send a line to the GUI."""
+        with self._output_lock:
+            logger.debug(f"hub server << {line}")
+            self.output.write(line + "\n")
+            self.output.flush()
+
+    def run(self) -> None:
+        """Handle the commands of the GUI until it sends quit or closes the input."""
+        for line in self.input:
+            line = line.strip()
+            logger.debug(f"hub server >> {line}")
+            command, _, arg = line.partition(" ")
+            if command == "quit":
+                break
+            self.handle(command, arg)
+        self.stop_search()
+
+    def handle(self, command: str, arg: str) -> None:
+        """Handle a command of the GUI."""
+        if command == "hub":
+            self.send(f"id name={self._quote(self.name)} version={self._quote(self.version)}")
+            self.send(f'param name=variant value={self.variant} type=enum values="{" ".join(self.variants)}"')
+            for name, value in self.params.items():
+                self.send(f"param name={name} {self._param_type(value)}")
+            self.send("wait")
+        elif command == "init":
+            self.send("ready")
+        elif command == "ping":
+            self.send("pong")
+        elif command == "new-game":
+            self.stop_search()
+        elif command == "set-param":
+            self._set_param(dict(_split_args(arg)))
+        elif command == "pos":
+            self.stop_search()
+            self.board = self._parse_position(dict(_split_args(arg)))
+        elif command == "level":
+            # e.g. `level time=60 inc=1`, `level move-time=5` or `level infinite`.
+            self.level = {}
+            for item in _split_args(arg) if arg else []:
+                self.level[item[0]] = item[1] if len(item) > 1 else ""
+        elif command == "go":
+            self.stop_search()
+            self.pondering = arg == "ponder"
+            self._start_search()
+        elif command == "ponder-hit":
+            if self.pondering:
+                with self._ponder_condition:
+                    self.pondering = False
+                    self._ponder_condition.notify_all()
+                self._start_timer()
+        elif command == "stop":
+            self._stop()
+        else:
+            logger.warning(f"Unknown Hub command: {command} {arg}")
+
+    def stop_search(self) -> None:
+        """Stop the search and wait until it sent its move."""
+        if self.search_thread is not None:
+            self._stop()
+            self.search_thread.join()
+            self.search_thread = None
+
+    def _stop(self) -> None:
+        """Set stop for the search."""
+        with self._ponder_condition:
+            self.stop_event.set()
+            self._ponder_condition.notify_all()
+
+    def limit(self) -> 'draughts.engine.Limit':
+        """Get the Limit of the last level command."""
+        def number(name: str) -> Optional[float]:
+            return float(self.level[name]) if name in self.level else None
+        depth = int(self.level["depth"]) if "depth" in self.level else None
+        nodes = int(self.level["nodes"]) if "nodes" in self.level else None
+        limit_time = number("time")
+        movetime = number("move-time")
+        if limit_time is None and depth is None and nodes is None and movetime is None:
+            # `level infinite` or no level: search until stop.
+            movetime = float("inf")
+        return draughts.engine.Limit(time=limit_time, inc=number("inc"), depth=depth, nodes=nodes, movetime=movetime)
+
+    def move_time(self) -> Optional[float]:
+        """Get the seconds the search can use for this move, or None if it isn't limited by time."""
+        limit = self.limit()
+        if limit.movetime is not None:
+            return limit.movetime if limit.movetime != float("inf") else None
+        if limit.time is not None:
+            # Hub engines add the increment before the move.
+            moves = int(self.level.get("moves", 30))
+            return (limit.time + (limit.inc or 0)) / max(min(moves, 30), 1)
+        return None
+
+    def _start_search(self) -> None:
+        """Start searching the current position in a new thread."""
+        self.stop_event = threading.Event()
+        board = self.board.copy()
+        limit = self.limit()
+        stop_event = self.stop_event
+        self.search_thread = threading.Thread(target=self._search, args=(board, limit, stop_event), daemon=True)
+        self.search_thread.start()
+        if not self.pondering:
+            self._start_timer()
+
+    def _start_timer(self) -> None:
+        """Set stop when the time for the move is used."""
+        move_time = self.move_time()
+        if move_time is not None:
+            self._timer = threading.Timer(move_time, self.stop_event.set)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _search(self, board: draughts.Board, limit: 'draughts.engine.Limit', stop_event: threading.Event) -> None:
+        """Run the search and send its move."""
+        start = time.perf_counter()
+        try:
+            result = self.search(board.copy(), limit, stop_event, self._send_info)
+        except Exception:
+            logger.exception("The search failed.")
+            result = None
+        # The GUI must get the move after ponder-hit or stop when the engine ponders.
+        with self._ponder_condition:
+            self._ponder_condition.wait_for(lambda: not self.pondering or stop_event.is_set())
+        if self._timer is not None:
+            self._timer.cancel()
+        logger.debug(f"Search finished in {time.perf_counter() - start:.3f} seconds.")
+        self.send(self._done_line(board, result))
+
+    @staticmethod
+    def _done_line(board: draughts.Board, result: Union[draughts.Move, 'draughts.engine.PlayResult', None]) -> str:
+        """Get the done line of the move the search returned."""
+        ponder_move = None
+        if isinstance(result, draughts.engine.PlayResult):
+            ponder_move = result.ponder
+            result = result.move
+        try:
+            move = draughts.Move(board, board_move=result.board_move)
+        except (AttributeError, ValueError):
+            # The GUI always needs a move, so the first legal move is sent if the search didn't return a legal move.
+            logger.debug(f"The search didn't return a legal move: {result}")
+            legal_moves = board.legal_moves()
+            return f"done move={legal_moves[0].hub_move if legal_moves else '0'}"
+        if ponder_move is None:
+            return f"done move={move.hub_move}"
+        board.push(move)
+        try:
+            ponder_move = draughts.Move(board, board_move=ponder_move.board_move)
+        except ValueError:
+            return f"done move={move.hub_move}"
+        return f"done move={move.hub_move} ponder={ponder_move.hub_move}"
+
+    def _send_info(self, info: Dict[str, Any]) -> None:
+        """Send an info line."""
+        values = []
+        for key, value in info.items():
+            if key == "score":
+                value = f"{value / 100:.2f}"
+            values.append(f"{key}={self._quote(str(value))}")
+        self.send(f"info {' '.join(values)}")
+
+    def _set_param(self, args: Dict[str, str]) -> None:
+        """Handle set-param."""
+        name = args.get("name", "")
+        value = args.get("value", "")
+        if name == "variant":
+            if value in self.variants:
+                self.variant = value
+            else:
+                logger.warning(f"Variant {value} isn't supported.")
+        elif name in self.params:
+            default = self.params[name]
+            if isinstance(default, bool):
+                self.params[name] = value == "true"
+            elif isinstance(default, int):
+                self.params[name] = int(value)
+            elif isinstance(default, float):
+                self.params[name] = float(value)
+            else:
+                self.params[name] = value.strip('"')
+        else:
+            logger.warning(f"Unknown parameter: {name}")
+
+    def _parse_position(self, args: Dict[str, str]) -> draughts.Board:
+        """Get the board of a pos command."""
+        variant = HUB_VARIANTS[self.variant]
+        board = draughts.Board(variant, args["pos"]) if "pos" in args else draughts.Board(variant)
+        for hub_move in args.get("moves", "").strip('"').split():
+            board.push(draughts.Move(board, hub_move=hub_move))
+        return board
+
+    @staticmethod
+    def _param_type(value: Any) -> str:
+        """Get the value and type of a param line."""
+        if isinstance(value, bool):
+            return f"value={str(value).lower()} type=bool"
+        if isinstance(value, int):
+            return f"value={value} type=int"
+        if isinstance(value, float):
+            return f"value={value} type=real"
+        return f"value={HubServer._quote(str(value))} type=string"
+
+    @staticmethod
+    def _quote(value: str) -> str:
+        """Quote a value that has spaces."""
+        return f'"{value}"' if " " in value else value
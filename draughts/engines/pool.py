@@ -0,0 +1,82 @@
+import threading
+import logging
+from draughts.engines.hub import HubEngine
+from draughts.engines.dxp import DXPEngine
+from draughts.engines.checkerboard import CheckerBoardEngine
+from typing import Callable, Dict, Hashable, List, Union
+
+logger = logging.getLogger("pydraughts")
+
+Engine = Union[HubEngine, DXPEngine, CheckerBoardEngine]
+
+
+class EnginePool:
+    """
+    Keep engines running between games, so they are only opened and configured once.
+    `open_engine(key)` opens and configures a new engine for the key (e.g. the index of a player). Engines that are given
+    back with `release` are checked before they are used again, and they are opened again if they crashed.
+    The pool can be used by many threads at once.
+    """
+    def __init__(self, open_engine: Callable[[Hashable], Engine]) -> None:
+        self.open_engine = open_engine
+        self._idle_engines: Dict[Hashable, List[Engine]] = {}
+        self._lock = threading.Lock()
+        self.opened = 0
+        self.reused = 0
+        self.restarted = 0
+
+    def acquire(self, key: Hashable) -> Engine:
+        """Get an engine for the key. It is told that a new game starts if it was used before."""
+        while True:
+            with self._lock:
+                idle_engines = self._idle_engines.get(key)
+                engine = idle_engines.pop() if idle_engines else None
+            if engine is None:
+                with self._lock:
+                    self.opened += 1
+                return self.open_engine(key)
+            if engine.is_alive():
+                engine.new_game()
+                with self._lock:
+                    self.reused += 1
+                return engine
+            logger.debug(f"Engine {key} crashed. Opening it again.")
+            self._close_engine(engine)
+            with self._lock:
+                self.restarted += 1
+
+    def release(self, key: Hashable, engine: Engine) -> None:
+        """Give back an engine after the game has ended. The game of a DXP engine is ended on its connection."""
+        if isinstance(engine, DXPEngine):
+            engine.end_game()
+        with self._lock:
+            self._idle_engines.setdefault(key, []).append(engine)
+
+    def close(self) -> None:
+        """Quit all the engines in the pool."""
+        with self._lock:
+            engines = [engine for idle_engines in self._idle_engines.values() for engine in idle_engines]
+            self._idle_engines = {}
+        for engine in engines:
+            self._close_engine(engine)
+
+    @staticmethod
+    def _close_engine(engine: Engine) -> None:
+        """Quit and kill the engine. Errors are ignored because the engine may have crashed."""
+        try:
+            if isinstance(engine, HubEngine):
+                engine.quit()
+            elif isinstance(engine, DXPEngine):
+                engine.end_game()
+        except Exception as err:
+            logger.debug(f"Error quitting the engine: {err}")
+        try:
+            engine.kill_process()
+        except Exception as err:
+            logger.debug(f"Error killing the engine: {err}")
+
+    def __enter__(self) -> 'EnginePool':
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
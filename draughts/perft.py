@@ -0,0 +1,152 @@
+"""
+Count the positions that can be reached from a position in a given number of moves (perft).
+It is used to check that the move generator is correct and to measure how fast it is.
+Run `python -m draughts.perft --help` for the command line options.
+"""
+
+from draughts.core.game import Game
+from draughts.core.variant import Board
+from draughts.convert import move_to_variant
+from typing import List, Dict, Tuple, Optional
+import argparse
+import sys
+import time
+
+# The positions used to check the move generator. For every variant there is a list of (fen, counts),
+# where counts[depth - 1] is the number of positions reached after `depth` moves.
+# The fens use the notation of each variant (e.g. english fens use the english square numbers).
+REFERENCE_POSITIONS: Dict[str, List[Tuple[str, List[int]]]] = {
+    'standard': [('startpos', [9, 81, 658, 4265, 27117]),
+                 ('W:W17,27,33,40,41,43,46,47,K3:B2,5,7,16,18', [19, 112, 722, 4022, 25581])],
+    'frisian': [('startpos', [9, 81, 658, 3880, 21345]),
+                ('B:W35,36,37,40,45,46,K1:B2,4,5,9,12,13,15,24,25,43', [15, 72, 349, 2360, 11536])],
+    'russian': [('startpos', [7, 49, 302, 1469, 7482]),
+                ('B:Wg3,h6,Kb8:Ba7,g7,f8,a3,Kc1', [9, 43, 291, 1534, 11163])],
+    'brazilian': [('startpos', [7, 49, 302, 1469, 7473]),
+                  ('B:Wg3,h6,Kb8:Ba7,g7,f8,a3,Kc1', [9, 41, 282, 1377, 10238])],
+    'english': [('startpos', [7, 49, 302, 1469, 7361]),
+                ('W:W12,25,28,30,K3:B9,21,K32', [6, 18, 116, 371, 2169])],
+    'italian': [('startpos', [7, 49, 302, 1469, 7361]),
+                ('W:W21,24,26,30,K3:B1,8,12,13,K32', [7, 36, 201, 1009, 5511])],
+    'turkish': [('startpos', [8, 64, 708, 7538, 85090]),
+                ('W:Wa2,b2,c2,d2,e2,f2,g2,h2,a3,b3,c3,d3,e3,f3,h3,Kg8:Bc5,a6,b6,d6,e6,f6,h6,a7,b7,c7,d7,e7,f7,h7',
+                 [22, 333, 4547, 65421])],
+    'antidraughts': [('startpos', [9, 81, 658, 4265, 27117]),
+                     ('W:W17,27,33,40,41,43,46,47,K3:B2,5,7,16,18', [19, 112, 722, 4022, 25581])],
+    'breakthrough': [('startpos', [9, 81, 658, 4265, 27117]),
+                     ('W:W17,27,33,40,41,43,46,47:B2,5,7,16,18', [13, 77, 457, 2619, 16725])],
+    'frysk!': [('startpos', [9, 81, 657, 5329, 41829]),
+               ('B:W31,36,K2:B6,22,35,K49', [12, 31, 146, 990, 6231])],
+}
+
+
+def new_game(variant: str = 'standard', fen: str = 'startpos', backend: str = 'pieces') -> Game:
+    """Create a game from a fen in the variant's notation."""
+    return Board(variant, fen, backend)._game
+
+
+def move_name(game: Game, move: List[List[int]], captures: List[Optional[int]]) -> str:
+    """Get the move in the variant's PDN notation."""
+    separator = 'x' if captures[0] is not None else '-'
+    squares = [move[0][0]] + [semi_move[1] for semi_move in move]
+    return move_to_variant(separator.join(map(str, squares)), variant=game.variant)
+
+
+def perft(game: Game, depth: int) -> int:
+    """Count the positions reached after `depth` moves. The game is returned to its original position."""
+    if depth == 0:
+        return 1
+    moves, _ = game.legal_moves()
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    for move in moves:
+        undo = game.make(move)
+        nodes += perft(game, depth - 1)
+        game.unmake(undo)
+    return nodes
+
+
+def divide(game: Game, depth: int) -> Dict[str, int]:
+    """Count the positions reached after `depth` moves separately for every legal move."""
+    moves, captures = game.legal_moves()
+    nodes = {}
+    for move, move_captures in zip(moves, captures):
+        undo = game.make(move)
+        nodes[move_name(game, move, move_captures)] = perft(game, depth - 1)
+        game.unmake(undo)
+    return nodes
+
+
+def timed_perft(game: Game, depth: int) -> Tuple[int, float]:
+    """Get the perft count and the time it took in seconds."""
+    start = time.perf_counter()
+    nodes = perft(game, depth)
+    return nodes, time.perf_counter() - start
+
+
+def check_reference_positions(variants: Optional[List[str]] = None, max_depth: Optional[int] = None,
+                              backend: str = 'pieces') -> List[Tuple[str, str, int, int, int, float]]:
+    """
+    Run perft on the reference positions.
+    It returns (variant, fen, depth, expected nodes, nodes, seconds) for the deepest depth of every position.
+    """
+    results = []
+    for variant, positions in REFERENCE_POSITIONS.items():
+        if variants and variant not in variants:
+            continue
+        for fen, counts in positions:
+            depth = len(counts) if max_depth is None else min(len(counts), max_depth)
+            nodes, seconds = timed_perft(new_game(variant, fen, backend), depth)
+            results.append((variant, fen, depth, counts[depth - 1], nodes, seconds))
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run perft from the command line."""
+    parser = argparse.ArgumentParser(description='Count the positions reached after a number of moves (perft).')
+    parser.add_argument('depth', type=int, nargs='?', default=None, help='the number of moves')
+    parser.add_argument('--variant', default=None, help='the variant (default: standard)')
+    parser.add_argument('--fen', default='startpos', help="the fen in the variant's notation (default: startpos)")
+    parser.add_argument('--backend', default='pieces', choices=['pieces', 'bitboard'],
+                        help='how the board is stored (default: pieces)')
+    parser.add_argument('--divide', action='store_true', help='show the count for every legal move')
+    parser.add_argument('--bench', action='store_true',
+                        help='check the reference positions of every variant (or only --variant if it is given)')
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        variants = [args.variant] if args.variant else None
+        total_nodes = 0
+        total_seconds = 0.
+        failed = False
+        for variant, fen, depth, expected, nodes, seconds in check_reference_positions(variants, args.depth,
+                                                                                        args.backend):
+            total_nodes += nodes
+            total_seconds += seconds
+            status = 'ok' if nodes == expected else f'FAILED (expected {expected})'
+            failed = failed or nodes != expected
+            print(f'{variant:<13}{fen[:50]:<52}depth {depth}  {nodes:>10} nodes  {nodes / max(seconds, 1e-9):>9.0f} nps  '
+                  f'{status}')
+        print(f'Total: {total_nodes} nodes in {total_seconds:.2f} s ({total_nodes / max(total_seconds, 1e-9):.0f} nps)')
+        return 1 if failed else 0
+
+    if args.depth is None:
+        parser.error('the depth is required unless --bench is used')
+    game = new_game(args.variant or 'standard', args.fen, args.backend)
+    start = time.perf_counter()
+    if args.divide:
+        counts = divide(game, args.depth)
+        for move, nodes in counts.items():
+            print(f'{move}: {nodes}')
+        nodes = sum(counts.values())
+    else:
+        nodes = perft(game, args.depth)
+    seconds = time.perf_counter() - start
+    print(f'Nodes: {nodes}')
+    print(f'Time: {seconds:.2f} s ({nodes / max(seconds, 1e-9):.0f} nps)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
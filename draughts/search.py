@@ -0,0 +1,283 @@
+"""
+Search for the best move with iterative-deepening alpha-beta, so positions can be analysed without an engine.
+It works on the Game of a Board, so every variant is supported. The evaluation only counts the material and how far the
+men have advanced, so the search is much weaker than a real engine.
+"""
+
+from draughts.convert import board_move_to_variant
+from draughts.core.game import Game
+from draughts.core.variant import Board, Move
+from draughts.engine import Limit, PlayResult
+from draughts import WHITE
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import threading
+import time
+
+# The score of a win in `ply` plies is WIN - ply. It matches the scores of Hub engines, where 100 is a man.
+WIN = 10000
+MAN_VALUE = 100
+KING_VALUE = 300
+ADVANCE_VALUE = 2
+MAX_DEPTH = 64
+
+# The flags of the scores in the transposition table.
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+MoveKey = Tuple[Tuple[int, int], ...]
+
+
+class _SearchStopped(Exception):
+    """Raised inside the search when a limit is reached."""
+
+
+def _move_key(move: List[List[int]]) -> MoveKey:
+    """Get a hashable key of a move."""
+    return tuple((step[0], step[1]) for step in move)
+
+
+def evaluate(game: Game) -> int:
+    """Get the score of the position for the side to move."""
+    board = game.board
+    last_row = board.height - 1
+    score = 0
+    for piece in board.searcher.uncaptured_pieces:
+        if piece.king:
+            value = KING_VALUE
+        else:
+            row = (piece.position - 1) // board.width
+            value = MAN_VALUE + ADVANCE_VALUE * (last_row - row if piece.player == WHITE else row)
+        score += value if piece.player == WHITE else -value
+    if game.variant == 'antidraughts':
+        # The player that loses all the pieces (or can't move) wins.
+        score = -score
+    return score if board.player_turn == WHITE else -score
+
+
+class Searcher:
+    """
+    Iterative-deepening alpha-beta with a transposition table, killer and history move ordering and a quiescence search
+    that plays the captures that are forced. The transposition table is kept between searches.
+    """
+    def __init__(self, hash_size: int = 1000000, evaluation: Callable[[Game], int] = evaluate) -> None:
+        """
+        :param hash_size: The number of positions kept in the transposition table.
+        :param evaluation: The function that gets the score of a position for the side to move.
+        """
+        self.hash_size = hash_size
+        self.evaluation = evaluation
+        self.table: Dict[int, Tuple[int, int, int, Optional[MoveKey]]] = {}
+        self.killers: List[List[MoveKey]] = []
+        self.history: Dict[MoveKey, int] = {}
+        self.nodes = 0
+        self._deadline = float('inf')
+        self._max_nodes: Optional[int] = None
+        self._stop: Optional[threading.Event] = None
+
+    def clear(self) -> None:
+        """Forget the positions searched before."""
+        self.table = {}
+        self.history = {}
+
+    def search(self, board: Board, limit: Limit, stop: Optional[threading.Event] = None,
+               info: Optional[Callable[[Dict[str, Any]], None]] = None) -> PlayResult:
+        """
+        Search the position until the limit is reached or `stop` is set. `info` is called with the result of every
+        depth. The arguments are the same as the ones of the search function of HubServer.
+        """
+        game = board._game.copy()
+        start = time.perf_counter()
+        self._deadline = start + self._time_for_move(limit)
+        self._max_nodes = limit.nodes
+        self._stop = stop
+        self.nodes = 0
+        self.killers = [[] for _ in range(MAX_DEPTH * 2)]
+        max_depth = min(limit.depth, MAX_DEPTH) if limit.depth is not None else MAX_DEPTH
+
+        moves, _ = game.legal_moves()
+        if not moves:
+            return PlayResult(None, None, {})
+        best_move = moves[0]
+        pv: List[Move] = []
+        search_info: Dict[str, Any] = {}
+        for depth in range(1, max_depth + 1):
+            try:
+                score, move = self._root(game, moves, depth, best_move)
+            except _SearchStopped:
+                break
+            best_move = move
+            elapsed = time.perf_counter() - start
+            pv = self._principal_variation(board, depth)
+            search_info = {'depth': depth, 'score': score, 'nodes': self.nodes, 'time': round(elapsed, 3),
+                           'nps': int(self.nodes / elapsed) if elapsed else 0,
+                           'pv': ' '.join(move.hub_move for move in pv)}
+            if info is not None:
+                info(search_info)
+            if len(moves) == 1 or abs(score) > WIN - MAX_DEPTH * 2:
+                # There is nothing to search or the result of the game is known.
+                break
+
+        # The table can have moves of the depth that wasn't finished, so the ponder move comes from the last depth.
+        result = Move(board, board_move=board_move_to_variant(best_move, board.variant))
+        ponder = pv[1] if len(pv) > 1 and pv[0].board_move == result.board_move else None
+        return PlayResult(result, ponder, search_info)
+
+    def _time_for_move(self, limit: Limit) -> float:
+        """Get the seconds the search can use."""
+        if limit.movetime is not None:
+            return limit.movetime
+        if limit.time is not None:
+            # Hub engines add the increment before the move.
+            inc = limit.inc or 0
+            return min((limit.time + inc) / 30 + inc, (limit.time + inc) / 2)
+        return float('inf')
+
+    def _check_limits(self) -> None:
+        """Stop the search if the time, the nodes or `stop` say so."""
+        if self._max_nodes is not None and self.nodes >= self._max_nodes:
+            raise _SearchStopped()
+        if self.nodes % 16 == 0:
+            if time.perf_counter() >= self._deadline or self._stop is not None and self._stop.is_set():
+                raise _SearchStopped()
+
+    def _root(self, game: Game, moves: List[List[List[int]]], depth: int, best_move: List[List[int]]
+              ) -> Tuple[int, List[List[int]]]:
+        """Search every move of the root position. The best move of the previous depth is searched first."""
+        moves = [best_move] + [move for move in moves if move != best_move]
+        alpha = -WIN - 1
+        for move in moves:
+            undo = game.make(move)
+            score = -self._alpha_beta(game, depth - 1, 1, -WIN - 1, -alpha)
+            game.unmake(undo)
+            if score > alpha:
+                alpha = score
+                best_move = move
+        self._store(game, depth, alpha, EXACT, _move_key(best_move))
+        return alpha, best_move
+
+    def _alpha_beta(self, game: Game, depth: int, ply: int, alpha: int, beta: int) -> int:
+        """Get the score of the position for the side to move, searching `depth` more plies."""
+        self.nodes += 1
+        self._check_limits()
+        if game.is_draw():
+            return 0
+        moves, captures = game.legal_moves()
+        if not moves or game.variant == 'breakthrough' and any(
+                piece.king for piece in game.board.searcher.uncaptured_pieces):
+            # In breakthrough the player that just moved won if there is a king. In antidraughts the player that can't
+            # move wins.
+            if game.variant == 'antidraughts' and not moves:
+                return WIN - ply
+            return -(WIN - ply)
+        if depth <= 0:
+            if captures[0][0] is None or ply >= MAX_DEPTH * 2 - 1:
+                return self.evaluation(game)
+            # Captures are forced, so the position isn't quiet: keep searching the captures.
+            depth = 0
+
+        position_hash = game.hash()
+        entry = self.table.get(position_hash)
+        table_move = None
+        if entry is not None:
+            entry_depth, entry_score, flag, table_move = entry
+            if entry_depth >= depth:
+                entry_score = self._score_from_table(entry_score, ply)
+                if (flag == EXACT or flag == LOWER_BOUND and entry_score >= beta or
+                        flag == UPPER_BOUND and entry_score <= alpha):
+                    return entry_score
+
+        original_alpha = alpha
+        best_score = -WIN - 1
+        best_move: Optional[MoveKey] = None
+        for move in self._order_moves(moves, captures, ply, table_move):
+            undo = game.make(move)
+            score = -self._alpha_beta(game, depth - 1, ply + 1, -beta, -alpha)
+            game.unmake(undo)
+            if score > best_score:
+                best_score = score
+                best_move = _move_key(move)
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                if captures[0][0] is None:
+                    self._add_killer(best_move, ply)
+                    self.history[best_move] = self.history.get(best_move, 0) + depth * depth
+                break
+
+        flag = EXACT
+        if best_score <= original_alpha:
+            flag = UPPER_BOUND
+        elif best_score >= beta:
+            flag = LOWER_BOUND
+        self._store(game, depth, self._score_to_table(best_score, ply), flag, best_move)
+        return best_score
+
+    def _order_moves(self, moves: List[List[List[int]]], captures: List[List[Optional[int]]], ply: int,
+                     table_move: Optional[MoveKey]) -> List[List[List[int]]]:
+        """Sort the moves so the best ones are probably searched first."""
+        killers = self.killers[ply]
+
+        def priority(index: int) -> int:
+            key = _move_key(moves[index])
+            if key == table_move:
+                return 1 << 30
+            if captures[index][0] is not None:
+                return len(captures[index]) << 20
+            if key in killers:
+                return (1 << 20) - killers.index(key)
+            return self.history.get(key, 0)
+
+        return [moves[index] for index in sorted(range(len(moves)), key=priority, reverse=True)]
+
+    def _add_killer(self, move: MoveKey, ply: int) -> None:
+        """Remember a quiet move that caused a cutoff."""
+        killers = self.killers[ply]
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[2:]
+
+    def _store(self, game: Game, depth: int, score: int, flag: int, move: Optional[MoveKey]) -> None:
+        """Add a position to the transposition table."""
+        if len(self.table) >= self.hash_size:
+            self.table = {}
+        self.table[game.hash()] = (depth, score, flag, move)
+
+    @staticmethod
+    def _score_to_table(score: int, ply: int) -> int:
+        """Store the wins as the plies from the position instead of from the root."""
+        if score > WIN - MAX_DEPTH * 2:
+            return score + ply
+        if score < -WIN + MAX_DEPTH * 2:
+            return score - ply
+        return score
+
+    @staticmethod
+    def _score_from_table(score: int, ply: int) -> int:
+        """Get the score of a win stored in the table from the root."""
+        if score > WIN - MAX_DEPTH * 2:
+            return score - ply
+        if score < -WIN + MAX_DEPTH * 2:
+            return score + ply
+        return score
+
+    def _principal_variation(self, board: Board, depth: int) -> List[Move]:
+        """Get the best moves found by the search from the transposition table."""
+        board = board.copy()
+        pv: List[Move] = []
+        seen = set()
+        while len(pv) < depth and board.hash() not in seen:
+            seen.add(board.hash())
+            entry = self.table.get(board.hash())
+            move = [list(step) for step in entry[3]] if entry is not None and entry[3] is not None else None
+            if move is None or move not in board._game.legal_moves()[0]:
+                break
+            pv.append(Move(board, board_move=board_move_to_variant(move, board.variant)))
+            board.push(pv[-1])
+        return pv
+
+
+def search(board: Board, limit: Limit, stop: Optional[threading.Event] = None,
+           info: Optional[Callable[[Dict[str, Any]], None]] = None) -> PlayResult:
+    """Search the position with a new Searcher."""
+    return Searcher().search(board, limit, stop, info)
@@ -1,9 +1,15 @@
-from draughts.engine import HubEngine, DXPEngine, CheckerBoardEngine, Limit
+from draughts.engine import HubEngine, DXPEngine, CheckerBoardEngine, EnginePool, Limit
 from draughts import Board, WHITE, BLACK
-from draughts.PDN import PDNWriter
-from typing import List, Tuple, Dict, Any, Union, Optional
+from draughts.PDN import PDNBatchWriter
+from draughts.ballots import Ballots
+from typing import List, Tuple, Dict, Any, Union, Optional, Deque
+import collections
+import concurrent.futures
 import datetime
 import itertools
+import json
+import math
+import os
 import time
 import logging
 
@@ -13,7 +19,18 @@ logger = logging.getLogger("pydraughts")
 class RoundRobin:
     def __init__(self, filename: str, players: List[Tuple[Union[str, List[str]], str, Dict[str, Any], Optional[str]]],
                  start_time: Union[int, float], increment: Union[int, float] = 0, variant: str = "standard",
-                 games_per_pair: int = 2, starting_fen: str = "startpos", max_moves: int = 300) -> None:
+                 games_per_pair: int = 2, starting_fen: str = "startpos", max_moves: int = 300,
+                 reuse_engines: bool = True, concurrency: int = 1, checkpoint_filename: Optional[str] = None,
+                 resume: bool = False) -> None:
+        """
+        :param reuse_engines: Keep the engines running between games instead of opening them again for every game.
+        :param concurrency: The number of games of a round that are played at the same time. The games are still
+        written to the PDN file in order. The engines must be able to run at the same time (e.g. DXP engines that use
+        the same port can't).
+        :param checkpoint_filename: The file where the state of the tournament is saved after every game.
+        :param resume: Continue the tournament saved in `checkpoint_filename` (if it exists) instead of starting a new
+        one. The games that were played are skipped, and games written to the PDN file after the checkpoint are removed.
+        """
         self.filename = filename
         self.players = players
         self.start_time = start_time
@@ -22,6 +39,12 @@ class RoundRobin:
         self.games_per_pair = games_per_pair
         self.starting_fen = starting_fen
         self.max_moves = max_moves
+        self.concurrency = concurrency
+        self.checkpoint_filename = checkpoint_filename
+        self.resume = resume
+        self.engine_pool = EnginePool(lambda player: self._open_engine(self.players[player])) if reuse_engines else None
+        # The PDN file is kept open while the tournament is played.
+        self._pdn_writer: Optional[PDNBatchWriter] = None
         self.player_count = len(self.players)
         self.int_players = list(range(self.player_count))
         self.results = [[0, 0, 0] for _ in range(self.player_count)]
@@ -45,6 +68,8 @@ class RoundRobin:
 
         self.latest_round_results: List[Tuple[Tuple[int, int, int], Tuple[int, int, int]]] = []
         self.latest_complete_results: List[List[Tuple[Tuple[int, int, int], Tuple[int, int, int]]]] = []
+        # The results of the games of the current round that have been played.
+        self.round_results: List[Tuple[Tuple[int, int, int], Tuple[int, int, int]]] = []
 
     def get_complete_pairs(self) -> None:
         pairs = self.pairs.copy()
@@ -69,84 +94,189 @@ class RoundRobin:
             raise ValueError(f"There is no protocol `{protocol}`.")
         return engine
 
+    def _open_engine(self, player_info: Tuple[Union[str, List[str]], str, Dict[str, Any], Optional[str]]
+                     ) -> Union[HubEngine, DXPEngine, CheckerBoardEngine]:
+        """Open the engine of a player and get it ready to play."""
+        engine = self.get_engine(*player_info)
+        if isinstance(engine, HubEngine):
+            engine.init()
+        return engine
+
+    def _acquire_engine(self, player_info: Tuple[Union[str, List[str]], str, Dict[str, Any], Optional[str]]
+                        ) -> Union[HubEngine, DXPEngine, CheckerBoardEngine]:
+        """Get the engine of a player for a game."""
+        if self.engine_pool is None:
+            return self._open_engine(player_info)
+        return self.engine_pool.acquire(self.players.index(player_info))
+
+    def _release_engines(self, engines: List[Tuple[Tuple[Union[str, List[str]], str, Dict[str, Any], Optional[str]],
+                                                   Union[HubEngine, DXPEngine, CheckerBoardEngine]]]) -> None:
+        """End the game for the engines of the players. They are closed unless they are reused."""
+        for player_info, engine in engines:
+            if self.engine_pool is None and not isinstance(engine, CheckerBoardEngine):
+                engine.quit()
+        for player_info, engine in engines:
+            if self.engine_pool is None:
+                engine.kill_process()
+            else:
+                self.engine_pool.release(self.players.index(player_info), engine)
+
+    def close(self) -> None:
+        """Close the engines that are kept running between games and the PDN file."""
+        if self.engine_pool is not None:
+            self.engine_pool.close()
+        if self._pdn_writer is not None:
+            self._pdn_writer.close()
+            self._pdn_writer = None
+
     def play(self) -> List[int]:
-        while self.round < self.games_per_pair:
-            logger.debug(f"Playing round {self.round + 1}/{self.games_per_pair}")
-            self.play_round()
-            self.round += 1
+        if self.resume:
+            self.load_checkpoint()
+        try:
+            while self.round < self.games_per_pair:
+                logger.debug(f"Playing round {self.round + 1}/{self.games_per_pair}")
+                self.play_round()
+                self.round += 1
+                self.save_checkpoint()
+        finally:
+            self.close()
         for player in range(self.player_count):
             self.scores[player] = self.results[player][0] * 2 + self.results[player][1]
         return self.scores
 
     def play_round(self) -> None:
-        round_results = []
-        for game_number, match in enumerate(self.complete_pairs[self.round]):
-            logger.debug(f"Playing game {game_number+1}/{len(self.complete_pairs[self.round])} in {self.round+1}th round.")
-            result1, result2 = self.play_game(self.players[match[0]], self.players[match[1]], game_number+1)
-            round_results.append((result1, result2))
-            # Player 1
-            self.results[match[0]][0] += result1[0]
-            self.results[match[0]][1] += result1[1]
-            self.results[match[0]][2] += result1[2]
-
-            # Player 2
-            self.results[match[1]][0] += result2[0]
-            self.results[match[1]][1] += result2[1]
-            self.results[match[1]][2] += result2[2]
-            self.latest_round_results = round_results.copy()
-            logger.debug(f"Round results until now: {self.latest_round_results}")
+        round_results = self.round_results
+        # The games that were played before the tournament was resumed are skipped.
+        games_played = len(round_results)
+        matches = self.complete_pairs[self.round][games_played:]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            # The games are played in the threads, and their results are recorded here in order.
+            futures = [executor.submit(self._play_game, self.players[match[0]], self.players[match[1]], game_number + 1)
+                       for game_number, match in enumerate(matches, games_played)]
+            try:
+                for match, future in zip(matches, futures):
+                    result1, result2 = self._record_game(*future.result())
+                    self._add_results(round_results, match, result1, result2)
+                    self.save_checkpoint()
+            finally:
+                # Don't start the rest of the games if a game failed.
+                for future in futures:
+                    future.cancel()
         self.complete_results.append(round_results)
+        self.round_results = []
         self.latest_complete_results = self.complete_results.copy()
         logger.debug(f"Complete results until now: {self.latest_complete_results}")
 
+    def _checkpoint_state(self) -> Dict[str, Any]:
+        """Get the state of the tournament that is saved in the checkpoint."""
+        return {"players": [str(player[0]) for player in self.players], "round": self.round,
+                "event_date": self.tags["EventDate"], "results": self.results,
+                "complete_results": self.complete_results, "round_results": self.round_results,
+                "pdn_size": os.path.getsize(self.filename) if os.path.exists(self.filename) else 0}
+
+    def _load_checkpoint_state(self, state: Dict[str, Any]) -> None:
+        """Set the state of the tournament from the checkpoint."""
+        if state["players"] != [str(player[0]) for player in self.players]:
+            raise ValueError(f"The checkpoint `{self.checkpoint_filename}` is from a tournament with other players.")
+        self.round = state["round"]
+        self.tags["EventDate"] = state["event_date"]
+        self.results = state["results"]
+        self.complete_results = [_results_from_json(round_results) for round_results in state["complete_results"]]
+        self.round_results = _results_from_json(state["round_results"])
+        self.latest_round_results = self.round_results.copy()
+        self.latest_complete_results = self.complete_results.copy()
+        # Remove the games that were written to the PDN file after the checkpoint, because they will be played again.
+        if os.path.exists(self.filename) and os.path.getsize(self.filename) > state["pdn_size"]:
+            with open(self.filename, "r+b") as file:
+                file.truncate(state["pdn_size"])
+
+    def save_checkpoint(self) -> None:
+        """Save the state of the tournament to `checkpoint_filename`."""
+        if self.checkpoint_filename is None:
+            return
+        # The checkpoint is replaced at once, so it is never half written.
+        temporary_filename = f"{self.checkpoint_filename}.tmp"
+        with open(temporary_filename, "w") as file:
+            json.dump(self._checkpoint_state(), file)
+        os.replace(temporary_filename, self.checkpoint_filename)
+
+    def load_checkpoint(self) -> None:
+        """Continue the tournament saved in `checkpoint_filename`, if it exists."""
+        if self.checkpoint_filename is None or not os.path.exists(self.checkpoint_filename):
+            return
+        with open(self.checkpoint_filename) as file:
+            self._load_checkpoint_state(json.load(file))
+        logger.debug(f"Resuming round {self.round + 1} after {len(self.round_results)} games.")
+
+    def _add_results(self, round_results: List[Tuple[Tuple[int, int, int], Tuple[int, int, int]]],
+                     match: Tuple[int, int], result1: Tuple[int, int, int], result2: Tuple[int, int, int]) -> None:
+        """Add the result of a game to the results of the players."""
+        round_results.append((result1, result2))
+        # Player 1
+        self.results[match[0]][0] += result1[0]
+        self.results[match[0]][1] += result1[1]
+        self.results[match[0]][2] += result1[2]
+
+        # Player 2
+        self.results[match[1]][0] += result2[0]
+        self.results[match[1]][1] += result2[1]
+        self.results[match[1]][2] += result2[2]
+        self.latest_round_results = round_results.copy()
+        logger.debug(f"Round results until now: {self.latest_round_results}")
+
     def play_game(self, player_1_info: Tuple[Union[str, List[str]], str, Dict[str, Any]],
                   player_2_info: Tuple[Union[str, List[str]], str, Dict[str, Any]], game_number: int
                   ) -> Tuple[Tuple[int, int, int], Tuple[int, int, int]]:
+        return self._record_game(*self._play_game(player_1_info, player_2_info, game_number))
+
+    def _play_game(self, player_1_info: Tuple[Union[str, List[str]], str, Dict[str, Any]],
+                   player_2_info: Tuple[Union[str, List[str]], str, Dict[str, Any]], game_number: int,
+                   starting_fen: Optional[str] = None) -> Tuple[Board, Dict[str, str], str]:
+        """Play a game. It returns the board, the PDN tags and the result."""
+        if starting_fen is None:
+            starting_fen = self.starting_fen
+        logger.debug(f"Playing game {game_number}/{len(self.complete_pairs[self.round])} in {self.round + 1}th round.")
         logger.debug(f"Player 1: '{player_1_info[0]}', Player 2: '{player_2_info[0]}'")
-        board = Board(self.variant, self.starting_fen)
-        player_1 = self.get_engine(*player_1_info)
-        player_2 = self.get_engine(*player_2_info)
-        if isinstance(player_1, HubEngine):
-            player_1.init()
-        if isinstance(player_2, HubEngine):
-            player_2.init()
-        player_1_limit = Limit(self.start_time, self.increment)
-        player_2_limit = Limit(self.start_time, self.increment)
-        max_moves = self.max_moves
-        if max_moves == 0:
-            max_moves = 10000
-        while not board.is_over() and len(board.move_stack) < max_moves:
-            logger.info(f'move: {len(board.move_stack)}')
-            if board.turn == WHITE:
-                start = time.perf_counter_ns()
-                if isinstance(player_1, HubEngine):
-                    best_move = player_1.play(board, player_1_limit, False)
-                elif isinstance(player_1, DXPEngine):
-                    best_move = player_1.play(board)
-                else:  # Checkerboard
-                    best_move = player_1.play(board, player_1_limit)
-                end = time.perf_counter_ns()
-                player_1_limit.time = player_1_limit.time - (end - start) / 1e9 + player_1_limit.inc
-            else:
-                start = time.perf_counter_ns()
-                if isinstance(player_2, HubEngine):
-                    best_move = player_2.play(board, player_2_limit, False)
-                elif isinstance(player_2, DXPEngine):
-                    best_move = player_2.play(board)
-                else:  # Checkerboard
-                    best_move = player_2.play(board, player_2_limit)
-                end = time.perf_counter_ns()
-                player_2_limit.time = player_2_limit.time - (end - start) / 1e9 + player_2_limit.inc
-            if best_move.move:
-                board.push(best_move.move)
-            else:
-                break
-        if not isinstance(player_1, CheckerBoardEngine):
-            player_1.quit()
-        if not isinstance(player_2, CheckerBoardEngine):
-            player_2.quit()
-        player_1.kill_process()
-        player_2.kill_process()
+        board = Board(self.variant, starting_fen)
+        player_1 = self._acquire_engine(player_1_info)
+        engines = [(player_1_info, player_1)]
+        # The engines are given back even if the game fails, so they aren't left running.
+        try:
+            player_2 = self._acquire_engine(player_2_info)
+            engines.append((player_2_info, player_2))
+            player_1_limit = Limit(self.start_time, self.increment)
+            player_2_limit = Limit(self.start_time, self.increment)
+            max_moves = self.max_moves
+            if max_moves == 0:
+                max_moves = 10000
+            while not board.is_over() and len(board.move_stack) < max_moves:
+                logger.info(f'move: {len(board.move_stack)}')
+                if board.turn == WHITE:
+                    start = time.perf_counter_ns()
+                    if isinstance(player_1, HubEngine):
+                        best_move = player_1.play(board, player_1_limit, False)
+                    elif isinstance(player_1, DXPEngine):
+                        best_move = player_1.play(board)
+                    else:  # Checkerboard
+                        best_move = player_1.play(board, player_1_limit)
+                    end = time.perf_counter_ns()
+                    player_1_limit.time = player_1_limit.time - (end - start) / 1e9 + player_1_limit.inc
+                else:
+                    start = time.perf_counter_ns()
+                    if isinstance(player_2, HubEngine):
+                        best_move = player_2.play(board, player_2_limit, False)
+                    elif isinstance(player_2, DXPEngine):
+                        best_move = player_2.play(board)
+                    else:  # Checkerboard
+                        best_move = player_2.play(board, player_2_limit)
+                    end = time.perf_counter_ns()
+                    player_2_limit.time = player_2_limit.time - (end - start) / 1e9 + player_2_limit.inc
+                if best_move.move:
+                    board.push(best_move.move)
+                else:
+                    break
+        finally:
+            self._release_engines(engines)
         winner = board.winner()
         game_ending = "1-1"
         if winner == WHITE:
@@ -154,8 +284,9 @@ class RoundRobin:
         elif winner == BLACK:
             game_ending = "0-2"
 
-        # Write PDN
         tags = self.tags.copy()
+        if starting_fen != "startpos":
+            tags["FEN"] = starting_fen
         tags["Result"] = game_ending
         tags["Round"] = f"{self.round + 1}.{game_number}"
         tags["White"] = str(player_1_info[0])
@@ -166,9 +297,17 @@ class RoundRobin:
         tags["Time"] = time_tag
         tags["UTCDate"] = utc_date_tag
         tags["UTCTime"] = utc_time_tag
-        PDNWriter(self.filename, board, tags=tags, game_ending=game_ending)
+        return board, tags, game_ending
 
-        # Return result
+    def _record_game(self, board: Board, tags: Dict[str, str], game_ending: str
+                     ) -> Tuple[Tuple[int, int, int], Tuple[int, int, int]]:
+        """Write the game to the PDN file and get the result of each player."""
+        if self._pdn_writer is None:
+            # Every game is written at once, so the size of the file in the checkpoint is right.
+            self._pdn_writer = PDNBatchWriter(self.filename, batch_size=1)
+        self._pdn_writer.add_game(board, tags=tags, game_ending=game_ending)
+
+        winner = board.winner()
         if winner == WHITE:  # Player 1 won
             logger.debug("Player 1 won")
             return (1, 0, 0), (0, 0, 1)
@@ -210,3 +349,170 @@ class RoundRobin:
         for place, engine in enumerate(standings):
             logger.debug(f"{place + 1}th place: {self.players[engine[1]][0]} with {engine[0]} points.")
             print(f"{place+1}th place: {self.players[engine[1]][0]} with {engine[0]} points.")
+
+
+class Match(RoundRobin):
+    """
+    Play game pairs between two engines until a sequential probability ratio test (SPRT) decides if the first engine is
+    stronger. Both games of a pair start from the same opening with the colours reversed.
+    The first engine is tested for the hypothesis H1 (it is `elo1` Elo stronger than the second engine) against H0 (it is
+    `elo0` Elo stronger). The test uses the pentanomial results of the pairs (the score of the first engine in a pair is
+    0, 0.5, 1, 1.5 or 2), which takes into account that both games of a pair start from the same opening.
+    """
+    def __init__(self, filename: str, players: List[Tuple[Union[str, List[str]], str, Dict[str, Any], Optional[str]]],
+                 start_time: Union[int, float], increment: Union[int, float] = 0, variant: str = "standard",
+                 ballots: Optional[Ballots] = None, elo0: float = 0, elo1: float = 5, alpha: float = .05,
+                 beta: float = .05, max_pairs: int = 1000, starting_fen: str = "startpos", max_moves: int = 300,
+                 reuse_engines: bool = True, concurrency: int = 1, checkpoint_filename: Optional[str] = None,
+                 resume: bool = False) -> None:
+        """
+        :param ballots: The openings of the game pairs. If it is None, all the games start from `starting_fen`.
+        :param elo0: The Elo difference of H0.
+        :param elo1: The Elo difference of H1.
+        :param alpha: The probability to accept H1 if H0 is true.
+        :param beta: The probability to accept H0 if H1 is true.
+        :param max_pairs: The match ends after this many game pairs even if the test hasn't decided.
+        :param concurrency: The number of game pairs that are played at the same time.
+        """
+        if len(players) != 2:
+            raise ValueError(f"A match is played by 2 players, not {len(players)}.")
+        super().__init__(filename, players, start_time, increment, variant, 2, starting_fen, max_moves, reuse_engines,
+                         concurrency, checkpoint_filename, resume)
+        self.tags["Event"] = "Match"
+        self.ballots = ballots
+        self.elo0 = elo0
+        self.elo1 = elo1
+        self.alpha = alpha
+        self.beta = beta
+        self.max_pairs = max_pairs
+        self.lower_bound = math.log(beta / (1 - alpha))
+        self.upper_bound = math.log((1 - beta) / alpha)
+        # How many pairs the first engine scored 0, 0.5, 1, 1.5 and 2 points in.
+        self.pentanomial = [0] * 5
+        # The ballots that are left after the openings of the recorded pairs.
+        self.ballot_keys = ballots.keys_to_use.copy() if ballots is not None else None
+
+    def play(self) -> List[int]:
+        """Play game pairs until the SPRT accepts H0 or H1, or `max_pairs` pairs have been played."""
+        if self.resume:
+            self.load_checkpoint()
+        pairs_started = sum(self.pentanomial)
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                # The pairs are played in the threads, and their results are recorded here in order, so the test stops
+                # at the same pair whatever the concurrency is.
+                futures: Deque[Tuple[concurrent.futures.Future, Optional[List[str]]]] = collections.deque()
+                try:
+                    while self.sprt_result() is None:
+                        while len(futures) < self.concurrency and pairs_started < self.max_pairs:
+                            fen = self.starting_fen
+                            ballot_keys = None
+                            if self.ballots is not None:
+                                fen = self.ballots.get_ballot()
+                                ballot_keys = self.ballots.keys_to_use.copy()
+                            futures.append((executor.submit(self._play_pair, fen), ballot_keys))
+                            pairs_started += 1
+                        if not futures:
+                            break
+                        future, ballot_keys = futures.popleft()
+                        self._record_pair(self.round_results, future.result())
+                        self.ballot_keys = ballot_keys
+                        self.save_checkpoint()
+                finally:
+                    # Don't start the pairs that aren't needed anymore.
+                    for future, _ in futures:
+                        future.cancel()
+        finally:
+            self.close()
+        self.complete_results.append(self.round_results)
+        self.latest_complete_results = self.complete_results.copy()
+        for player in range(self.player_count):
+            self.scores[player] = self.results[player][0] * 2 + self.results[player][1]
+        return self.scores
+
+    def _play_pair(self, fen: str) -> List[Tuple[Board, Dict[str, str], str]]:
+        """Play the two games of a pair from the same opening."""
+        return [self._play_game(self.players[0], self.players[1], 1, fen),
+                self._play_game(self.players[1], self.players[0], 2, fen)]
+
+    def _record_pair(self, pair_results: List[Tuple[Tuple[int, int, int], Tuple[int, int, int]]],
+                     games: List[Tuple[Board, Dict[str, str], str]]) -> None:
+        """Write the games of a pair to the PDN file and add their results to the statistics."""
+        pair = sum(self.pentanomial)
+        score = 0
+        for match, (board, tags, game_ending) in zip([(0, 1), (1, 0)], games):
+            tags["Round"] = f"{pair + 1}.{tags['Round'].split('.')[1]}"
+            result1, result2 = self._record_game(board, tags, game_ending)
+            self._add_results(pair_results, match, result1, result2)
+            first_engine_result = result1 if match[0] == 0 else result2
+            score += first_engine_result[0] * 2 + first_engine_result[1]
+        self.pentanomial[score] += 1
+        logger.debug(f"Pair {pair + 1}: W/D/L {self.results[0]}, pentanomial {self.pentanomial}, LLR {self.llr():.3f} "
+                     f"({self.lower_bound:.3f}, {self.upper_bound:.3f})")
+
+    def _checkpoint_state(self) -> Dict[str, Any]:
+        state = super()._checkpoint_state()
+        state["pentanomial"] = self.pentanomial
+        state["ballot_keys"] = self.ballot_keys
+        return state
+
+    def _load_checkpoint_state(self, state: Dict[str, Any]) -> None:
+        super()._load_checkpoint_state(state)
+        self.pentanomial = state["pentanomial"]
+        if self.ballots is not None and state["ballot_keys"] is not None:
+            # The openings of the pairs that weren't recorded are used again.
+            self.ballots.keys_to_use = state["ballot_keys"].copy()
+            self.ballot_keys = state["ballot_keys"]
+
+    def _score_statistics(self) -> Tuple[int, float, float]:
+        """Get the number of pairs and the mean and variance of the score per game of the first engine in a pair."""
+        pairs = sum(self.pentanomial)
+        # A very small count is added to each result, so the variance isn't 0 when all the pairs had the same result.
+        counts = [count + 1e-3 for count in self.pentanomial]
+        total = sum(counts)
+        scores = [0, .25, .5, .75, 1]
+        mean = sum(count * score for count, score in zip(counts, scores)) / total
+        variance = sum(count * (score - mean) ** 2 for count, score in zip(counts, scores)) / total
+        return pairs, mean, variance
+
+    def llr(self) -> float:
+        """Get the log-likelihood ratio of H1 against H0."""
+        pairs, mean, variance = self._score_statistics()
+        if pairs == 0:
+            return 0.
+        score0 = elo_to_score(self.elo0)
+        score1 = elo_to_score(self.elo1)
+        return pairs * (score1 - score0) * (2 * mean - score0 - score1) / (2 * variance)
+
+    def sprt_result(self) -> Optional[bool]:
+        """Get True if H1 is accepted, False if H0 is accepted and None if the test hasn't decided yet."""
+        llr = self.llr()
+        if llr >= self.upper_bound:
+            return True
+        if llr <= self.lower_bound:
+            return False
+        return None
+
+    def elo(self) -> Tuple[float, float]:
+        """Get the Elo difference between the engines and the error margin of its 95% confidence interval."""
+        pairs, mean, variance = self._score_statistics()
+        if pairs == 0:
+            return 0., math.inf
+        margin = 1.96 * math.sqrt(variance / pairs)
+        return score_to_elo(mean), (score_to_elo(mean + margin) - score_to_elo(mean - margin)) / 2
+
+
+def elo_to_score(elo: float) -> float:
+    """Get the expected score per game of an engine that is `elo` Elo stronger than its opponent."""
+    return 1 / (1 + 10 ** (-elo / 400))
+
+
+def score_to_elo(score: float) -> float:
+    """Get the Elo difference that gives the expected score per game."""
+    score = min(max(score, 1e-6), 1 - 1e-6)
+    return -400 * math.log10(1 / score - 1)
+
+
+def _results_from_json(results: List[List[List[int]]]) -> List[Tuple[Tuple[int, int, int], Tuple[int, int, int]]]:
+    """Get the results of the games from the lists they are saved as in the checkpoint."""
+    return [(tuple(result1), tuple(result2)) for result1, result2 in results]  # type: ignore
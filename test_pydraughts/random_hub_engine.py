@@ -0,0 +1,72 @@
+"""A Hub engine that plays random legal moves. It is used to test the code that runs engines."""
+import os
+import random
+import re
+import sys
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+from draughts import Board, Move  # noqa: E402
+from draughts.core.game import Game  # noqa: E402
+
+
+def main() -> None:
+    rng = random.Random(0)
+    # The seconds to wait before every move, to act like an engine that searches.
+    delay = 0.0
+    board = Board()
+    games = 0
+    # The answer to go ponder, which is sent after ponder-hit or stop.
+    pondering_done = ''
+    for line in sys.stdin:
+        command, _, arg = line.strip().partition(' ')
+        if command == 'hub':
+            print('id name=Random version=1.0')
+            print('param name=variant value=normal type=enum values="normal"')
+            print('param name=seed value=0 type=int min=0 max=1000000')
+            print('param name=delay value=0 type=real min=0 max=10')
+            print('wait')
+        elif command == 'init':
+            print('ready')
+        elif command == 'ping':
+            print('pong')
+        elif command == 'new-game':
+            games += 1
+        elif command == 'set-param':
+            values = dict(item.split('=') for item in arg.split())
+            if values['name'] == 'seed':
+                rng.seed(int(values['value']))
+            elif values['name'] == 'delay':
+                delay = float(values['value'])
+        elif command == 'pos':
+            fen = re.search(r'pos=(\S+)', arg).group(1)
+            moves = re.search(r'moves="([^"]*)"', arg)
+            board = Board('standard', Game('standard', fen).get_li_fen())
+            for move in moves.group(1).split() if moves else []:
+                board.push(Move(board, hub_move=move))
+        elif command == 'go':
+            time.sleep(delay)
+            move = Move(board, board_move=rng.choice(board.legal_moves()).board_move)
+            done = f'done move={move.hub_move}'
+            ponder_board = board.copy()
+            ponder_board.push(move)
+            if ponder_board.legal_moves():
+                ponder_move = Move(ponder_board, board_move=rng.choice(ponder_board.legal_moves()).board_move)
+                done += f' ponder={ponder_move.hub_move}'
+            print(f'info depth=1 score=0 nodes={games}')
+            # When pondering, the engine searches until it gets ponder-hit or stop.
+            if arg == 'ponder':
+                pondering_done = done
+            else:
+                print(done)
+        elif command in ['ponder-hit', 'stop']:
+            if pondering_done:
+                print(pondering_done)
+                pondering_done = ''
+        elif command == 'quit':
+            break
+        sys.stdout.flush()
+
+
+if __name__ == '__main__':
+    main()
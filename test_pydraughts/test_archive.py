@@ -0,0 +1,80 @@
+from draughts import Board, Move
+from draughts.PDN import PDNReader, PDNWriter
+from draughts.archive import ArchiveReader, ArchiveWriter, MOVE_ENCODINGS, archive_to_pdn, pdn_to_archive
+import random
+import os
+import pytest
+
+
+def random_boards():
+    random.seed(0)
+    boards = []
+    for variant in ['standard', 'russian', 'english', 'frisian', 'italian', 'turkish', 'brazilian', 'frysk!']:
+        for _ in range(3):
+            board = Board(variant)
+            while not board.is_over() and len(board.move_stack) < 60:
+                board.push(Move(board, board_move=random.choice(board.legal_moves()).board_move))
+            boards.append(board)
+    return boards
+
+
+def test_archive():
+    boards = random_boards()
+    for move_encoding in MOVE_ENCODINGS:
+        filename = f'archive_{move_encoding}.pdga'
+        if os.path.exists(filename):
+            os.remove(filename)
+        with ArchiveWriter(filename, move_encoding) as writer:
+            for board in boards[:10]:
+                writer.add_game(board, {'Event': 'Archive', 'Round': 1}, '1-1')
+        # Games are added to the end of an existing archive.
+        with ArchiveWriter(filename, move_encoding) as writer:
+            for board in boards[10:]:
+                writer.add_game(board, {'Event': 'Archive', 'Round': 1}, '1-1')
+
+        games = list(ArchiveReader(filename))
+        assert len(games) == len(boards)
+        for board, game in zip(boards, games):
+            assert game.variant == board.variant and game.starting_fen == board.initial_fen
+            assert game.tags == {'Event': 'Archive', 'Round': '1'} and game.game_ending == '1-1'
+            assert game.board_moves == [move.board_move for move in board.move_stack]
+            assert game.board().fen == board.fen
+            assert game.to_pdn() == PDNWriter('', board, tags={'Event': 'Archive', 'Round': '1'},
+                                              game_ending='1-1').pdn_text
+
+    # Moves that weren't built for the board are replayed to find their index.
+    board = Board('russian')
+    for _ in range(10):
+        board.push(Move(board_move=board.legal_moves()[-1].board_move, variant='russian'))
+    with ArchiveWriter('archive_replay.pdga') as writer:
+        writer.add_game(board)
+    game = list(ArchiveReader('archive_replay.pdga'))[-1]
+    assert game.board_moves == [move.board_move for move in board.move_stack]
+
+    with pytest.raises(ValueError):
+        ArchiveWriter('archive_index.pdga', 'pdn')
+    with open('archive_not_archive.pdga', 'w') as file:
+        file.write('[Event "Not an archive"]\n')
+    with pytest.raises(ValueError):
+        list(ArchiveReader('archive_not_archive.pdga'))
+    # Games aren't added to files that aren't archives.
+    with pytest.raises(ValueError):
+        ArchiveWriter('archive_not_archive.pdga')
+    with open('archive_not_archive.pdga') as file:
+        assert file.read() == '[Event "Not an archive"]\n'
+
+
+def test_archive_pdn_round_trip():
+    boards = [board for board in random_boards() if board.variant in ['standard', 'russian', 'turkish']]
+    for filename in ['archive_round_trip.pdn', 'archive_round_trip.pdga', 'archive_round_trip_2.pdn']:
+        if os.path.exists(filename):
+            os.remove(filename)
+    for board in boards:
+        PDNWriter('archive_round_trip.pdn', board, tags={'Event': 'Round trip'}, game_ending='2-0')
+
+    assert pdn_to_archive('archive_round_trip.pdn', 'archive_round_trip.pdga') == len(boards)
+    assert archive_to_pdn('archive_round_trip.pdga', 'archive_round_trip_2.pdn') == len(boards)
+    with open('archive_round_trip.pdn') as file, open('archive_round_trip_2.pdn') as file_2:
+        assert file.read() == file_2.read()
+    games = PDNReader(filename='archive_round_trip.pdn').games
+    assert [game.tags for game in ArchiveReader('archive_round_trip.pdga')] == [game.tags for game in games]
@@ -0,0 +1,79 @@
+import draughts
+from draughts.engine import AsyncHubEngine, Limit
+import asyncio
+import os
+import sys
+
+RANDOM_ENGINE = [sys.executable, os.path.join(os.path.dirname(os.path.realpath(__file__)), 'random_hub_engine.py')]
+
+
+def test_async_hub_engine():
+    async def run():
+        engine = await AsyncHubEngine.open(RANDOM_ENGINE)
+        assert engine.id == {'name': 'Random', 'version': '1.0'}
+        assert engine.options == {'variant', 'seed', 'delay'}
+        assert engine.variants == {'normal'}
+        await engine.configure({'seed': 2, 'variant': 'normal'})
+        await engine.init()
+        await engine.ping()
+
+        board = draughts.Board()
+        result = await engine.play(board, Limit(movetime=1), False)
+        assert result.move.board_move in [move.board_move for move in board.legal_moves()]
+        board.push(result.move)
+        assert result.ponder.board_move in [move.board_move for move in board.legal_moves()]
+        assert result.info == {'depth': 1, 'score': {'cp': 0}, 'nodes': 0}
+
+        # The info lines are streamed and stop ends the search.
+        infos = []
+        async for info in engine.analysis(board.fen, ponder=True):
+            infos.append(info)
+            await engine.stop()
+        assert [info['depth'] for info in infos] == [1] and engine.result is not None
+
+        # A cancelled search is stopped, and the engine can be used again.
+        task = asyncio.ensure_future(engine.go(board.fen, ponder=True))
+        await asyncio.sleep(.5)
+        task.cancel()
+        try:
+            await task
+            assert False
+        except asyncio.CancelledError:
+            pass
+        best_move, ponder_move = await engine.go(board.fen, depth=5)
+        assert best_move in [move.hub_move for move in board.legal_moves()]
+
+        # A search that is cancelled before go is sent doesn't wait for done.
+        send = engine.send
+
+        async def slow_send(line):
+            if line.startswith('pos'):
+                await asyncio.sleep(1)
+            await send(line)
+        engine.send = slow_send
+        task = asyncio.ensure_future(engine.go(board.fen, depth=5))
+        await asyncio.sleep(.1)
+        task.cancel()
+        try:
+            await asyncio.wait_for(task, 5)
+            assert False
+        except asyncio.CancelledError:
+            pass
+        engine.send = send
+        best_move, ponder_move = await engine.go(board.fen, depth=5)
+        assert best_move in [move.hub_move for move in board.legal_moves()]
+
+        await engine.quit()
+        await engine.kill_process()
+
+    async def run_many():
+        engines = await asyncio.gather(*[AsyncHubEngine.open(RANDOM_ENGINE) for _ in range(8)])
+        results = await asyncio.gather(*[engine.go(draughts.Board().fen, depth=5) for engine in engines])
+        assert all(best_move in [move.hub_move for move in draughts.Board().legal_moves()]
+                   for best_move, ponder_move in results)
+        for engine in engines:
+            await engine.quit()
+            await engine.kill_process()
+
+    asyncio.run(run())
+    asyncio.run(run_many())
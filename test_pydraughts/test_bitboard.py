@@ -0,0 +1,56 @@
+import random
+from draughts import Board
+from draughts.core.game import Game
+
+variants = ['standard', 'english', 'italian', 'russian', 'brazilian', 'turkish', 'frisian', 'frysk!', 'antidraughts',
+            'breakthrough']
+
+
+def test_bitboard_same_moves_as_pieces():
+    for variant in variants:
+        rng = random.Random(variant)
+        pieces_game = Game(variant)
+        bitboard_game = Game(variant, backend='bitboard')
+        for _ in range(40):
+            assert pieces_game.get_fen() == bitboard_game.get_fen()
+            legal_moves = pieces_game.legal_moves()
+            assert legal_moves == bitboard_game.legal_moves()
+            assert pieces_game.is_over() == bitboard_game.is_over()
+            assert pieces_game.board.get_pieces() == bitboard_game.board.get_pieces()
+            for player in [1, 2]:
+                for kings_only in [False, True]:
+                    assert (pieces_game.board.count_pieces(player, kings_only) ==
+                            bitboard_game.board.count_pieces(player, kings_only))
+            moves, _ = legal_moves
+            if not moves or pieces_game.is_over():
+                break
+            move = rng.choice(moves)
+            pieces_game.push(move)
+            bitboard_game.push(move)
+
+        pieces_game.pop()
+        bitboard_game.pop()
+        assert pieces_game.get_fen() == bitboard_game.get_fen()
+        assert pieces_game.legal_moves() == bitboard_game.legal_moves()
+
+
+def test_bitboard_positions():
+    fens = {'standard': 'W:WK46,28:B14,15,17,19,24,33,36', 'frisian': 'W:WK31,38:B13,17,19,22,24,28,33',
+            'turkish': 'W:WK1:B2,3,9,10,17,25', 'russian': 'W:W24:B19,20,28', 'italian': 'W:W27:BK31,23,30'}
+    for variant, fen in fens.items():
+        pieces_board = Board(variant, fen)
+        bitboard_board = Board(variant, fen, backend='bitboard')
+        assert bitboard_board._game.backend == 'bitboard'
+        assert ([move.pdn_move for move in pieces_board.legal_moves()] ==
+                [move.pdn_move for move in bitboard_board.legal_moves()])
+        assert pieces_board._game.copy_fast().get_fen() == bitboard_board._game.copy_fast().get_fen()
+
+    # Turkish kings can't jump over pieces when they aren't capturing.
+    assert Board('turkish', 'W:WK1:B2,3,9,10,17,25').legal_moves() == []
+    assert Board('turkish', 'W:WK1:B2,3,9,10,17,25', backend='bitboard').legal_moves() == []
+
+    try:
+        Game('standard', backend='bitboards')
+        assert False
+    except ValueError:
+        assert True
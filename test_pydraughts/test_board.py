@@ -1,5 +1,7 @@
+import random
 from draughts import Board
 from draughts.core.board import Board as InternalBoard
+from draughts.core.game import Game
 
 
 def test_board():
@@ -14,3 +16,50 @@ def test_board():
     game._game.get_possible_moves()
     game._game.board, _ = game._game.board.create_new_board_from_move([29, 18], 1, [])
     assert game._game.get_li_fen() == 'B:W18,31,32,34,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50:B1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,19,20'
+
+
+def test_incremental_searcher():
+    game = Game('standard', 'W:WK49,33,34,40:B38,24,18,K5,13')
+    board = game.board
+    king = board.searcher.get_piece_by_position(49)
+    assert king.get_possible_capture_moves([]) == [[49, 32], [49, 27], [49, 21], [49, 16]]
+    # The cached moves aren't used when the pieces captured in the multi-capture are different.
+    assert king.get_possible_capture_moves([27]) == [[49, 32]]
+
+    rng = random.Random(3)
+    for _ in range(30):
+        possible_moves = game.get_possible_moves()
+        if not possible_moves:
+            break
+        game.move(rng.choice(possible_moves))
+        fresh_board = InternalBoard('standard', game.get_fen())
+        fresh_board.player_turn = board.player_turn
+        assert board.searcher.filled_positions == [piece.position for piece in board.searcher.uncaptured_pieces]
+        assert board.searcher.open_positions == fresh_board.searcher.open_positions
+        assert board.searcher.player_positions == fresh_board.searcher.player_positions
+        for player in [1, 2]:
+            assert ([piece.position for piece in board.searcher.get_pieces_by_player(player)] ==
+                    [piece.position for piece in fresh_board.searcher.get_pieces_by_player(player)])
+            assert (board.count_movable_player_pieces(player, game._not_added_capture) ==
+                    fresh_board.count_movable_player_pieces(player, game._not_added_capture))
+
+
+def test_get_moves_in_place():
+    for backend in ['pieces', 'bitboard']:
+        game = Game('standard', 'W:WK46,38:B32,22,12,4', backend=backend)
+        board = game.board
+        fen = game.get_fen()
+        board_hash = board.hash()
+        moves, captures = game.get_moves()
+        assert len(moves) == len(captures) == 11
+        assert moves[:4] == [[[38, 27], [27, 18], [18, 7]], [[46, 28], [28, 17], [17, 8]],
+                             [[46, 28], [28, 17], [17, 3]], [[46, 28], [28, 11]]]
+        assert captures[:4] == [[32, 22, 12], [32, 22, 12], [32, 22, 12], [32, 22]]
+        assert game.board is board and game.get_fen() == fen and board.hash() == board_hash
+
+        # The capture sequences are found and undone in the middle of a multi-capture too.
+        game.move([46, 28])
+        assert game.get_moves() == ([[[28, 17], [17, 8]], [[28, 17], [17, 3]], [[28, 11]], [[28, 6]]],
+                                    [[22, 12], [22, 12], [22], [22]])
+        game.pop()
+        assert game.board is board and game.get_fen() == fen and game.get_moves() == (moves, captures)
@@ -21,3 +21,20 @@ def test_convert():
     assert _number_to_algebraic('a1-a2', variant='turkish') == 'a1-a2'
     assert _numeric_to_algebraic_square('32', width=4) == 'h8'
     assert _numeric_to_algebraic_square('h8', width=4) == 'h8'
+
+
+def test_convert_squares():
+    from draughts.convert import (square_to_variant, square_from_variant, square_to_algebraic, square_from_algebraic,
+                                  board_move_to_variant, board_move_from_variant)
+    assert square_to_variant(24, 'russian') == 12 and square_from_variant(12, 'russian') == 24
+    assert square_to_variant(24, 'standard') == 24 and square_to_variant(1, 'english') == 32
+    assert square_to_algebraic(12, 'russian') == 'g3' and square_from_algebraic('G3', 'russian') == 12
+    assert square_to_algebraic(9, 'turkish') == 'a2' and square_from_algebraic('a2', 'turkish') == 9
+    assert board_move_to_variant([[28, 19], [19, 10]], 'english') == [[5, 14], [14, 23]]
+    assert board_move_from_variant([[5, 14], [14, 23]], 'english') == [[28, 19], [19, 10]]
+    # Null moves.
+    assert board_move_from_variant([[0, 0]], 'standard') == [[0, 0]]
+    for variant in ['standard', 'english', 'russian', 'turkish']:
+        for square in range(1, 65 if variant == 'turkish' else 33):
+            assert square_from_variant(square_to_variant(square, variant), variant) == square
+            assert int(move_to_variant(str(square), variant, to_algebraic=False)) == square_to_variant(square, variant)
@@ -0,0 +1,225 @@
+from draughts import Board, Move
+from draughts.engine import DXPEngine
+from draughts.engines.dxp_communication.dxp_classes import AsyncDXPSocket, FrameBuffer, MySocket
+from draughts.engines.dxp_server import DXPServer, dxp_position_to_fen
+import asyncio
+import concurrent.futures
+import pytest
+import queue
+import random
+import socket
+import sys
+import threading
+import time
+
+
+class FakeSocket:
+    """A socket that gets the messages of the engine from a queue."""
+    def __init__(self):
+        self.messages = queue.Queue()
+        self.sent = []
+
+    def send(self, msg):
+        self.sent.append(msg)
+
+    def receive(self):
+        message = self.messages.get()
+        if message is None:
+            raise Exception("receive exception: socket connection broken")
+        return message
+
+    def close(self):
+        pass
+
+    def send_later(self, message, delay=.5):
+        threading.Timer(delay, self.messages.put, [message]).start()
+
+
+def test_dxp_receiver():
+    engine = DXPEngine()
+    socket = FakeSocket()
+    engine.sender.socket = socket
+    board = Board()
+    engine.sender.setup(board.initial_fen, board.variant)
+    engine.receiver.start()
+    engine.sender.gamereq('B', 2, 0)
+    engine.game_started = True
+
+    # Waiting for the engine doesn't use the CPU.
+    start = time.process_time()
+    socket.send_later('A' + 'Fake'.ljust(32) + '0')
+    assert engine._recv_accept() is True
+    board.push(Move(board, steps_move=[32, 28]))
+    socket.send_later('M0000192300')
+    assert engine.play(board).move.steps_move == [19, 23]
+    assert time.process_time() - start < .3
+    assert socket.sent[-1] == 'M0000322800'
+
+    board.push(Move(board, steps_move=[19, 23]))
+    board.push(Move(board, steps_move=[28, 19]))
+    engine.timeout = .2
+    with pytest.raises(TimeoutError):
+        engine.play(board)
+
+    # The engine ends the game instead of moving.
+    socket.send_later('E31', .1)
+    assert engine._recv_move() is None and engine.receiver.gameend_received
+    assert socket.sent[-1] == 'E31'
+
+    socket.messages.put(None)
+    engine.receiver.close()
+    assert not engine.receiver.listening
+
+
+def test_frame_buffer():
+    frames = FrameBuffer(max_length=20)
+    assert frames.feed(b'A') == []
+    assert frames.feed(b'0\0M00\0E') == ['A0', 'M00']
+    assert frames.feed(b'00\0') == ['E00']
+    assert frames.feed(b'C' * 25) == ['C' * 25] and frames.buffer == b''
+
+
+def test_my_socket():
+    my_socket = MySocket()
+    my_socket.sock, engine_socket = socket.socketpair()
+    my_socket.send('R01')
+    # Two messages and half of the third one arrive at once.
+    engine_socket.sendall(b'A0\0M0000192300\0E0')
+    assert engine_socket.recv(100) == b'R01\0'
+    assert my_socket.receive() == 'A0' and my_socket.receive() == 'M0000192300'
+    engine_socket.sendall(b'0\0')
+    assert my_socket.receive() == 'E00'
+    assert (my_socket.stats.messages_sent, my_socket.stats.messages_received) == (1, 3)
+    assert my_socket.stats.answers == 1 and my_socket.stats.bytes_received == 19
+
+    # The engine closes the connection too, so closing doesn't wait.
+    receive_thread = threading.Thread(target=lambda: pytest.raises(Exception, my_socket.receive))
+    receive_thread.start()
+    start = time.perf_counter()
+    threading.Timer(.1, engine_socket.close).start()
+    my_socket.close()
+    receive_thread.join()
+    assert time.perf_counter() - start < 2 and my_socket.sock is None
+
+
+def test_dxp_engine_new_game():
+    engine = DXPEngine()
+    engine.sender.socket.sock, engine_socket = socket.socketpair()
+    engine.receiver.start()
+    sender = engine.sender
+
+    # The connection of the previous game is closed, and the engine gets GAMEEND.
+    received = []
+
+    def receive_and_close():
+        received.append(engine_socket.recv(100))
+        engine_socket.close()
+    threading.Thread(target=receive_and_close).start()
+    engine.new_game()
+    assert received == [b'E01\0']
+    assert engine.sender is not sender and sender.socket.sock is None
+    assert not sender.receiver.receive_thread.is_alive()
+    engine.new_game()
+
+
+def test_dxp_engine_process():
+    # The engine quits when it gets SIGTERM, so it isn't waited for.
+    engine = DXPEngine([sys.executable, '-c', '"import time; time.sleep(60)"'], {'engine-opened': False})
+    assert engine.is_alive()
+    start = time.perf_counter()
+    engine.kill_process()
+    assert time.perf_counter() - start < 5 and not engine.is_alive()
+
+    # An engine that crashed isn't alive, and it can still be killed.
+    engine = DXPEngine([sys.executable, '-c', '"pass"'], {'engine-opened': False})
+    engine.p.wait()
+    assert not engine.is_alive()
+    engine.kill_process()
+
+
+def test_async_dxp_socket():
+    async def run():
+        async def handle(reader, writer):
+            connection = AsyncDXPSocket(reader, writer)
+            while True:
+                try:
+                    message = await connection.receive()
+                except ConnectionError:
+                    break
+                await connection.send(message.lower())
+            await connection.close()
+
+        server = await asyncio.start_server(handle, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        connections = await asyncio.gather(*[AsyncDXPSocket.connect('127.0.0.1', port) for _ in range(10)])
+        for number, connection in enumerate(connections):
+            await connection.send(f'C{number}')
+        assert await asyncio.gather(*[connection.receive() for connection in connections]) == [
+            f'c{number}' for number in range(10)]
+        for connection in connections:
+            assert connection.stats.answers == 1 and connection.stats.max_latency > 0
+            await connection.close()
+        server.close()
+        await server.wait_closed()
+
+    asyncio.run(run())
+
+
+def random_search(board, limit):
+    assert limit.time > 0
+    return random.choice(board.legal_moves())
+
+
+def start_dxp_server(search):
+    """Run a DXP server in a thread. It returns the server and its event loop."""
+    server = DXPServer(search, name='Random', port=0)
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+
+    def run():
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(server.start())
+        started.set()
+        loop.run_forever()
+
+    threading.Thread(target=run, daemon=True).start()
+    started.wait()
+    return server, loop
+
+
+def play_against_server(port, seed):
+    rng = random.Random(seed)
+    engine = DXPEngine(None, {'engine-opened': True, 'port': port, 'timeout': 10}, initial_time=120)
+    board = Board()
+    while not board.is_over():
+        result = engine.play(board)
+        if result.move is None:
+            break
+        board.push(Move(board, board_move=result.move.board_move))
+        if board.is_over():
+            break
+        board.push(rng.choice(board.legal_moves()))
+    engine.quit()
+    return engine, board
+
+
+def test_dxp_server():
+    random.seed(0)
+    server, loop = start_dxp_server(random_search)
+    fen = dxp_position_to_fen('z' * 20 + 'e' * 10 + 'w' * 19 + 'W', 'Z')
+    assert fen == f"B:W{','.join(map(str, range(31, 50)))},K50:B{','.join(map(str, range(1, 21)))}"
+    assert Board(fen=dxp_position_to_fen(Board()._game.get_dxp_fen(), 'W')).fen == Board().fen
+
+    engine, board = play_against_server(server.port, 0)
+    assert board.is_over() and engine.id['name'] == 'Random'
+    # The server checked the moves on its own board, so both boards are the same.
+    assert engine.sender.current.pos.fen == board.fen
+
+    # Many games are played at once.
+    with concurrent.futures.ThreadPoolExecutor(4) as executor:
+        games = list(executor.map(lambda seed: play_against_server(server.port, seed), range(4)))
+    assert all(board.is_over() for engine, board in games)
+    assert server.games_played == 5 and server.connections == 0
+
+    asyncio.run_coroutine_threadsafe(server.close(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
@@ -0,0 +1,76 @@
+from draughts import Board
+from draughts.engine import HubEngine, EnginePool, Limit
+from draughts.PDN import PDNReader
+from draughts.tournament import RoundRobin
+import os
+import pytest
+import sys
+
+RANDOM_ENGINE = [sys.executable, os.path.join(os.path.dirname(os.path.realpath(__file__)), 'random_hub_engine.py')]
+
+
+def open_engine(key):
+    engine = HubEngine(RANDOM_ENGINE)
+    engine.init()
+    return engine
+
+
+def test_engine_pool():
+    with EnginePool(open_engine) as pool:
+        engine = pool.acquire('random')
+        pool.release('random', engine)
+        # The same engine is used again, and it is told that a new game started.
+        reused_engine = pool.acquire('random')
+        assert reused_engine is engine
+        other_engine = pool.acquire('random')
+        assert other_engine is not engine
+        engine.play(Board(), Limit(movetime=1), False)
+        assert engine.info['nodes'] == 1
+        pool.release('random', engine)
+        pool.release('random', other_engine)
+        assert (pool.opened, pool.reused, pool.restarted) == (2, 1, 0)
+
+        # An engine that crashed isn't used again.
+        other_engine.kill_process()
+        assert pool.acquire('random') is engine
+        assert (pool.opened, pool.reused, pool.restarted) == (2, 2, 1)
+        new_engine = pool.acquire('random')
+        assert new_engine.is_alive() and pool.opened == 3
+        pool.release('random', engine)
+        pool.release('random', new_engine)
+    assert engine.p.poll() is not None and new_engine.p.poll() is not None
+
+
+def test_round_robin_reuses_engines():
+    if os.path.exists('engine_pool_tournament.pdn'):
+        os.remove('engine_pool_tournament.pdn')
+    players = [(RANDOM_ENGINE, 'hub', {'seed': 1}, None), (RANDOM_ENGINE, 'hub', {'seed': 2}, None)]
+    tournament = RoundRobin('engine_pool_tournament.pdn', players, 20, .2, games_per_pair=4, max_moves=20)
+    scores = tournament.play()
+    assert sum(scores) == 8
+    assert (tournament.engine_pool.opened, tournament.engine_pool.reused) == (2, 6)
+    assert len(PDNReader(filename='engine_pool_tournament.pdn').games) == 4
+
+
+def test_engines_are_released_when_a_game_fails(monkeypatch):
+    class Crash(Exception):
+        pass
+
+    def play(self, board, time_limit, ponder):
+        raise Crash()
+
+    engines = []
+    open_engine = RoundRobin._open_engine
+
+    def open_and_save_engine(self, player_info):
+        engines.append(open_engine(self, player_info))
+        return engines[-1]
+
+    players = [(RANDOM_ENGINE, 'hub', {'seed': 1}, None), (RANDOM_ENGINE, 'hub', {'seed': 2}, None)]
+    tournament = RoundRobin('engine_pool_tournament.pdn', players, 20, .2, max_moves=20)
+    monkeypatch.setattr(HubEngine, 'play', play)
+    monkeypatch.setattr(RoundRobin, '_open_engine', open_and_save_engine)
+    with pytest.raises(Crash):
+        tournament.play()
+    # The engines were given back to the pool, so they were closed with it.
+    assert len(engines) == 2 and all(engine.p.poll() is not None for engine in engines)
@@ -1,4 +1,6 @@
 from draughts import Board, Move, WHITE
+from draughts.core.game import Game
+import draughts.core.game as game_module
 
 
 def test_game():
@@ -224,3 +226,85 @@ def test_drawing_conditions():
     game._game.push([[31, 32]])
     game._game.push([[9, 10]])
     assert game.winner() == 0
+
+
+def test_make_unmake():
+    for backend in ['pieces', 'bitboard']:
+        game = Game('standard', 'W:WK46,38:B32,22,12,4', backend=backend)
+        fen = game.get_fen()
+        legal_moves = game.legal_moves()
+        board = game.board
+        for move in legal_moves[0]:
+            undo = game.make(move)
+            assert game.get_fen() != fen and len(game.move_stack) == 1
+            game.unmake(undo)
+            assert game.board is board
+            assert game.get_fen() == fen and game.legal_moves() == legal_moves
+            assert game.move_stack == [] and game.fens == [fen] and game.moves == []
+
+        # pop() undoes the moves without recreating the board.
+        game.make([[46, 28], [28, 17], [17, 8]])
+        game.push([[4, 10]])
+        assert game.moves_since_last_capture == 1
+        game.pop()
+        assert game.moves_since_last_capture == 0
+        game.pop()
+        assert game.board is board and game.get_fen() == fen
+
+        # A multi-capture that hasn't been completed.
+        game.move([46, 28])
+        game.move([28, 17])
+        game.pop()
+        assert game._not_added_move == [] and game.moves == [] and game.get_fen() == fen
+        assert game.legal_moves() == legal_moves
+
+
+def test_fens_and_undo_history(monkeypatch):
+    monkeypatch.setattr(game_module, 'UNDO_HISTORY_LENGTH', 4)
+    for backend in ['pieces', 'bitboard']:
+        game = Game('standard', 'W:WK46:BK1', backend=backend)
+        fens = [game.get_fen()]
+        for _ in range(5):
+            for move in [[[46, 37]], [[1, 7]], [[37, 46]], [[7, 1]]]:
+                game.push(move)
+                fens.append(game.get_fen())
+        assert game.fens == fens
+        assert game.fens is game.fens
+        # Only the undo data of the last moves is kept.
+        assert len(game._undo_stack) == 4
+        if backend == 'pieces':
+            assert len(game.board.undo_log) == 4
+
+        # The moves are undone with the undo data, and then by replaying the game.
+        for _ in range(6):
+            game.pop()
+            fens.pop()
+            assert game.fens == fens and game.get_fen() == fens[-1]
+        game.push([[37, 41]])
+        assert game.fens == fens + [game.get_fen()]
+
+        game.fens = ['fen']
+        assert game.fens == ['fen']
+
+
+def test_hash():
+    fen = 'W:WK45:BK2'
+    pieces_game = Game('standard', fen)
+    bitboard_game = Game('standard', fen, backend='bitboard')
+    assert pieces_game.hash() == bitboard_game.hash() == Board('standard', fen).hash()
+
+    for move in [[[45, 50]], [[2, 8]], [[50, 45]], [[8, 2]]]:
+        for game in [pieces_game, bitboard_game]:
+            game.push(move)
+        assert pieces_game.hash() == bitboard_game.hash() == Game('standard', pieces_game.get_fen()).hash()
+    assert pieces_game.hash() == pieces_game.hashes[0]
+    assert not pieces_game.is_threefold()
+
+    # Undoing and redoing the moves keeps the repetition counts correct.
+    undo = pieces_game.make([[45, 50]])
+    pieces_game.unmake(undo)
+    for move in [[[45, 50]], [[2, 8]], [[50, 45]], [[8, 2]]]:
+        pieces_game.push(move)
+    assert pieces_game.is_threefold()
+    pieces_game.pop()
+    assert not pieces_game.is_threefold()
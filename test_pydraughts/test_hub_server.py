@@ -0,0 +1,73 @@
+import draughts
+from draughts.engine import HubEngine, Limit
+import os
+import pytest
+import queue
+import sys
+import threading
+import time
+
+# A Hub engine made with HubServer. It plays the first legal move, and it searches until stop if the level is infinite.
+HUB_SERVER_ENGINE = '''
+import sys
+sys.path.insert(0, {path!r})
+from draughts.engine import PlayResult
+from draughts.engines.hub_server import HubServer
+
+
+def search(board, limit, stop, info):
+    if limit.movetime == float('inf'):
+        stop.wait()
+    info({{'depth': 1, 'score': 12, 'nodes': 20, 'pv': 'first moves'}})
+    move = board.legal_moves()[0]
+    board.push(move)
+    return PlayResult(move, board.legal_moves()[0], {{}})
+
+
+HubServer(search, name='First move', params={{'threads': 1, 'hash': 16.0, 'book': True, 'book-file': 'book.txt'}},
+          variants=['normal', 'frisian']).run()
+'''
+
+
+def test_hub_server(tmp_path):
+    script = tmp_path / 'hub_server_engine.py'
+    script.write_text(HUB_SERVER_ENGINE.format(path=os.path.dirname(os.path.dirname(os.path.realpath(__file__)))))
+    engine = HubEngine([sys.executable, str(script)])
+    assert engine.id == {'name': '"First move"', 'version': draughts.__version__}
+    assert engine.options == {'variant', 'threads', 'hash', 'book', 'book-file'}
+    assert engine.variants == {'normal', 'frisian'}
+    engine.configure({'threads': 2, 'book': False})
+    engine.init()
+
+    board = draughts.Board()
+    board.push(board.legal_moves()[0])
+    result = engine.play(board, Limit(time=10, inc=1), False)
+    assert result.move.board_move == board.legal_moves()[0].board_move
+    assert result.ponder is not None
+    assert result.info == {'depth': 1, 'score': {'cp': 12}, 'nodes': 20, 'pv': '"first moves"'}
+
+    # stop ends an infinite search at once.
+    engine.send(f'pos pos={board._game.initial_hub_fen} moves="{board.move_stack[0].hub_move}"')
+    engine.send('level infinite')
+    engine.send('go think')
+    time.sleep(.5)
+    start = time.perf_counter()
+    engine.stop()
+    while engine.recv_hub()[0] != 'done':
+        pass
+    assert time.perf_counter() - start < .5
+
+    # The engine doesn't send its move while it ponders, until ponder-hit.
+    engine.send('level move-time=0.3')
+    engine.send('go ponder')
+    assert engine.recv_hub()[0] == 'info'
+    # The next line is read in a thread, so the test can wait for it with a timeout.
+    lines = queue.Queue()
+    threading.Thread(target=lambda: lines.put(engine.recv_hub()), daemon=True).start()
+    with pytest.raises(queue.Empty):
+        lines.get(timeout=.5)
+    engine.ponderhit()
+    assert lines.get(timeout=5) == ['done', 'move=16-21 ponder=32-27']
+
+    engine.quit()
+    engine.kill_process()
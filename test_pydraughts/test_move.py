@@ -51,3 +51,50 @@ def test_standard_move():
     assert StandardMove(Game(), pdn_move='31-27').pdn_position_move == '3127'
     assert StandardMove(Game(fen='W:WK47:B14,19,29,31,42'), pdn_move='47x38x24x13x36').pdn_position_move == '4738241336'
     assert StandardMove(Game(fen='W:WK47:B14,19,29,31,42'), pdn_position_move='4738200936').pdn_move == '47x38x20x9x36'
+
+
+def test_lazy_move():
+    board = Board(fen='W:W42:B28,38')
+    move = board.legal_moves()[0]
+    assert '_move_types_to_convert' in move.__dict__ and 'pdn_move' not in move.__dict__
+    assert move.board_move == [[42, 33], [33, 22]] and move.captures == [38, 28] and move.has_captures
+
+    # The move can be copied before the other move types are found.
+    board.push(move)
+    assert board.copy().move_stack[0].pdn_move == '42x22'
+    assert move.ambiguous is False and move.li_one_move == '423322' and move.hub_move == '42x22x28x38'
+    assert '_move_types_to_convert' not in move.__dict__
+    try:
+        move.not_an_attribute
+        assert False
+    except AttributeError:
+        assert True
+
+
+def test_legal_moves_cache():
+    board = Board('standard', 'W:W32,33:B28')
+    legal_moves = board.legal_moves()
+    assert board.legal_moves_cache_misses == 1 and board.legal_moves_cache_hits == 0
+    move = Move(board, pdn_move='32x23')
+    assert Move(board, hub_move='32x23x28').board_move == move.board_move == legal_moves[0].board_move
+    assert board.legal_moves_cache_misses == 1 and board.legal_moves_cache_hits == 2
+
+    board.push(move)
+    assert board.legal_moves() == []
+    assert board.legal_moves_cache_misses == 2
+    board.pop()
+    assert [move.pdn_move for move in board.legal_moves()] == ['32x23', '33x22']
+    assert board.legal_moves_cache_misses == 3
+
+    # The cache isn't used if the position was changed directly.
+    board._game = Game('standard', 'W:W32,33:B27')
+    assert [move.pdn_move for move in board.legal_moves()] == ['32x21']
+    assert board.legal_moves_cache_misses == 4
+
+
+def test_legal_moves_are_not_replayed():
+    board = Board()
+    board.push(board.legal_moves()[0])
+    board.push(Move(board, pdn_move='20-25'))
+    board.push(Move(board=None, board_move=board.legal_moves()[0].board_move))
+    assert board._legal_move_stack == [True, True, False]
@@ -1,5 +1,5 @@
 from draughts import Move, Board
-from draughts.PDN import PDNReader, PDNWriter
+from draughts.PDN import PDNReader, PDNWriter, PDNDatabase, PDNBatchWriter, parse_pdn_parallel
 
 import requests
 import zipfile
@@ -92,3 +92,127 @@ def test_pdn_writing():
 
     correct_moves = '1... 20-25 *'
     assert moves == correct_moves
+
+
+def test_pdn_streaming():
+    files = os.listdir('./games/succeed')
+    for file in files:
+        filepath = os.path.realpath(f'./games/succeed/{file}')
+        games = PDNReader(filename=filepath).games
+        streamed_games = list(PDNReader.iter_games(filepath))
+        assert len(games) == len(streamed_games)
+        for game, streamed_game in zip(games, streamed_games):
+            assert game.tags == streamed_game.tags and game.moves == streamed_game.moves
+            assert game.game_ending == streamed_game.game_ending
+
+    pdn_text = ('[Event "1"]\n1. 32-28 19-23 2. 28x19 14x23 1-0\n[Event "2"]\n  1. 35-30 *\n\n[Event "3"]\n*\n\n'
+                '[Event "4"]\n\n 1. 33-29\n 20-24 2-0\n')
+    with open('pdn_streaming.pdn', 'w', encoding='ISO 8859/1') as file:
+        file.write('[Site "Caf\xe9"]\n' + pdn_text)
+    games = list(PDNReader.iter_games('pdn_streaming.pdn'))
+    assert [game.tags.get('Event') for game in games] == ['1', '2', '3', '4']
+    assert games[0].tags['Site'] == 'Caf\xe9'
+    assert [game.moves for game in games] == [['32-28', '19-23', '28x19', '14x23'], ['35-30'], [], ['33-29', '20-24']]
+    assert [game.game_ending for game in games] == ['1-0', '*', '*', '2-0']
+    # The games after a game without moves aren't lost.
+    assert [game.tags.get('Event') for game in PDNReader(pdn_text).games] == ['1', '2', '3', '4']
+
+
+def test_pdn_database():
+    files = os.listdir('./games/succeed')
+    for file in files:
+        filepath = os.path.realpath(f'./games/succeed/{file}')
+        games = PDNReader(filename=filepath).games
+        database = PDNDatabase(filepath, index_filename=f'./TEMP/{file}.index')
+        assert len(games) == len(database)
+        for game, database_game in zip(games, database):
+            assert game.tags == database_game.tags and game.moves == database_game.moves
+            assert game.game_ending == database_game.game_ending
+
+    pdn_text = ('[Event "1"]\r\n[White "A"]\r\n1. 32-28 19-23 2. 28x19 14x23 1-0\r\n[Event "2"]\r\n[White "B"]\r\n'
+                '  1. 35-30 *\r\n\r\n[Event "3"]\r\n[White "A"]\r\n1. 33-29 0-2\r\n')
+    with open('pdn_database.pdn', 'w', encoding='utf8', newline='') as file:
+        file.write(pdn_text)
+    database = PDNDatabase('pdn_database.pdn')
+    assert os.path.exists('pdn_database.pdn.index')
+    assert len(database) == 3
+    assert database[1].moves == ['35-30']
+    assert database.get_tags(2) == {'Event': '3', 'White': 'A'}
+    assert database.find(White='A') == [0, 2]
+    assert [game.game_ending for game in database.find_games(White='A', Event='3')] == ['0-2']
+
+    # The saved index is used.
+    database = PDNDatabase('pdn_database.pdn')
+    assert database.find(White='B') == [1]
+
+    # The index is built again when the file changes.
+    with open('pdn_database.pdn', 'a', encoding='utf8') as file:
+        file.write('[Event "4"]\n[White "B"]\n1. 31-27 2-0\n')
+    os.utime('pdn_database.pdn', ns=(0, 0))
+    assert database.find(White='B') == [1, 3]
+    assert database[3].moves == ['31-27']
+    assert len(PDNDatabase('pdn_database.pdn')) == 4
+
+
+def test_pdn_parallel():
+    filepath = os.path.realpath('./games/succeed/mrcd2000kval.pdn')
+    games = PDNReader(filename=filepath).games
+    results = list(parse_pdn_parallel(filepath, workers=2, chunk_size=7, index_filename='./TEMP/parallel.index'))
+    assert [result.index for result in results] == list(range(len(games)))
+    for game, result in zip(games, results):
+        assert game.tags == result.tags and game.moves == result.moves
+        assert result.error is None and result.variant == 'russian'
+
+    pdn_text = ('[Event "1"]\n1. 32-28 19-23 2. 28x19 14x23 1-0\n[Event "2"]\n1. 32-28 19-23 2. 28x18 *\n'
+                '[Event "3"]\n[FEN "W:W31:B1"]\n1. 31-26 2-0\n')
+    with open('pdn_parallel.pdn', 'w', encoding='utf8') as file:
+        file.write(pdn_text)
+    for workers in [1, 2]:
+        results = list(parse_pdn_parallel('pdn_parallel.pdn', workers=workers, variant='standard', chunk_size=1))
+        assert [result.error is None for result in results] == [True, False, True]
+        assert results[1].error.startswith('Move 3 (28x18)')
+        board = Board('standard')
+        for move in ['32-28', '19-23']:
+            board.push(Move(board, pdn_move=move))
+        assert results[1].fen == board.fen
+
+
+def test_pdn_batch_writer():
+    filepath = os.path.realpath('./games/succeed/mrcd2000kval.pdn')
+    games = PDNReader(filename=filepath, encodings='utf8').games[:10]
+    boards = []
+    for one_game in games:
+        board = Board(variant='russian')
+        for move in one_game.moves:
+            board.push(Move(board, pdn_move=move))
+        boards.append(board)
+        # Moves built for the board don't have to be replayed.
+        assert all(board._legal_move_stack)
+
+    tags = {'Event': 'Batch'}
+    with PDNBatchWriter('pdn_batch_writer.pdn', batch_size=3, file_mode='w') as writer:
+        for board, one_game in zip(boards, games):
+            writer.add_game(board, tags=tags, game_ending=one_game.game_ending)
+        assert writer.games_written == 9
+    assert writer.games_written == 10
+    assert tags == {'Event': 'Batch'}
+
+    assert len(PDNReader(filename='pdn_batch_writer.pdn').games) == 10
+
+    # The games are the same as when all the moves are replayed.
+    with open('pdn_batch_writer.pdn') as file:
+        pdn_text = file.read()
+    replayed_text = ''
+    for board, one_game in zip(boards, games):
+        board._legal_move_stack = [False] * len(board.move_stack)
+        replayed_text += PDNWriter('', board, tags={'Event': 'Batch'}, game_ending=one_game.game_ending).pdn_text
+    assert pdn_text == replayed_text
+
+    # The moves of legal_moves are written in the notation of the variant too.
+    for variant in ['russian', 'brazilian', 'turkish']:
+        board = Board(variant)
+        for _ in range(10):
+            board.push(board.legal_moves()[-1])
+        with PDNBatchWriter('pdn_batch_writer.pdn', file_mode='w') as writer:
+            writer.add_game(board)
+        assert PDNReader(filename='pdn_batch_writer.pdn').games[0].moves[0] in ['g3-h4', 'h3-h4']
@@ -0,0 +1,22 @@
+from draughts.perft import REFERENCE_POSITIONS, check_reference_positions, divide, main, new_game, perft
+
+
+def test_reference_positions():
+    for backend in ['pieces', 'bitboard']:
+        results = check_reference_positions(max_depth=3, backend=backend)
+        assert len(results) == sum(map(len, REFERENCE_POSITIONS.values()))
+        for variant, fen, depth, expected, nodes, seconds in results:
+            assert nodes == expected, (variant, fen)
+
+
+def test_perft():
+    game = new_game('russian')
+    fen = game.get_fen()
+    counts = divide(game, 3)
+    assert sum(counts.values()) == perft(game, 3) == 302
+    assert counts['c3-d4'] == 40
+    assert game.get_fen() == fen and game.move_stack == []
+    assert perft(game, 0) == 1
+
+    assert main(['2', '--variant', 'english', '--divide']) == 0
+    assert main(['--bench', '--variant', 'frysk!', '2']) == 0
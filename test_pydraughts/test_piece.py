@@ -5,3 +5,21 @@ def test_piece():
     game = Board(fen='W:WK28:B19,37')
     assert (list(map(lambda move: move.board_move, game.legal_moves())) ==
             [[[28, 14]], [[28, 10]], [[28, 5]], [[28, 41]], [[28, 46]]])
+
+
+def test_geometry():
+    from draughts.core.geometry import get_geometry, WHITE, BLACK
+    geometry = get_geometry('standard')
+    assert get_geometry('standard') is geometry
+    assert geometry.man_steps[WHITE][33] == (28, 29)
+    assert geometry.man_steps[BLACK][33] == (38, 39)
+    assert geometry.king_rays[WHITE][46] == ((41, 37, 32, 28, 23, 19, 14, 10, 5),)
+    assert (19, 14) in geometry.man_jumps[WHITE][23] and (28, 32) in geometry.man_jumps[WHITE][23]
+    assert geometry.promotion_squares[WHITE] == frozenset(range(1, 6))
+    assert get_geometry('frisian').man_jumps[WHITE][28] == ((22, 17), (23, 19), (18, 8), (27, 26), (32, 37), (33, 39),
+                                                            (38, 48), (29, 30))
+
+    game = Board(fen='W:WK28:B19,37')
+    piece = game._game.board.searcher.get_piece_by_position(28)
+    assert piece.geometry is geometry and piece.kings_can_move_more_than_one_square
+    assert game._game.copy().board.pieces[0].geometry is geometry
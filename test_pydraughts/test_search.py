@@ -0,0 +1,63 @@
+import draughts
+from draughts.engine import Limit, PlayResult
+from draughts.search import MAX_DEPTH, Searcher, WIN, search
+import threading
+import time
+
+
+def test_search_finds_wins():
+    # The king captures the last man after it moves to 10.
+    board = draughts.Board('standard', 'W:WK46:B5')
+    result = search(board, Limit(depth=6))
+    assert isinstance(result, PlayResult)
+    assert result.info['score'] == WIN - 3
+    assert result.info['depth'] == 2
+    assert result.ponder.board_move == [[5, 10]]
+    assert board.move_stack == []
+
+    # Both captures are forced, but only one of them takes the last piece.
+    board = draughts.Board('standard', 'B:W28:B23,22')
+    result = search(board, Limit(depth=6))
+    assert result.move.pdn_move == '22x33'
+    assert result.info['score'] == WIN - 1
+
+    result = search(draughts.Board('standard', 'B:W46:B'), Limit(depth=2))
+    assert result.move is None and result.ponder is None
+
+
+def test_search_limits():
+    board = draughts.Board()
+    infos = []
+    result = search(board, Limit(depth=3), info=infos.append)
+    assert [info['depth'] for info in infos] == [1, 2, 3]
+    assert result.info == infos[-1]
+    assert len(result.info['pv'].split()) == 3
+    assert result.move.board_move in [move.board_move for move in board.legal_moves()]
+
+    searcher = Searcher()
+    searcher.search(board, Limit(nodes=500))
+    assert searcher.nodes == 500
+
+    # The upper bounds are large so the test passes on slow machines. The searches don't reach MAX_DEPTH in 5 seconds.
+    start = time.perf_counter()
+    result = searcher.search(board, Limit(movetime=.3))
+    assert .3 <= time.perf_counter() - start < 5
+    assert result.info['depth'] < MAX_DEPTH
+
+    stop = threading.Event()
+    threading.Timer(.3, stop.set).start()
+    start = time.perf_counter()
+    result = searcher.search(board, Limit(movetime=float('inf')), stop=stop)
+    assert .3 <= time.perf_counter() - start < 5
+    assert stop.is_set()
+    assert result.move.board_move in [move.board_move for move in board.legal_moves()]
+
+
+def test_search_variants():
+    for variant in ['standard', 'english', 'italian', 'russian', 'brazilian', 'turkish', 'frisian', 'frysk!',
+                    'antidraughts', 'breakthrough']:
+        board = draughts.Board(variant)
+        result = search(board, Limit(depth=3))
+        assert result.move.board_move in [move.board_move for move in board.legal_moves()], variant
+        board.push(result.move)
+        assert result.ponder.board_move in [move.board_move for move in board.legal_moves()], variant
@@ -1,6 +1,8 @@
-from draughts.tournament import RoundRobin
+from draughts.tournament import RoundRobin, Match
+from draughts.PDN import PDNReader
 import pytest
 import sys
+import os
 import logging
 platform = sys.platform
 file_extension = '.exe' if platform == 'win32' else ''
@@ -20,3 +22,89 @@ def test_tournament():
     scores = tournament.play()
     logger.debug(f"Scores: {scores}")
     tournament.print_standings()
+
+
+def test_parallel_tournament():
+    random_engine = [sys.executable, os.path.join(os.path.dirname(os.path.realpath(__file__)), 'random_hub_engine.py')]
+    if os.path.exists('parallel_tournament.pdn'):
+        os.remove('parallel_tournament.pdn')
+    players = [(random_engine, "hub", {'seed': seed, 'delay': .01}, None) for seed in range(4)]
+    tournament = RoundRobin("parallel_tournament.pdn", players, 20, .2, max_moves=20, concurrency=3)
+    scores = tournament.play()
+    assert sum(scores) == 2 * 12
+    assert len(tournament.complete_results) == 2 and len(tournament.complete_results[1]) == 6
+    assert [sum(result) for result in tournament.results] == [6, 6, 6, 6]
+    # The games are written in order.
+    games = PDNReader(filename='parallel_tournament.pdn').games
+    assert [game.tags['Round'] for game in games] == [f'{round_number}.{game}' for round_number in [1, 2]
+                                                      for game in range(1, 7)]
+
+
+def test_match():
+    random_engine = [sys.executable, os.path.join(os.path.dirname(os.path.realpath(__file__)), 'random_hub_engine.py')]
+    for filename in ['match.pdn', 'match.json']:
+        if os.path.exists(filename):
+            os.remove(filename)
+    players = [(random_engine, "hub", {'seed': seed}, None) for seed in range(2)]
+    # Short games between random engines are drawn, so the test soon decides that the first engine isn't 200 Elo stronger.
+    match = Match("match.pdn", players, 20, .2, elo0=0, elo1=200, max_pairs=50, max_moves=20, concurrency=2,
+                  checkpoint_filename='match.json')
+    scores = match.play()
+    assert match.sprt_result() is False
+    pairs = sum(match.pentanomial)
+    assert 0 < pairs < 50 and sum(scores) == 4 * pairs
+    assert sum(match.results[0]) == 2 * pairs
+    games = PDNReader(filename='match.pdn').games
+    assert [game.tags['Round'] for game in games] == [f'{pair}.{game}' for pair in range(1, pairs + 1)
+                                                      for game in [1, 2]]
+    assert [game.tags['White'] for game in games[:2]] == [str(random_engine), str(random_engine)]
+    # A finished match that is resumed doesn't play more pairs.
+    resumed_match = Match("match.pdn", players, 20, .2, elo0=0, elo1=200, max_pairs=50, max_moves=20,
+                          checkpoint_filename='match.json', resume=True)
+    assert resumed_match.play() == scores and resumed_match.pentanomial == match.pentanomial
+    assert len(PDNReader(filename='match.pdn').games) == 2 * pairs
+
+    match.pentanomial = [0, 1, 4, 20, 25]
+    assert match.sprt_result() is True and match.elo()[0] > 200
+    match.pentanomial = [0, 0, 0, 0, 0]
+    assert match.sprt_result() is None and match.elo() == (0., float('inf'))
+    with pytest.raises(ValueError):
+        Match("match.pdn", players * 2, 20)
+
+
+def test_resume_tournament():
+    random_engine = [sys.executable, os.path.join(os.path.dirname(os.path.realpath(__file__)), 'random_hub_engine.py')]
+    for filename in ['resumed_tournament.pdn', 'resumed_tournament.json']:
+        if os.path.exists(filename):
+            os.remove(filename)
+    players = [(random_engine, "hub", {'seed': seed}, None) for seed in range(3)]
+
+    class Crash(Exception):
+        pass
+
+    class CrashingRoundRobin(RoundRobin):
+        def save_checkpoint(self):
+            super().save_checkpoint()
+            if self.round == 1 and len(self.round_results) == 2:
+                # A game is written to the PDN file but the tournament crashes before the checkpoint is saved.
+                self._record_game(*self._play_game(self.players[0], self.players[1], 3))
+                raise Crash()
+
+    tournament = CrashingRoundRobin("resumed_tournament.pdn", players, 20, .2, max_moves=20,
+                                    checkpoint_filename='resumed_tournament.json')
+    with pytest.raises(Crash):
+        tournament.play()
+    assert len(PDNReader(filename='resumed_tournament.pdn').games) == 3 + 2 + 1
+
+    tournament = RoundRobin("resumed_tournament.pdn", players, 20, .2, max_moves=20,
+                            checkpoint_filename='resumed_tournament.json', resume=True)
+    scores = tournament.play()
+    assert sum(scores) == 2 * 6
+    assert [len(round_results) for round_results in tournament.complete_results] == [3, 3]
+    games = PDNReader(filename='resumed_tournament.pdn').games
+    assert [game.tags['Round'] for game in games] == [f'{round_number}.{game}' for round_number in [1, 2]
+                                                      for game in range(1, 4)]
+    # A finished tournament isn't played again.
+    tournament = RoundRobin("resumed_tournament.pdn", players, 20, .2, max_moves=20,
+                            checkpoint_filename='resumed_tournament.json', resume=True)
+    assert tournament.play() == scores and len(PDNReader(filename='resumed_tournament.pdn').games) == 6